@@ -9,6 +9,43 @@ if not BOT_TOKEN:
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./bot.db")
 
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+SQL_QUERY_BUDGET = int(os.getenv("SQL_QUERY_BUDGET", "10"))
+
+THROTTLING_RATE = float(os.getenv("THROTTLING_RATE", "2"))
+THROTTLING_BURST = int(os.getenv("THROTTLING_BURST", "10"))
+
+REMINDER_LEAD_MINUTES = int(os.getenv("REMINDER_LEAD_MINUTES", "60"))
+
+# Через сколько минут без принятия заявка повторно рассылается администраторам;
+# через удвоенный срок — уходит в чат руководителя (0 — не отправлять).
+ESCALATION_WINDOWS_MINUTES = {
+    (request_type, urgency): int(os.getenv(f"ESCALATION_{request_type}_{urgency}_MINUTES", default))
+    for (request_type, urgency), default in {
+        ("IT", "ASAP"): "15",
+        ("IT", "DATE"): "120",
+        ("AHO", "ASAP"): "30",
+        ("AHO", "DATE"): "240",
+    }.items()
+}
+ESCALATION_SUPERVISOR_CHAT_ID = int(os.getenv("ESCALATION_SUPERVISOR_CHAT_ID", "0"))
+
+# Новая заявка отправляется одному наименее загруженному администратору; если он не принял её
+# за AUTO_ASSIGN_TIMEOUT_MINUTES, заявка рассылается всем администраторам направления.
+AUTO_ASSIGN = os.getenv("AUTO_ASSIGN", "false").lower() in {"1", "true", "yes"}
+AUTO_ASSIGN_TIMEOUT_MINUTES = int(os.getenv("AUTO_ASSIGN_TIMEOUT_MINUTES", "10"))
+
+# Администраторы в режиме сводки получают несрочные заявки одним сообщением
+# раз в DIGEST_INTERVAL_MINUTES минут или по накоплении DIGEST_MAX_REQUESTS заявок.
+DIGEST_INTERVAL_MINUTES = int(os.getenv("DIGEST_INTERVAL_MINUTES", "15"))
+DIGEST_MAX_REQUESTS = int(os.getenv("DIGEST_MAX_REQUESTS", "10"))
+
+# Значения по умолчанию; переопределяются файлом BOT_CONFIG_FILE и переменными окружения
+# (см. app/services/runtime_config.py) и перечитываются без перезапуска.
+CONFIG_FILE = os.getenv("BOT_CONFIG_FILE", "bot_config.json")
+
 IT_ADMIN_IDS = [721618593, 407126067,1157378714]
 AHO_ADMIN_IDS = [5457745923]
 
@@ -17,6 +54,8 @@ PREDEFINED_ORGANIZATIONS = [
     "ОКУ «Центра бухгалтерского учета» г.Липецк",
 ]
 
+VEHICLES = ["Служебный автомобиль"]
+
 ORGANIZATIONS_NEEDING_OFFICE_NUMBER = {
     "Министерство финансов Липецкой области",
     "ОКУ «Центра бухгалтерского учета» г.Липецк",
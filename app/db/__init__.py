@@ -5,9 +5,11 @@ from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from app.config import DATABASE_URL
+from app.db.query_stats import install_query_hooks
 
 engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+install_query_hooks(engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 Base = declarative_base()
 
 
@@ -37,6 +39,12 @@ def _migrate_schema() -> None:
                     )
                 )
 
+    if "admins" in inspector.get_table_names():
+        admin_columns = {column["name"] for column in inspector.get_columns("admins")}
+        if "digest_mode" not in admin_columns:
+            with engine.begin() as connection:
+                connection.execute(text("ALTER TABLE admins ADD COLUMN digest_mode BOOLEAN DEFAULT 0"))
+
     if "requests" in inspector.get_table_names():
         request_columns = {column["name"] for column in inspector.get_columns("requests")}
         if "admin_message_map" not in request_columns:
@@ -44,6 +52,28 @@ def _migrate_schema() -> None:
                 connection.execute(
                     text("ALTER TABLE requests ADD COLUMN admin_message_map VARCHAR")
                 )
+        if "admin_media_map" not in request_columns:
+            with engine.begin() as connection:
+                connection.execute(text("ALTER TABLE requests ADD COLUMN admin_media_map VARCHAR"))
+        if "accepted_at" not in request_columns:
+            with engine.begin() as connection:
+                connection.execute(text("ALTER TABLE requests ADD COLUMN accepted_at TIMESTAMP"))
+        if "vehicle_id" not in request_columns:
+            with engine.begin() as connection:
+                connection.execute(text("ALTER TABLE requests ADD COLUMN vehicle_id INTEGER REFERENCES vehicles(id)"))
+        if "offered_admin_id" not in request_columns:
+            with engine.begin() as connection:
+                connection.execute(text("ALTER TABLE requests ADD COLUMN offered_admin_id INTEGER"))
+                connection.execute(text("ALTER TABLE requests ADD COLUMN offer_expires_at TIMESTAMP"))
+        request_indexes = {index["name"] for index in inspector.get_indexes("requests")}
+        if "ix_requests_status" not in request_indexes:
+            with engine.begin() as connection:
+                connection.execute(text("CREATE INDEX ix_requests_status ON requests (status)"))
+        if "ix_requests_vehicle_car_start" not in request_indexes:
+            with engine.begin() as connection:
+                connection.execute(
+                    text("CREATE INDEX ix_requests_vehicle_car_start ON requests (vehicle_id, car_start_at)")
+                )
 
 @contextmanager
 def get_db() -> Generator[Session, None, None]:
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, Date, DateTime, Float, ForeignKey, Index, Integer, String, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.db import Base
@@ -26,6 +26,7 @@ class User(Base):
 
 class Request(Base):
     __tablename__ = "requests"
+    __table_args__ = (Index("ix_requests_vehicle_car_start", "vehicle_id", "car_start_at"),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -36,27 +37,77 @@ class Request(Base):
     urgency = Column(String)
     due_date = Column(String, nullable=True)
     photo_file_id = Column(String, nullable=True)
-    status = Column(String, default="Принято")
+    status = Column(String, default="Принято", index=True)
     assigned_admin_id = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.now)
+    accepted_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
     admin_message_id = Column(Integer, nullable=True)
     admin_message_map = Column(String, nullable=True)
+    admin_media_map = Column(String, nullable=True)
     comment = Column(String, nullable=True)
     attachment_type = Column(String, nullable=True)
     car_start_at = Column(DateTime, nullable=True)
     car_end_at = Column(DateTime, nullable=True)
     car_location = Column(String, nullable=True)
     planned_date = Column(DateTime, nullable=True)
+    vehicle_id = Column(Integer, ForeignKey("vehicles.id"), nullable=True)
+    # Personal auto-assignment offer; the request goes to the whole pool after offer_expires_at.
+    offered_admin_id = Column(Integer, nullable=True)
+    offer_expires_at = Column(DateTime, nullable=True)
 
     creator = relationship("User", back_populates="requests")
     category = relationship("Category")
     subcategory = relationship("Subcategory")
+    vehicle = relationship("Vehicle")
+    attachments = relationship(
+        "RequestAttachment", order_by="RequestAttachment.position", cascade="all, delete-orphan"
+    )
 
     def __repr__(self) -> str:
         return f"<Request(id={self.id}, type='{self.request_type}', status='{self.status}')>"
 
 
+class RequestAttachment(Base):
+    __tablename__ = "request_attachments"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    request_id = Column(Integer, ForeignKey("requests.id"), nullable=False, index=True)
+    file_id = Column(String, nullable=False)
+    attachment_type = Column(String, default="photo")
+    position = Column(Integer, default=0)
+
+    def __repr__(self) -> str:
+        return f"<RequestAttachment(request_id={self.request_id}, type='{self.attachment_type}')>"
+
+
+class ClarificationMessage(Base):
+    __tablename__ = "clarification_messages"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    request_id = Column(Integer, ForeignKey("requests.id"), nullable=False, index=True)
+    sender_id = Column(Integer, nullable=False)
+    sender_role = Column(String, nullable=False)
+    text = Column(String, nullable=False)
+    created_at = Column(DateTime, default=datetime.now)
+
+    def __repr__(self) -> str:
+        return f"<ClarificationMessage(request_id={self.request_id}, sender='{self.sender_role}')>"
+
+
+class RequestFollower(Base):
+    __tablename__ = "request_followers"
+    __table_args__ = (UniqueConstraint("request_id", "user_id"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    request_id = Column(Integer, ForeignKey("requests.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime, default=datetime.now)
+
+    def __repr__(self) -> str:
+        return f"<RequestFollower(request_id={self.request_id}, user_id={self.user_id})>"
+
+
 class Category(Base):
     __tablename__ = "categories"
 
@@ -96,6 +147,58 @@ class Admin(Base):
 
     id = Column(Integer, primary_key=True, unique=True)
     admin_type = Column(String)
+    digest_mode = Column(Boolean, default=False)
+
+    def __repr__(self) -> str:
+        return f"<Admin(id={self.id}, type='{self.admin_type}')>"
+
+
+class Vehicle(Base):
+    __tablename__ = "vehicles"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String, unique=True, nullable=False)
+    is_active = Column(Boolean, default=True)
+
+    def __repr__(self) -> str:
+        return f"<Vehicle(id={self.id}, name='{self.name}', active={self.is_active})>"
+
+
+class SeedChecksum(Base):
+    __tablename__ = "seed_checksums"
+
+    name = Column(String, primary_key=True)
+    checksum = Column(String, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<SeedChecksum(name='{self.name}', checksum='{self.checksum[:8]}')>"
+
+
+class RequestDailyRollup(Base):
+    __tablename__ = "request_daily_rollups"
+    __table_args__ = (UniqueConstraint("day", "metric", "dimension", "dimension_value"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    day = Column(Date, nullable=False, index=True)
+    metric = Column(String, nullable=False)
+    dimension = Column(String, nullable=False)
+    dimension_value = Column(String, nullable=False)
+    count = Column(Integer, default=0)
+    total_seconds = Column(Float, default=0.0)
+    histogram = Column(String, nullable=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"<RequestDailyRollup(day={self.day}, metric='{self.metric}', "
+            f"{self.dimension}='{self.dimension_value}', count={self.count})>"
+        )
+
+
+class RollupWatermark(Base):
+    __tablename__ = "rollup_watermarks"
+
+    name = Column(String, primary_key=True)
+    last_day = Column(Date, nullable=False)
 
     def __repr__(self) -> str:
-        return f"<Admin(id={self.id}, type='{self.admin_type}')>"
\ No newline at end of file
+        return f"<RollupWatermark(name='{self.name}', last_day={self.last_day})>"
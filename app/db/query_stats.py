@@ -0,0 +1,57 @@
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    total_time: float = 0.0
+    _started: list[float] = field(default_factory=list, repr=False)
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current_stats.get()
+    if stats is not None:
+        stats._started.append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current_stats.get()
+    if stats is not None and stats._started:
+        stats.statements += 1
+        stats.total_time += time.perf_counter() - stats._started.pop()
+
+
+def install_query_hooks(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def track_queries() -> Generator[QueryStats, None, None]:
+    """Count statements and DB time executed in the current context."""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def assert_max_statements(limit: int) -> Generator[QueryStats, None, None]:
+    """Test helper: fail if the wrapped block executes more than ``limit`` statements."""
+    with track_queries() as stats:
+        yield stats
+    if stats.statements > limit:
+        raise AssertionError(f"Выполнено {stats.statements} SQL-запросов, допустимо не более {limit}")
@@ -0,0 +1,15 @@
+from aiogram.filters import BaseFilter
+from aiogram.types import TelegramObject
+
+from app.services.user_context import ADMIN_ROLES, UserContext
+
+
+class RoleFilter(BaseFilter):
+    def __init__(self, *roles: str) -> None:
+        self.roles = frozenset(roles)
+
+    async def __call__(self, event: TelegramObject, user_context: UserContext | None = None) -> bool:
+        return user_context is not None and user_context.registered and user_context.role in self.roles
+
+
+IsAdmin = RoleFilter(*ADMIN_ROLES)
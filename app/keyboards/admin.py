@@ -13,6 +13,7 @@ def get_admin_done_keyboard(request_id: int) -> InlineKeyboardMarkup:
     buttons = [
         [InlineKeyboardButton(text="Выполнено", callback_data=f"admin_done_{request_id}")],
         [InlineKeyboardButton(text="Задать уточнение", callback_data=f"admin_clarify_start_{request_id}")],
+        [InlineKeyboardButton(text="История уточнений", callback_data=f"transcript_{request_id}")],
     ]
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
@@ -26,6 +27,7 @@ def get_admin_post_clarification_keyboard(request_id: int) -> InlineKeyboardMark
     buttons = [
         [InlineKeyboardButton(text="Принять", callback_data=f"admin_accept_{request_id}")],
         [InlineKeyboardButton(text="Отказаться", callback_data=f"admin_decline_{request_id}")],
+        [InlineKeyboardButton(text="История уточнений", callback_data=f"transcript_{request_id}")],
     ]
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
@@ -35,4 +37,17 @@ def get_admin_feedback_keyboard(request_id: int) -> InlineKeyboardMarkup:
         [InlineKeyboardButton(text="Отправить без сообщения", callback_data=f"admin_feedback_skip_{request_id}")],
         [InlineKeyboardButton(text="Отменить", callback_data=f"admin_feedback_cancel_{request_id}")],
     ]
-    return InlineKeyboardMarkup(inline_keyboard=buttons)
\ No newline at end of file
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+
+def get_admin_dashboard_keyboard() -> InlineKeyboardMarkup:
+    buttons = [[InlineKeyboardButton(text="Обновить", callback_data="admin_dashboard_refresh")]]
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+
+def get_admin_digest_keyboard(request_ids: list[int]) -> InlineKeyboardMarkup:
+    buttons = [
+        [InlineKeyboardButton(text=f"Открыть ID:{request_id}", callback_data=f"admin_open_card_{request_id}")]
+        for request_id in request_ids
+    ]
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
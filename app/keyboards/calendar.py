@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup
+from aiogram_calendar import SimpleCalendar, SimpleCalendarCallback
+from aiogram_calendar.schemas import SimpleCalAct
+
+from app.services.car_bookings import get_month_occupancy
+
+PARTLY_BOOKED_MARK = "•"
+FULLY_BOOKED_MARK = "×"
+CAR_CALENDAR_LEGEND = f"{PARTLY_BOOKED_MARK} — есть брони, {FULLY_BOOKED_MARK} — свободных автомобилей нет весь день."
+
+
+class CarBookingCalendar(SimpleCalendar):
+    """SimpleCalendar that marks days on which cars are already booked."""
+
+    async def start_calendar(self, year: int | None = None, month: int | None = None) -> InlineKeyboardMarkup:
+        today = datetime.now()
+        year = year or today.year
+        month = month or today.month
+        markup = await super().start_calendar(year, month)
+        partly_booked, fully_booked = get_month_occupancy(year, month)
+        if not partly_booked:
+            return markup
+
+        for row in markup.inline_keyboard:
+            for button in row:
+                callback_data = SimpleCalendarCallback.unpack(button.callback_data)
+                if callback_data.act != SimpleCalAct.day:
+                    continue
+                day_bit = 1 << (callback_data.day - 1)
+                if fully_booked & day_bit:
+                    button.text = f"{button.text}{FULLY_BOOKED_MARK}"
+                elif partly_booked & day_bit:
+                    button.text = f"{button.text}{PARTLY_BOOKED_MARK}"
+        return markup
+
+    async def process_day_select(self, data: SimpleCalendarCallback, query: CallbackQuery) -> tuple:
+        _, fully_booked = get_month_occupancy(data.year, data.month)
+        if fully_booked & (1 << (data.day - 1)):
+            await query.answer("В этот день все автомобили заняты. Выберите другую дату.", show_alert=True)
+            return False, None
+        return await super().process_day_select(data, query)
@@ -1,6 +1,10 @@
+from datetime import datetime
+
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, KeyboardButton, ReplyKeyboardMarkup
 
-from app.config import PREDEFINED_ORGANIZATIONS
+from app.services.runtime_config import add_reload_listener, get_runtime_config
+
+_organization_keyboard: InlineKeyboardMarkup | None = None
 
 
 def get_main_menu_keyboard(user_role: str) -> ReplyKeyboardMarkup:
@@ -11,7 +15,7 @@ def get_main_menu_keyboard(user_role: str) -> ReplyKeyboardMarkup:
     if user_role == "user":
         keyboard.append([KeyboardButton(text="Мои заявки")])
     elif user_role in ["it_admin", "aho_admin"]:
-        keyboard.append([KeyboardButton(text="Новые заявки")])
+        keyboard.append([KeyboardButton(text="Новые заявки"), KeyboardButton(text="Сводка очереди")])
         keyboard.append(
             [KeyboardButton(text="Мои заявки"), KeyboardButton(text="Мои принятые заявки")]
         )
@@ -32,11 +36,22 @@ def get_photo_skip_keyboard() -> InlineKeyboardMarkup:
 
 
 def get_organization_selection_keyboard() -> InlineKeyboardMarkup:
-    buttons = []
-    for i, org in enumerate(PREDEFINED_ORGANIZATIONS):
-        buttons.append([InlineKeyboardButton(text=org, callback_data=f"org_idx_{i}")])
-    buttons.append([InlineKeyboardButton(text="Указать название самостоятельно", callback_data="org_other")])
-    return InlineKeyboardMarkup(inline_keyboard=buttons)
+    global _organization_keyboard
+    if _organization_keyboard is None:
+        buttons = []
+        for i, org in enumerate(get_runtime_config().predefined_organizations):
+            buttons.append([InlineKeyboardButton(text=org, callback_data=f"org_idx_{i}")])
+        buttons.append([InlineKeyboardButton(text="Указать название самостоятельно", callback_data="org_other")])
+        _organization_keyboard = InlineKeyboardMarkup(inline_keyboard=buttons)
+    return _organization_keyboard
+
+
+def _reset_organization_keyboard(_config) -> None:
+    global _organization_keyboard
+    _organization_keyboard = None
+
+
+add_reload_listener(_reset_organization_keyboard)
 
 
 def get_comment_skip_keyboard() -> InlineKeyboardMarkup:
@@ -49,4 +64,36 @@ def get_request_confirmation_keyboard() -> InlineKeyboardMarkup:
         [InlineKeyboardButton(text="Подтвердить", callback_data="confirm_request")],
         [InlineKeyboardButton(text="Отменить", callback_data="cancel_request")],
     ]
-    return InlineKeyboardMarkup(inline_keyboard=buttons)
\ No newline at end of file
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+
+def get_duplicate_keyboard(request_ids: list[int]) -> InlineKeyboardMarkup:
+    buttons = [
+        [InlineKeyboardButton(text=f"Присоединиться к ID:{request_id}", callback_data=f"dup_join_{request_id}")]
+        for request_id in request_ids
+    ]
+    buttons.append([InlineKeyboardButton(text="Всё равно создать", callback_data="dup_create")])
+    buttons.append([InlineKeyboardButton(text="Отменить", callback_data="cancel_request")])
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+
+def get_car_slots_keyboard(slots: list[datetime]) -> InlineKeyboardMarkup:
+    buttons = [
+        [
+            InlineKeyboardButton(
+                text=slot.strftime("%H:%M"),
+                callback_data=f"car_slot_{slot.strftime('%Y%m%d%H%M')}",
+            )
+            for slot in slots
+        ]
+    ]
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+
+def get_transcript_keyboard(request_id: int, page: int, page_count: int) -> InlineKeyboardMarkup | None:
+    row = []
+    if page > 0:
+        row.append(InlineKeyboardButton(text="◀️", callback_data=f"transcript_page_{request_id}_{page - 1}"))
+    if page < page_count - 1:
+        row.append(InlineKeyboardButton(text="▶️", callback_data=f"transcript_page_{request_id}_{page + 1}"))
+    return InlineKeyboardMarkup(inline_keyboard=[row]) if row else None
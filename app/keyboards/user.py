@@ -6,6 +6,7 @@ def get_user_request_actions_keyboard(request_id: int, status: str) -> InlineKey
     if status != "Выполнено":
         buttons.append([InlineKeyboardButton(text="Отметить как выполнено", callback_data=f"user_done_{request_id}")])
     buttons.append([InlineKeyboardButton(text="Задать уточнение", callback_data=f"user_clarify_start_{request_id}")])
+    buttons.append([InlineKeyboardButton(text="История уточнений", callback_data=f"transcript_{request_id}")])
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
@@ -0,0 +1,18 @@
+from .db import DbSessionMiddleware
+from .fsm import FSMUnitOfWork, FSMUnitOfWorkMiddleware
+from .metrics import HandlerNameMiddleware, MetricsMiddleware
+from .query_budget import QueryBudgetMiddleware
+from .throttling import ThrottlingMiddleware, ThrottlingRule
+from .user_context import UserContextMiddleware
+
+__all__ = [
+    "DbSessionMiddleware",
+    "FSMUnitOfWork",
+    "FSMUnitOfWorkMiddleware",
+    "HandlerNameMiddleware",
+    "MetricsMiddleware",
+    "QueryBudgetMiddleware",
+    "ThrottlingMiddleware",
+    "ThrottlingRule",
+    "UserContextMiddleware",
+]
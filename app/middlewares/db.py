@@ -0,0 +1,27 @@
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from app.db import SessionLocal
+
+
+class DbSessionMiddleware(BaseMiddleware):
+    """Opens one session per update and injects it into handlers as ``db``."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        with SessionLocal() as session:
+            data["db"] = session
+            try:
+                result = await handler(event, data)
+                session.commit()
+                return result
+            except Exception:
+                session.rollback()
+                raise
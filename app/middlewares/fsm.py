@@ -0,0 +1,116 @@
+import copy
+import logging
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import StateType
+from aiogram.types import TelegramObject
+
+from app.states.requests import NewRequestDraft
+
+logger = logging.getLogger(__name__)
+
+_UNSET = object()
+
+
+class FSMUnitOfWork(FSMContext):
+    """FSM context that reads storage once per update and writes back once on flush.
+
+    Only the keys changed or removed during the update are written, merged into whatever the
+    storage holds at flush time, so concurrent updates of one user do not drop each other's keys.
+    """
+
+    def __init__(self, context: FSMContext, raw_state: str | None | object = _UNSET) -> None:
+        super().__init__(storage=context.storage, key=context.key)
+        self._data: dict[str, Any] | None = None
+        self._snapshot: dict[str, Any] = {}
+        self._state = raw_state
+        self._initial_state = raw_state
+
+    async def load(self) -> dict[str, Any]:
+        if self._data is None:
+            self._data = dict(await self.storage.get_data(key=self.key))
+            self._snapshot = copy.deepcopy(self._data)
+        return self._data
+
+    @property
+    def draft(self) -> NewRequestDraft:
+        if self._data is None:
+            raise RuntimeError("FSM data is not loaded yet")
+        return NewRequestDraft(self._data)
+
+    async def set_state(self, state: StateType = None) -> None:
+        self._state = state.state if isinstance(state, State) else state
+
+    async def get_state(self) -> str | None:
+        if self._state is _UNSET:
+            self._state = await self.storage.get_state(key=self.key)
+            self._initial_state = self._state
+        return self._state
+
+    async def set_data(self, data: Mapping[str, Any]) -> None:
+        current = await self.load()
+        current.clear()
+        current.update(data)
+
+    async def get_data(self) -> dict[str, Any]:
+        return dict(await self.load())
+
+    async def get_value(self, key: str, default: Any | None = None) -> Any | None:
+        return (await self.load()).get(key, default)
+
+    async def update_data(self, data: Mapping[str, Any] | None = None, **kwargs: Any) -> dict[str, Any]:
+        if data:
+            kwargs.update(data)
+        current = await self.load()
+        current.update(kwargs)
+        return dict(current)
+
+    async def flush(self) -> None:
+        if self._state is not _UNSET and self._state != self._initial_state:
+            await self.storage.set_state(key=self.key, state=self._state)
+            self._initial_state = self._state
+        if self._data is None:
+            return
+
+        changed = {
+            key: value
+            for key, value in self._data.items()
+            if key not in self._snapshot or self._snapshot[key] != value
+        }
+        removed = self._snapshot.keys() - self._data.keys()
+        if not changed and not removed:
+            return
+        merged = dict(await self.storage.get_data(key=self.key))
+        merged.update(changed)
+        for key in removed:
+            merged.pop(key, None)
+        await self.storage.set_data(key=self.key, data=merged)
+        self._snapshot = copy.deepcopy(self._data)
+
+
+class FSMUnitOfWorkMiddleware(BaseMiddleware):
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        state = data.get("state")
+        if state is None or isinstance(state, FSMUnitOfWork):
+            return await handler(event, data)
+
+        unit_of_work = FSMUnitOfWork(state, data.get("raw_state", _UNSET))
+        await unit_of_work.load()
+        data["state"] = unit_of_work
+        data["draft"] = unit_of_work.draft
+        # A failed handler leaves its half-applied changes unsaved.
+        result = await handler(event, data)
+        try:
+            await unit_of_work.flush()
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Не удалось сохранить данные FSM для %s: %s", state.key, exc)
+        return result
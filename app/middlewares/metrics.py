@@ -0,0 +1,62 @@
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+
+from app.services.metrics import HANDLER_ERRORS, HANDLER_IN_FLIGHT, HANDLER_LATENCY
+
+PROBE_KEY = "metrics_probe"
+
+
+class _HandlerProbe:
+    __slots__ = ("name", "update_type")
+
+    def __init__(self, update_type: str) -> None:
+        self.name = "unhandled"
+        self.update_type = update_type
+
+
+class MetricsMiddleware(BaseMiddleware):
+    """Outer update middleware: latency and errors per handler."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        update_type = event.event_type if isinstance(event, Update) else type(event).__name__
+        probe = _HandlerProbe(update_type)
+        data[PROBE_KEY] = probe
+        started = time.perf_counter()
+        try:
+            result = await handler(event, data)
+        except Exception:
+            HANDLER_ERRORS.inc(handler=probe.name, update_type=update_type)
+            raise
+        finally:
+            HANDLER_LATENCY.observe(time.perf_counter() - started, handler=probe.name, update_type=update_type)
+        return result
+
+
+class HandlerNameMiddleware(BaseMiddleware):
+    """Inner middleware that reports the resolved handler name and counts in-flight updates per handler."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        probe = data.get(PROBE_KEY)
+        handler_object = data.get("handler")
+        if probe is None or handler_object is None:
+            return await handler(event, data)
+        probe.name = getattr(handler_object.callback, "__name__", "unknown")
+        HANDLER_IN_FLIGHT.inc(handler=probe.name, update_type=probe.update_type)
+        try:
+            return await handler(event, data)
+        finally:
+            HANDLER_IN_FLIGHT.dec(handler=probe.name, update_type=probe.update_type)
@@ -0,0 +1,38 @@
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from app.db.query_stats import track_queries
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetMiddleware(BaseMiddleware):
+    """Counts SQL statements per update and logs handlers exceeding the budget."""
+
+    def __init__(self, max_statements: int) -> None:
+        self.max_statements = max_statements
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        with track_queries() as stats:
+            try:
+                return await handler(event, data)
+            finally:
+                if stats.statements > self.max_statements:
+                    handler_object = data.get("handler")
+                    handler_name = getattr(getattr(handler_object, "callback", None), "__name__", "unknown")
+                    logger.warning(
+                        "Хендлер %s превысил бюджет SQL-запросов: %s запросов (лимит %s), %.1f мс в БД.",
+                        handler_name,
+                        stats.statements,
+                        self.max_statements,
+                        stats.total_time * 1000,
+                    )
@@ -0,0 +1,102 @@
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.types import CallbackQuery, TelegramObject, User
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class ThrottlingRule:
+    rate: float
+    burst: int
+
+
+# Menu listings send a message per request, so they get a stricter rule than the default.
+MENU_THROTTLING = ThrottlingRule(rate=0.2, burst=3)
+
+
+class _TokenBucket:
+    __slots__ = ("tokens", "updated_at")
+
+    def __init__(self, tokens: float, updated_at: float) -> None:
+        self.tokens = tokens
+        self.updated_at = updated_at
+
+    def take(self, rule: ThrottlingRule, now: float) -> bool:
+        self.tokens = min(rule.burst, self.tokens + (now - self.updated_at) * rule.rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """Per-user token buckets per handler plus shedding of duplicate in-flight callbacks.
+
+    A handler can override the default rule with ``flags={"throttling": ThrottlingRule(...)}``.
+    """
+
+    def __init__(self, default_rule: ThrottlingRule, max_buckets: int = 10_000) -> None:
+        self.default_rule = default_rule
+        self.max_buckets = max_buckets
+        self._buckets: dict[tuple[int, str], _TokenBucket] = {}
+        self._in_flight: set[tuple[int, str]] = set()
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        event_user: User | None = data.get("event_from_user")
+        if event_user is None:
+            return await handler(event, data)
+
+        rule: ThrottlingRule = get_flag(data, "throttling", default=self.default_rule)
+        handler_object = data.get("handler")
+        handler_name = getattr(getattr(handler_object, "callback", None), "__name__", "unknown")
+
+        if not self._take_token(event_user.id, handler_name, rule):
+            logger.debug("Пользователь %s превысил лимит запросов к %s.", event_user.id, handler_name)
+            if isinstance(event, CallbackQuery):
+                await event.answer("Слишком много запросов. Подождите немного.")
+            return None
+
+        if not isinstance(event, CallbackQuery) or not event.data:
+            return await handler(event, data)
+
+        in_flight_key = (event_user.id, event.data)
+        if in_flight_key in self._in_flight:
+            await event.answer("Запрос уже обрабатывается.")
+            return None
+
+        self._in_flight.add(in_flight_key)
+        try:
+            return await handler(event, data)
+        finally:
+            self._in_flight.discard(in_flight_key)
+
+    def _take_token(self, user_id: int, handler_name: str, rule: ThrottlingRule) -> bool:
+        now = time.monotonic()
+        key = (user_id, handler_name)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_buckets:
+                self._prune(now)
+            bucket = self._buckets[key] = _TokenBucket(rule.burst, now)
+        return bucket.take(rule, now)
+
+    def _prune(self, now: float) -> None:
+        # Buckets idle long enough to be full again carry no information.
+        stale = [key for key, bucket in self._buckets.items() if now - bucket.updated_at > 60]
+        for key in stale:
+            del self._buckets[key]
+        if len(self._buckets) >= self.max_buckets:
+            self._buckets.clear()
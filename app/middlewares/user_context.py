@@ -0,0 +1,21 @@
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, User
+
+from app.services.user_context import get_user_context
+
+
+class UserContextMiddleware(BaseMiddleware):
+    """Resolves the cached ``user_context`` before filters run so role filters can use it."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        event_user: User | None = data.get("event_from_user")
+        data["user_context"] = get_user_context(event_user.id) if event_user else None
+        return await handler(event, data)
@@ -1,18 +1,24 @@
+import asyncio
 import logging
+import os
 from datetime import datetime
 
 
 from aiogram import Bot, F, Router
 from aiogram.exceptions import TelegramBadRequest
-from aiogram.filters import StateFilter
+from aiogram.filters import Command, CommandObject, StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.storage.base import StorageKey
-from aiogram.types import CallbackQuery, Message, ReplyKeyboardRemove
+from aiogram.types import CallbackQuery, FSInputFile, Message, ReplyKeyboardRemove
+from sqlalchemy.orm import Session
 
+from app.config import DIGEST_INTERVAL_MINUTES, DIGEST_MAX_REQUESTS
 from app.db import get_db
-from app.db.models import Request, User
+from app.db.models import Admin, Request, User
+from app.filters import IsAdmin
 from app.keyboards.admin import (
     get_admin_clarify_active_keyboard,
+    get_admin_dashboard_keyboard,
     get_admin_done_keyboard,
     get_admin_feedback_keyboard,
     get_admin_new_request_keyboard,
@@ -20,7 +26,32 @@ from app.keyboards.admin import (
 )
 from app.keyboards.main import get_main_menu_keyboard
 from app.keyboards.user import get_user_clarify_active_keyboard
-from app.services.admin_notifications import load_admin_message_map, save_admin_message_map
+from app.middlewares.throttling import MENU_THROTTLING
+from app.services.admin_load import admin_load
+from app.services.admin_notifications import (
+    load_admin_media_map,
+    load_admin_message_map,
+    render_admin_card,
+    save_admin_media_map,
+    save_admin_message_map,
+    send_admin_card,
+)
+from app.services.clarification import (
+    ClarificationThread,
+    admin_relay_header,
+    clarification_threads,
+    user_relay_header,
+)
+from app.services.dashboard import get_queue_snapshot, render_queue_snapshot
+from app.services.deadlines import deadline_scheduler
+from app.services.digest import digest_buffer
+from app.services.duplicates import duplicate_index, notify_request_followers
+from app.services.escalation import escalation_scheduler
+from app.services.export import export_requests_csv
+from app.services.runtime_config import reload_runtime_config
+from app.services.sla_rollups import load_sla_report, render_sla_report
+from app.services.transcripts import transcript_writer
+from app.services.user_context import UserContext, get_user_context
 from app.states.clarification import ClarificationState
 from app.states.completion import AdminCompletionState
 
@@ -28,6 +59,11 @@ logger = logging.getLogger(__name__)
 
 router = Router()
 
+# Admin menus and commands; the role check is declared once for the whole router.
+admin_router = Router(name="admin_only")
+admin_router.message.filter(IsAdmin)
+admin_router.callback_query.filter(IsAdmin)
+
 
 async def _edit_message_content(
     *,
@@ -109,39 +145,48 @@ async def _send_feedback_to_user(
 
 async def _complete_request(
     *,
+    db: Session,
     bot: Bot,
     admin_id: int,
     request_id: int,
     admin_message_meta: dict | None,
     feedback_message: Message | None,
 ) -> bool:
-    with get_db() as db:
-        request = db.query(Request).filter(Request.id == request_id).first()
-        admin_user = db.query(User).filter(User.id == admin_id).first()
-
-        if not request:
-            return False
-
-        if request.assigned_admin_id != admin_id:
-            return False
-
-        if request.status == "Выполнено":
-            return False
-
-        request_data = {
-            "id": request.id,
-            "user_id": request.user_id,
-            "description": request.description,
-            "admin_message_id": request.admin_message_id,
-        }
-        admin_data = {
-            "full_name": admin_user.full_name if admin_user else None,
-            "phone_number": admin_user.phone_number if admin_user else None,
-        }
-
-        request.status = "Выполнено"
-        request.completed_at = datetime.now()
-        db.commit()
+    request = db.query(Request).filter(Request.id == request_id).first()
+    admin_user = db.query(User).filter(User.id == admin_id).first()
+
+    if not request:
+        return False
+
+    if request.assigned_admin_id != admin_id:
+        return False
+
+    if request.status == "Выполнено":
+        return False
+
+    request_data = {
+        "id": request.id,
+        "user_id": request.user_id,
+        "description": request.description,
+        "admin_message_id": request.admin_message_id,
+    }
+    admin_data = {
+        "full_name": admin_user.full_name if admin_user else None,
+        "phone_number": admin_user.phone_number if admin_user else None,
+    }
+
+    request.status = "Выполнено"
+    request.completed_at = datetime.now()
+    admin_message_id = admin_message_meta.get("message_id") if admin_message_meta else None
+    if admin_message_id:
+        save_admin_message_map(request, {admin_id: admin_message_id})
+        request.admin_message_id = admin_message_id
+    db.commit()
+    deadline_scheduler.cancel(request.id)
+    admin_load.release(request.id)
+    escalation_scheduler.cancel(request.id)
+    clarification_threads.close(request.id)
+    duplicate_index.remove(request.id)
 
     await _send_feedback_to_user(
         bot,
@@ -174,6 +219,9 @@ async def _complete_request(
         logger.error(
             "Не удалось уведомить пользователя %s о выполнении заявки %s: %s", request_data["user_id"], request_data["id"], exc
         )
+    await notify_request_followers(
+        bot, db, request_data["id"], f"✅ Заявка ID:{request_data['id']}, к которой вы присоединились, выполнена."
+    )
 
     if admin_message_meta and admin_message_meta.get("text"):
         await _edit_message_content(
@@ -185,16 +233,6 @@ async def _complete_request(
             has_media=admin_message_meta.get("has_media", False),
         )
 
-    admin_message_id = admin_message_meta.get("message_id") if admin_message_meta else None
-    if admin_message_id:
-        updated_map = {admin_id: admin_message_id}
-        with get_db() as db:
-            request = db.query(Request).filter(Request.id == request_id).first()
-            if request:
-                save_admin_message_map(request, updated_map)
-                request.admin_message_id = admin_message_id
-                db.commit()
-
     return True
 
 
@@ -211,8 +249,10 @@ async def finish_admin_clarification(
     state_data = await state.get_data()
     if request_id is None:
         request_id = state_data.get("request_id")
+    # With parallel dialogues the FSM state may belong to another request than the one being closed.
+    state_is_current = state_data.get("request_id") in (None, request_id)
 
-    target_user_id = state_data.get("target_user_id")
+    target_user_id = state_data.get("target_user_id") if state_is_current else None
 
     if not request_id:
         await bot.send_message(
@@ -227,7 +267,6 @@ async def finish_admin_clarification(
     user_role = "user"
     with get_db() as db:
         request = db.query(Request).filter(Request.id == request_id).first()
-        admin_user = db.query(User).filter(User.id == admin_id).first()
 
         if not request:
             await bot.send_message(
@@ -242,8 +281,14 @@ async def finish_admin_clarification(
         if request.assigned_admin_id == admin_id:
             request.assigned_admin_id = None
         db.commit()
+        deadline_scheduler.assign(request.id, request.assigned_admin_id)
+        admin_load.assign(request.id, request.assigned_admin_id)
+        escalation_scheduler.track(request, since=datetime.now())
+        clarification_threads.close(request.id)
+        target_user_id = request.user_id
 
-        await state.clear()
+        if state_is_current:
+            await state.clear()
 
         request_data = {
             "id": request.id,
@@ -282,8 +327,9 @@ async def finish_admin_clarification(
             f"🆔 Заявка ID: {request_data['id']}\n\n"
             f"✅ Статус: {request_data['status']}"
         )
-        if admin_user and admin_user.role:
-            admin_role = admin_user.role
+        admin_context = get_user_context(admin_id)
+        if admin_context:
+            admin_role = admin_context.role
 
     if target_user_id:
         user_state = FSMContext(
@@ -364,37 +410,51 @@ async def finish_admin_clarification(
 
 
 @router.callback_query(F.data.startswith("admin_accept_"))
-async def admin_accept_request(callback_query: CallbackQuery, bot: Bot) -> None:
+async def admin_accept_request(callback_query: CallbackQuery, bot: Bot, db: Session) -> None:
     await callback_query.answer()
     request_id = int(callback_query.data.split("_")[2])
     admin_id = callback_query.from_user.id
 
-    with get_db() as db:
-        request = db.query(Request).filter(Request.id == request_id).first()
-        admin_user = db.query(User).filter(User.id == admin_id).first()
-        if not request:
-            await callback_query.message.answer("Заявка не найдена.")
-            return
+    request = db.query(Request).filter(Request.id == request_id).first()
+    admin_user = db.query(User).filter(User.id == admin_id).first()
+    if not request:
+        await callback_query.message.answer("Заявка не найдена.")
+        return
 
-        if request.status != "Принято":
-            await callback_query.message.answer(f"Эта заявка уже имеет статус: {request.status}.")
-            return
+    if request.status != "Принято":
+        await callback_query.message.answer(f"Эта заявка уже имеет статус: {request.status}.")
+        return
 
-        request.status = "Принято к исполнению"
-        request.assigned_admin_id = admin_id
-        admin_full_name = admin_user.full_name if admin_user else "Администратор"
-        admin_phone = admin_user.phone_number if admin_user else None
-        request_user_id = request.user_id
-        request_description = request.description or ""
-        admin_message_map = load_admin_message_map(request)
-        db.commit()
-        logger.info("Заявка ID:%s принята к исполнению администратором %s.", request.id, admin_id)
+    request.status = "Принято к исполнению"
+    request.assigned_admin_id = admin_id
+    request.accepted_at = datetime.now()
+    request.offered_admin_id = None
+    request.offer_expires_at = None
+    admin_full_name = admin_user.full_name if admin_user else "Администратор"
+    admin_phone = admin_user.phone_number if admin_user else None
+    request_user_id = request.user_id
+    request_description = request.description or ""
+    admin_message_map = load_admin_message_map(request)
+    admin_media_map = load_admin_media_map(request)
+    admin_message_id = admin_message_map.get(admin_id)
+    if admin_message_id:
+        save_admin_message_map(request, {admin_id: admin_message_id})
+        request.admin_message_id = admin_message_id
+    save_admin_media_map(request, {admin_id: admin_media_map[admin_id]} if admin_id in admin_media_map else {})
+    db.commit()
+    deadline_scheduler.assign(request.id, admin_id)
+    admin_load.assign(request.id, admin_id)
+    escalation_scheduler.cancel(request.id)
+    logger.info("Заявка ID:%s принята к исполнению администратором %s.", request.id, admin_id)
 
     for other_admin_id, message_id in admin_message_map.items():
         if other_admin_id == admin_id:
             continue
         try:
-            await callback_query.bot.delete_message(chat_id=other_admin_id, message_id=message_id)
+            # The album sent ahead of the card goes together with it.
+            await callback_query.bot.delete_messages(
+                chat_id=other_admin_id, message_ids=[*admin_media_map.get(other_admin_id, []), message_id]
+            )
             logger.info(
                 "Удалено уведомление о заявке %s для администратора %s после принятия.", request_id, other_admin_id
             )
@@ -406,16 +466,6 @@ async def admin_accept_request(callback_query: CallbackQuery, bot: Bot) -> None:
                 exc,
             )
 
-    admin_message_id = admin_message_map.get(admin_id)
-    if admin_message_id:
-        updated_map = {admin_id: admin_message_id}
-        with get_db() as db:
-            request = db.query(Request).filter(Request.id == request_id).first()
-            if request:
-                save_admin_message_map(request, updated_map)
-                request.admin_message_id = admin_message_id
-                db.commit()
-
     await _edit_message_content(
         bot=callback_query.bot,
         chat_id=callback_query.message.chat.id,
@@ -441,27 +491,27 @@ async def admin_accept_request(callback_query: CallbackQuery, bot: Bot) -> None:
 
 
 @router.callback_query(F.data.startswith("admin_decline_"))
-async def admin_decline_request(callback_query: CallbackQuery) -> None:
+async def admin_decline_request(callback_query: CallbackQuery, db: Session) -> None:
     await callback_query.answer()
     request_id = int(callback_query.data.split("_")[2])
     admin_id = callback_query.from_user.id
 
-    with get_db() as db:
-        request = db.query(Request).filter(Request.id == request_id).first()
-        admin_user = db.query(User).filter(User.id == admin_id).first()
-
-        if not request:
-            await callback_query.message.answer("Заявка не найдена.")
-            return
+    request = db.query(Request).filter(Request.id == request_id).first()
+    if not request:
+        await callback_query.message.answer("Заявка не найдена.")
+        return
 
-        if request.assigned_admin_id == admin_id:
-            request.assigned_admin_id = None
+    if request.assigned_admin_id == admin_id:
+        request.assigned_admin_id = None
 
-        if request.status != "Принято":
-            request.status = "Принято"
+    if request.status != "Принято":
+        request.status = "Принято"
 
-        db.commit()
-        logger.info("Администратор %s отказался от заявки %s после уточнения.", admin_id, request.id)
+    db.commit()
+    deadline_scheduler.assign(request.id, request.assigned_admin_id)
+    admin_load.assign(request.id, request.assigned_admin_id)
+    escalation_scheduler.track(request, since=datetime.now())
+    logger.info("Администратор %s отказался от заявки %s после уточнения.", admin_id, request.id)
 
     try:
         await callback_query.message.delete()
@@ -477,7 +527,6 @@ async def admin_clarify_start(callback_query: CallbackQuery, state: FSMContext,
 
     with get_db() as db:
         request = db.query(Request).filter(Request.id == request_id).first()
-        admin_user = db.query(User).filter(User.id == admin_id).first()
 
         if not request:
             await callback_query.message.answer("Заявка не найдена.")
@@ -487,24 +536,46 @@ async def admin_clarify_start(callback_query: CallbackQuery, state: FSMContext,
             await callback_query.message.answer("Эта заявка уже выполнена.")
             return
 
+        # Both sides keep their relay header in state so that relaying needs no DB access.
+        relay_header = admin_relay_header(request.id, request.description)
         await state.update_data(
             target_user_id=request.user_id,
             request_id=request_id,
             original_admin_message_id=callback_query.message.message_id,
+            relay_header=relay_header,
         )
         await state.set_state(ClarificationState.admin_active_dialogue)
+        clarification_threads.open(
+            ClarificationThread(
+                request_id=request.id, admin_id=admin_id, user_id=request.user_id, relay_header=relay_header
+            )
+        )
+        clarification_threads.record(admin_id, callback_query.message.message_id, request.id)
 
         user_state = FSMContext(
             storage=state.storage,
             key=StorageKey(bot_id=bot.id, chat_id=request.user_id, user_id=request.user_id),
         )
-        await user_state.update_data(target_admin_id=admin_id, request_id=request_id)
+        await user_state.update_data(
+            target_admin_id=admin_id,
+            request_id=request_id,
+            relay_header=user_relay_header(
+                request.creator.full_name if request.creator else str(request.user_id),
+                request.id,
+                request.description,
+            ),
+        )
         await user_state.set_state(ClarificationState.user_active_dialogue)
 
         if not request.assigned_admin_id:
             request.assigned_admin_id = admin_id
+        request.offered_admin_id = None
+        request.offer_expires_at = None
         request.status = "Уточнение"
         db.commit()
+        deadline_scheduler.assign(request.id, request.assigned_admin_id)
+        admin_load.assign(request.id, request.assigned_admin_id)
+        escalation_scheduler.cancel(request.id)
         logger.info("Администратор %s начал уточнение для заявки %s. Статус: Уточнение.", admin_id, request.id)
 
         try:
@@ -519,10 +590,48 @@ async def admin_clarify_start(callback_query: CallbackQuery, state: FSMContext,
         except Exception as exc:  # noqa: BLE001
             logger.error("Не удалось уведомить пользователя %s о начале диалога уточнения: %s", request.user_id, exc)
 
-    await callback_query.message.answer(
-        "Вы начали диалог уточнения с пользователем. Отправляйте сообщения. Для завершения диалога нажмите кнопку:",
+    prompt = await callback_query.message.answer(
+        "Вы начали диалог уточнения с пользователем. Отправляйте сообщения. Для завершения диалога нажмите кнопку.\n"
+        "Чтобы вести несколько диалогов сразу, отвечайте (reply) на сообщения нужной заявки.",
         reply_markup=get_admin_clarify_active_keyboard(request_id),
     )
+    clarification_threads.record(admin_id, prompt.message_id, request_id)
+
+
+def _replied_thread(message: Message) -> dict | bool:
+    resolved = clarification_threads.resolve(message.chat.id, message.reply_to_message.message_id)
+    if resolved is None:
+        return False
+    request_id, thread = resolved
+    return {"thread_request_id": request_id, "thread": thread}
+
+
+@router.message(F.reply_to_message, F.text, F.text != "Завершить уточнение", _replied_thread)
+async def process_admin_thread_reply(
+    message: Message, bot: Bot, thread_request_id: int, thread: ClarificationThread | None
+) -> None:
+    """Relays a reply to the dialogue of the replied message, whatever dialogue the FSM state holds."""
+    if thread is None:
+        await message.answer(f"Диалог уточнения по заявке ID:{thread_request_id} уже завершён.")
+        return
+
+    try:
+        await bot.send_message(
+            chat_id=thread.user_id,
+            text=f"{thread.relay_header}\n\n{message.text}",
+            reply_markup=get_user_clarify_active_keyboard(thread.request_id),
+        )
+    except Exception as exc:  # noqa: BLE001
+        await message.answer("Не удалось отправить сообщение пользователю. Возможно, он заблокировал бота.")
+        logger.error(
+            "Не удалось отправить сообщение пользователю %s для заявки %s: %s",
+            thread.user_id,
+            thread.request_id,
+            exc,
+        )
+    else:
+        clarification_threads.record(message.chat.id, message.message_id, thread.request_id)
+        transcript_writer.append(thread.request_id, message.from_user.id, "admin", message.text)
 
 
 @router.message(StateFilter(ClarificationState.admin_active_dialogue))
@@ -550,27 +659,31 @@ async def process_admin_clarification_message(message: Message, state: FSMContex
         await state.clear()
         return
 
-    with get_db() as db:
-        request = db.query(Request).filter(Request.id == request_id).first()
-        admin_user = db.query(User).filter(User.id == admin_id).first()
+    relay_header = state_data.get("relay_header")
+    if not relay_header:
+        # Dialogue started before headers were kept in state.
+        with get_db() as db:
+            request = db.query(Request).filter(Request.id == request_id).first()
+        relay_header = admin_relay_header(request_id, request.description if request else None)
+        await state.update_data(relay_header=relay_header)
 
-        try:
-            await bot.send_message(
-                chat_id=target_user_id,
-                text=(
-                    f"💬 От администратора по заявке ID:{request.id} ({request.description[:50] if request else '...'})\n\n"
-                    f"{message.text}"
-                ),
-                reply_markup=get_user_clarify_active_keyboard(request.id),
-            )
-        except Exception as exc:  # noqa: BLE001
-            await message.answer("Не удалось отправить сообщение пользователю. Возможно, он заблокировал бота.")
-            logger.error(
-                "Не удалось отправить сообщение пользователю %s для заявки %s: %s",
-                target_user_id,
-                request_id,
-                exc,
-            )
+    try:
+        await bot.send_message(
+            chat_id=target_user_id,
+            text=f"{relay_header}\n\n{message.text}",
+            reply_markup=get_user_clarify_active_keyboard(request_id),
+        )
+    except Exception as exc:  # noqa: BLE001
+        await message.answer("Не удалось отправить сообщение пользователю. Возможно, он заблокировал бота.")
+        logger.error(
+            "Не удалось отправить сообщение пользователю %s для заявки %s: %s",
+            target_user_id,
+            request_id,
+            exc,
+        )
+    else:
+        clarification_threads.record(admin_id, message.message_id, request_id)
+        transcript_writer.append(request_id, admin_id, "admin", message.text)
 
 
 @router.callback_query(F.data.startswith("admin_clarify_end_"))
@@ -599,17 +712,12 @@ async def admin_clarify_end_message(message: Message, state: FSMContext, bot: Bo
     )
 
 
-@router.message(F.text == "Мои принятые заявки")
+@admin_router.message(F.text == "Мои принятые заявки", flags={"throttling": MENU_THROTTLING})
 async def show_assigned_requests(message: Message, state: FSMContext) -> None:
     await _cleanup_menu_messages(state, message.bot, message.chat.id, "admin_assigned_messages")
     admin_id = message.from_user.id
     sent_messages: list[int] = []
     with get_db() as db:
-        admin_user = db.query(User).filter(User.id == admin_id).first()
-        if not admin_user or admin_user.role not in ["it_admin", "aho_admin"]:
-            await message.answer("У вас нет доступа к этой функции.")
-            return
-
         today_start = datetime.combine(datetime.now().date(), datetime.min.time())
 
         requests = (
@@ -660,19 +768,13 @@ async def show_assigned_requests(message: Message, state: FSMContext) -> None:
     await state.update_data(admin_assigned_messages=sent_messages)
 
 
-@router.message(F.text == "Новые заявки")
-async def show_new_requests(message: Message, state: FSMContext) -> None:
+@admin_router.message(F.text == "Новые заявки", flags={"throttling": MENU_THROTTLING})
+async def show_new_requests(message: Message, state: FSMContext, user_context: UserContext) -> None:
     await _cleanup_menu_messages(state, message.bot, message.chat.id, "admin_new_messages")
-    admin_id = message.from_user.id
     sent_messages: list[int] = []
 
     with get_db() as db:
-        admin_user = db.query(User).filter(User.id == admin_id).first()
-        if not admin_user or admin_user.role not in ["it_admin", "aho_admin"]:
-            await message.answer("У вас нет доступа к этой функции.")
-            return
-
-        request_type_filter = "IT" if admin_user.role == "it_admin" else "AHO"
+        request_type_filter = user_context.request_type
 
         requests = (
             db.query(Request)
@@ -720,6 +822,139 @@ async def show_new_requests(message: Message, state: FSMContext) -> None:
         await state.update_data(admin_new_messages=sent_messages)
 
 
+@admin_router.message(Command("reload_config"))
+async def admin_reload_config(message: Message) -> None:
+    if await reload_runtime_config():
+        await message.answer("Конфигурация администраторов и организаций перечитана.")
+    else:
+        await message.answer("Не удалось перечитать конфигурацию, оставлена прежняя. Подробности в логе.")
+
+
+@admin_router.message(F.text == "Сводка очереди")
+@admin_router.message(Command("dashboard"))
+async def show_queue_dashboard(message: Message) -> None:
+    await message.answer(
+        render_queue_snapshot(get_queue_snapshot()),
+        reply_markup=get_admin_dashboard_keyboard(),
+    )
+
+
+@admin_router.callback_query(F.data == "admin_dashboard_refresh")
+async def refresh_queue_dashboard(callback_query: CallbackQuery) -> None:
+    await callback_query.answer("Обновлено")
+    await _edit_message_content(
+        bot=callback_query.bot,
+        chat_id=callback_query.message.chat.id,
+        message_id=callback_query.message.message_id,
+        text=render_queue_snapshot(get_queue_snapshot()),
+        reply_markup=get_admin_dashboard_keyboard(),
+    )
+
+
+@admin_router.message(Command("sla_report"))
+async def show_sla_report(message: Message, command: CommandObject) -> None:
+    days = 30
+    if command.args:
+        try:
+            days = max(1, min(int(command.args.strip()), 366))
+        except ValueError:
+            await message.answer("Укажите период в днях, например: /sla_report 30")
+            return
+    for chunk in render_sla_report(load_sla_report(days), days):
+        await message.answer(chunk)
+
+
+@admin_router.message(Command("export"))
+async def export_requests(message: Message, command: CommandObject) -> None:
+    usage = "Укажите период в формате: /export ГГГГ-ММ-ДД ГГГГ-ММ-ДД"
+    parts = (command.args or "").split()
+    if len(parts) != 2:
+        await message.answer(usage)
+        return
+    try:
+        date_from, date_to = (datetime.strptime(part, "%Y-%m-%d").date() for part in parts)
+    except ValueError:
+        await message.answer(usage)
+        return
+    if date_from > date_to:
+        await message.answer("Начало периода должно быть не позже его окончания.")
+        return
+
+    await message.answer("Формирую выгрузку, это может занять некоторое время…")
+    try:
+        path, row_count = await asyncio.to_thread(export_requests_csv, date_from, date_to)
+    except Exception as exc:  # noqa: BLE001
+        logger.error("Не удалось сформировать выгрузку заявок за %s — %s: %s", date_from, date_to, exc)
+        await message.answer("Не удалось сформировать выгрузку. Попробуйте позже.")
+        return
+
+    try:
+        await message.answer_document(
+            FSInputFile(path, filename=f"requests_{date_from:%Y%m%d}_{date_to:%Y%m%d}.csv"),
+            caption=f"Заявки за {date_from:%d.%m.%Y} — {date_to:%d.%m.%Y}: {row_count} шт.",
+        )
+    finally:
+        os.remove(path)
+
+
+@admin_router.message(Command("digest"))
+async def toggle_digest_mode(message: Message, bot: Bot, db: Session) -> None:
+    admin = db.get(Admin, message.from_user.id)
+    if not admin:
+        await message.answer("Вы не найдены в списке администраторов.")
+        return
+
+    admin.digest_mode = not admin.digest_mode
+    db.commit()
+    if admin.digest_mode:
+        await message.answer(
+            "Режим сводки включён: несрочные заявки будут приходить одним сообщением "
+            f"раз в {DIGEST_INTERVAL_MINUTES} мин. или по {DIGEST_MAX_REQUESTS} шт. "
+            "Срочные заявки приходят сразу. Повторите /digest, чтобы выключить."
+        )
+    else:
+        await digest_buffer.flush(bot, admin.id)
+        await message.answer("Режим сводки выключен: каждая новая заявка будет приходить отдельным сообщением.")
+
+
+@admin_router.callback_query(F.data.startswith("admin_open_card_"))
+async def admin_open_request_card(callback_query: CallbackQuery, bot: Bot, db: Session) -> None:
+    request_id = int(callback_query.data.removeprefix("admin_open_card_"))
+    admin_id = callback_query.from_user.id
+    request = db.get(Request, request_id)
+    if not request:
+        await callback_query.answer("Заявка не найдена.", show_alert=True)
+        return
+    if request.status != "Принято" or request.assigned_admin_id:
+        await callback_query.answer(f"Заявка уже в работе, статус: {request.status}.", show_alert=True)
+        return
+
+    user = db.get(User, request.user_id)
+    if not user:
+        await callback_query.answer("Автор заявки не найден.", show_alert=True)
+        return
+    card_text = render_admin_card(request, user)
+    attachments = list(request.attachments)
+    db.commit()
+    await callback_query.answer()
+
+    sent_message, media_message_ids = await send_admin_card(bot, admin_id, request, card_text, attachments)
+    # Register the card so that accepting the request elsewhere removes it.
+    admin_message_map = load_admin_message_map(request)
+    admin_message_map[admin_id] = sent_message.message_id
+    save_admin_message_map(request, admin_message_map)
+    if media_message_ids:
+        admin_media_map = load_admin_media_map(request)
+        admin_media_map[admin_id] = media_message_ids
+        save_admin_media_map(request, admin_media_map)
+    db.commit()
+
+
+@router.message(F.text.in_({"Новые заявки", "Мои принятые заявки", "Сводка очереди"}))
+async def admin_menu_access_denied(message: Message) -> None:
+    await message.answer("У вас нет доступа к этой функции.")
+
+
 @router.callback_query(F.data.startswith("admin_done_"))
 async def admin_done_request(callback_query: CallbackQuery, state: FSMContext) -> None:
     await callback_query.answer()
@@ -758,7 +993,7 @@ async def admin_done_request(callback_query: CallbackQuery, state: FSMContext) -
 
 
 @router.callback_query(AdminCompletionState.waiting_for_feedback, F.data.startswith("admin_feedback_skip_"))
-async def admin_feedback_skip(callback_query: CallbackQuery, state: FSMContext) -> None:
+async def admin_feedback_skip(callback_query: CallbackQuery, state: FSMContext, db: Session) -> None:
     await callback_query.answer()
     state_data = await state.get_data()
     request_id = state_data.get("completion_request_id")
@@ -770,6 +1005,7 @@ async def admin_feedback_skip(callback_query: CallbackQuery, state: FSMContext)
         return
 
     success = await _complete_request(
+        db=db,
         bot=callback_query.bot,
         admin_id=callback_query.from_user.id,
         request_id=request_id,
@@ -791,7 +1027,7 @@ async def admin_feedback_cancel(callback_query: CallbackQuery, state: FSMContext
 
 
 @router.message(StateFilter(AdminCompletionState.waiting_for_feedback))
-async def admin_feedback_message(message: Message, state: FSMContext, bot: Bot) -> None:
+async def admin_feedback_message(message: Message, state: FSMContext, bot: Bot, db: Session) -> None:
     state_data = await state.get_data()
     request_id = state_data.get("completion_request_id")
     admin_message_meta = state_data.get("completion_admin_message")
@@ -806,6 +1042,7 @@ async def admin_feedback_message(message: Message, state: FSMContext, bot: Bot)
         return
 
     success = await _complete_request(
+        db=db,
         bot=bot,
         admin_id=message.from_user.id,
         request_id=request_id,
@@ -6,13 +6,14 @@ from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
 from sqlalchemy.exc import IntegrityError
 
-from app.config import ORGANIZATIONS_NEEDING_OFFICE_NUMBER, PREDEFINED_ORGANIZATIONS
 from app.db import get_db
 from app.db.models import User
 from app.keyboards.main import (
     get_main_menu_keyboard,
     get_organization_selection_keyboard,
 )
+from app.services.runtime_config import get_runtime_config
+from app.services.user_context import invalidate_user_context
 from app.states.registration import RegistrationStates
 
 logger = logging.getLogger(__name__)
@@ -46,6 +47,7 @@ async def cmd_start(message: Message, state: FSMContext) -> None:
                 db.commit()
                 db.refresh(new_user)
                 user = new_user
+                invalidate_user_context(user.id)
                 logger.info("Новый пользователь %s добавлен в БД.", message.from_user.id)
                 show_user_manual = True
             except IntegrityError:
@@ -119,15 +121,16 @@ async def process_phone_number(message: Message, state: FSMContext) -> None:
 async def process_organization_selection(callback_query: CallbackQuery, state: FSMContext) -> None:
     await callback_query.answer()
     org_index = int(callback_query.data.split("_")[2])
+    runtime_config = get_runtime_config()
 
-    if 0 <= org_index < len(PREDEFINED_ORGANIZATIONS):
-        organization_name = PREDEFINED_ORGANIZATIONS[org_index]
+    if 0 <= org_index < len(runtime_config.predefined_organizations):
+        organization_name = runtime_config.predefined_organizations[org_index]
         await state.update_data(organization=organization_name)
 
         try:
             await callback_query.message.edit_text(f"Вы выбрали: {organization_name}")
 
-            if organization_name in ORGANIZATIONS_NEEDING_OFFICE_NUMBER:
+            if organization_name in runtime_config.organizations_needing_office_number:
                 await callback_query.message.answer("Пожалуйста, укажите номер кабинета:")
                 await state.set_state(RegistrationStates.waiting_for_office_number)
             else:
@@ -192,6 +195,7 @@ async def complete_registration(message: Message, state: FSMContext) -> None:
             user.office_number = user_data.get("office_number") if "office_number" in user_data else None
             user.registered = True
             db.commit()
+            invalidate_user_context(user.id)
             logger.info("Пользователь %s успешно зарегистрирован.", user.id)
             await message.answer(
                 "Регистрация завершена! Теперь вы можете создавать заявки.",
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 import re
@@ -8,33 +9,65 @@ from aiogram.exceptions import TelegramBadRequest
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
 from aiogram_calendar import SimpleCalendar, SimpleCalendarCallback
+from sqlalchemy.orm import Session
 
+from app.config import AUTO_ASSIGN, AUTO_ASSIGN_TIMEOUT_MINUTES
 from app.db import get_db
-from app.db.models import Admin, Category, Request, Subcategory, User
-from app.keyboards.admin import get_admin_new_request_keyboard
+from app.db.models import Admin, Category, Request, RequestAttachment, RequestFollower, Subcategory, User, Vehicle
+from app.keyboards.calendar import CAR_CALENDAR_LEGEND, CarBookingCalendar
 from app.keyboards.main import (
+    get_car_slots_keyboard,
     get_comment_skip_keyboard,
+    get_duplicate_keyboard,
     get_photo_skip_keyboard,
     get_request_confirmation_keyboard,
     get_urgency_keyboard,
 )
-from app.states.requests import NewRequestStates
-from app.services.admin_notifications import load_admin_message_map, save_admin_message_map
-from app.services.categories import ensure_aho_categories_exist, ensure_categories_exist
+from app.middlewares import FSMUnitOfWork
+from app.states.requests import NewRequestDraft, NewRequestStates
+from app.services.admin_load import admin_load
+from app.services.admin_notifications import (
+    load_admin_media_map,
+    load_admin_message_map,
+    render_admin_card,
+    save_admin_media_map,
+    save_admin_message_map,
+    send_admin_card,
+)
+from app.services.car_bookings import (
+    booking_window,
+    find_free_slots_any_vehicle,
+    find_free_vehicle,
+    find_overlap,
+    invalidate_car_occupancy,
+    load_car_schedules,
+)
+from app.services.deadlines import deadline_scheduler
+from app.services.digest import digest_buffer
+from app.services.duplicates import duplicate_index
+from app.services.escalation import escalation_scheduler
+from app.services.user_context import UserContext
 
 logger = logging.getLogger(__name__)
 
 router = Router()
 
+MEDIA_GROUP_WINDOW_SECONDS = 1.0
+_media_group_buffers: dict[tuple[int, str], list[tuple[int, str, str]]] = {}
+
 
 async def _track_temporary_message(state: FSMContext | None, message_id: int | None) -> None:
     if not state or not message_id:
         return
 
+    if isinstance(state, FSMUnitOfWork):
+        state.draft.track_message(message_id)
+        return
+
     user_data = await state.get_data()
-    existing_ids = set(user_data.get("messages_to_cleanup", []))
-    existing_ids.add(message_id)
-    await state.update_data(messages_to_cleanup=list(existing_ids))
+    draft = NewRequestDraft(user_data)
+    draft.track_message(message_id)
+    await state.update_data(messages_to_cleanup=draft.messages_to_cleanup)
 
 
 async def update_request_prompt(
@@ -81,8 +114,7 @@ async def update_request_prompt(
 
 
 async def _cleanup_request_messages(bot: Bot, chat_id: int, state: FSMContext) -> None:
-    user_data = await state.get_data()
-    message_ids = user_data.get("messages_to_cleanup", [])
+    message_ids = await state.get_value("messages_to_cleanup", [])
     for message_id in message_ids:
         if not message_id:
             continue
@@ -118,19 +150,17 @@ def _parse_duration_minutes(duration_text: str) -> int | None:
     return int(number_value * 60)
 
 
-def _find_overlapping_car_request(db_session, start_at: datetime, end_at: datetime) -> Request | None:
-    return (
-        db_session.query(Request)
-        .filter(
-            Request.request_type == "AHO",
-            Request.car_start_at.isnot(None),
-            Request.car_end_at.isnot(None),
-            Request.car_start_at < end_at,
-            Request.car_end_at > start_at,
-        )
-        .order_by(Request.car_start_at)
-        .first()
+def _find_free_vehicle_id(db_session, start_at: datetime, end_at: datetime) -> int | None:
+    return find_free_vehicle(load_car_schedules(db_session, start_at, end_at), start_at, end_at)
+
+
+async def _reject_car_booking_without_vehicles(bot: Bot, chat_id: int, state: FSMContext) -> None:
+    await bot.send_message(
+        chat_id=chat_id,
+        text="Бронирование недоступно: в боте не настроено ни одного служебного автомобиля. Обратитесь к администратору.",
     )
+    await _cleanup_request_messages(bot, chat_id, state)
+    await state.clear()
 
 
 def _get_sorted_categories(db_session, request_type: str = "IT") -> list[Category]:
@@ -262,16 +292,16 @@ async def _prompt_for_comment(
 
 
 async def _prompt_for_confirmation(bot: Bot, chat_id: int, state: FSMContext) -> None:
-    user_data = await state.get_data()
-    prompt_message_id = user_data.get("prompt_message_id")
-    request_type = user_data.get("request_type", "")
-    description = user_data.get("description", "")
-    urgency = user_data.get("urgency")
-    due_date = user_data.get("due_date")
-    comment = user_data.get("comment")
-    category_name = user_data.get("category_name")
-    subcategory_name = user_data.get("subcategory_name")
-    planned_date = user_data.get("planned_date")
+    draft = NewRequestDraft(await state.get_data())
+    prompt_message_id = draft.prompt_message_id
+    request_type = draft.request_type or ""
+    description = draft.description or ""
+    urgency = draft.urgency
+    due_date = draft.due_date
+    comment = draft.comment
+    category_name = draft.category_name
+    subcategory_name = draft.subcategory_name
+    planned_date = draft.planned_date
 
     urgency_text = "Как можно скорее" if urgency == "ASAP" else f"К {due_date}" if due_date else "Не указана"
     request_name = "ИТ" if request_type == "IT" else "АХО" if request_type == "AHO" else ""
@@ -308,13 +338,10 @@ async def _prompt_for_confirmation(bot: Bot, chat_id: int, state: FSMContext) ->
 
 
 @router.message(F.text.in_({"Создать ИТ-заявку", "Создать АХО-заявку"}))
-async def start_new_request(message: Message, state: FSMContext) -> None:
-    with get_db() as db:
-        user = db.query(User).filter(User.id == message.from_user.id).first()
-
-        if not user or not user.registered:
-            await message.answer("Вы не зарегистрированы или регистрация не завершена. Пожалуйста, начните с команды /start.")
-            return
+async def start_new_request(message: Message, state: FSMContext, user_context: UserContext | None) -> None:
+    if not user_context or not user_context.registered:
+        await message.answer("Вы не зарегистрированы или регистрация не завершена. Пожалуйста, начните с команды /start.")
+        return
     await _track_temporary_message(state, message.message_id)
     request_type = "IT" if message.text == "Создать ИТ-заявку" else "AHO"
     await state.update_data(
@@ -324,7 +351,6 @@ async def start_new_request(message: Message, state: FSMContext) -> None:
 
     if request_type == "AHO":
         with get_db() as db:
-            ensure_aho_categories_exist(db)
             categories = _get_sorted_categories(db, request_type="AHO")
 
         prompt_message_id = await update_request_prompt(
@@ -340,7 +366,6 @@ async def start_new_request(message: Message, state: FSMContext) -> None:
         return
 
     with get_db() as db:
-        ensure_categories_exist(db)
         categories = _get_sorted_categories(db)
 
     prompt_message_id = await update_request_prompt(
@@ -673,12 +698,12 @@ async def process_aho_subcategory_selection(callback_query: CallbackQuery, state
     subcategory_name = (subcategory.name or "").lower()
 
     if category_name == "пользование авто":
-        calendar_markup = await SimpleCalendar().start_calendar()
+        calendar_markup = await CarBookingCalendar().start_calendar()
         prompt_message_id = await update_request_prompt(
             bot=callback_query.bot,
             chat_id=callback_query.message.chat.id,
             message_id=prompt_message_id,
-            text="Выберите дату поездки на авто:",
+            text=f"Выберите дату поездки на авто:\n{CAR_CALENDAR_LEGEND}",
             reply_markup=calendar_markup,
             state=state,
         )
@@ -800,7 +825,7 @@ async def process_description(message: Message, state: FSMContext) -> None:
 async def process_car_date_selection(
     callback_query: CallbackQuery, callback_data: SimpleCalendarCallback, state: FSMContext
 ) -> None:
-    selected, selected_date = await SimpleCalendar().process_selection(callback_query, callback_data)
+    selected, selected_date = await CarBookingCalendar().process_selection(callback_query, callback_data)
 
     if not selected:
         return
@@ -834,7 +859,7 @@ async def process_car_time(message: Message, state: FSMContext) -> None:
     car_date = user_data.get("car_date")
 
     if not car_date:
-        calendar_markup = await SimpleCalendar().start_calendar()
+        calendar_markup = await CarBookingCalendar().start_calendar()
         prompt_message_id = await update_request_prompt(
             bot=message.bot,
             chat_id=message.chat.id,
@@ -926,132 +951,234 @@ async def process_car_duration(message: Message, state: FSMContext) -> None:
         return
 
     end_datetime = start_datetime + timedelta(minutes=duration_minutes)
+    duration = end_datetime - start_datetime
+    window_start, window_end = booking_window(start_datetime, not_before=datetime.now())
 
     with get_db() as db:
-        overlapping_request = _find_overlapping_car_request(db, start_datetime, end_datetime)
+        schedules = load_car_schedules(db, min(start_datetime, window_start), max(end_datetime, window_end))
 
-    if overlapping_request:
-        busy_date = overlapping_request.car_start_at.strftime("%d-%m")
-        busy_from_time = overlapping_request.car_start_at.strftime("%H:%M")
-        busy_to_time = overlapping_request.car_end_at.strftime("%H:%M")
+    if not schedules:
+        await _reject_car_booking_without_vehicles(message.bot, message.chat.id, state)
+        return
+
+    if find_free_vehicle(schedules, start_datetime, end_datetime) is None:
+        if len(schedules) == 1:
+            busy_start, busy_end = find_overlap(next(iter(schedules.values())), start_datetime, end_datetime)
+            busy_date = busy_start.strftime("%d-%m")
+            busy_from_time = busy_start.strftime("%H:%M")
+            busy_to_time = busy_end.strftime("%H:%M")
+            busy_text = (
+                "Автомобиль уже забронирован на это время. "
+                f"Он занят {busy_date} с {busy_from_time} до {busy_to_time}."
+            )
+        else:
+            busy_text = "Все автомобили уже забронированы на это время."
+        free_slots = find_free_slots_any_vehicle(schedules, start_datetime, duration, window_start, window_end)
+        if free_slots:
+            hint = (
+                f"Свободные окна на {duration_text} в этот день — выберите время кнопкой "
+                "или введите другое время начала (ЧЧ:ММ)."
+            )
+        else:
+            hint = "В этот день свободных окон такой длительности нет. Введите другое время начала (ЧЧ:ММ)."
         prompt_message_id = await update_request_prompt(
             bot=message.bot,
             chat_id=message.chat.id,
             message_id=prompt_message_id,
-            text=(
-                "Автомобиль уже забронирован на это время. "
-                f"Он занят {busy_date} с {busy_from_time} до {busy_to_time}.\n"
-                "Выберите другое время начала поездки (ЧЧ:ММ)."
-            ),
+            text=f"{busy_text}\n{hint}",
+            reply_markup=get_car_slots_keyboard(free_slots) if free_slots else None,
             edit_existing=False,
             state=state,
         )
-        await state.update_data(prompt_message_id=prompt_message_id)
+        await state.update_data(
+            prompt_message_id=prompt_message_id,
+            car_duration_text=duration_text,
+            car_duration_minutes=duration_minutes,
+        )
         await state.set_state(NewRequestStates.waiting_for_car_time)
         return
 
+    await _ask_car_location(message.bot, message.chat.id, state, start_datetime, end_datetime, duration_text)
+
+
+@router.callback_query(NewRequestStates.waiting_for_car_time, F.data.startswith("car_slot_"))
+async def process_car_slot_selection(callback_query: CallbackQuery, state: FSMContext) -> None:
+    user_data = await state.get_data()
+    duration_text = user_data.get("car_duration_text")
+    duration_minutes = user_data.get("car_duration_minutes")
+    try:
+        start_datetime = datetime.strptime(callback_query.data.removeprefix("car_slot_"), "%Y%m%d%H%M")
+    except ValueError:
+        await callback_query.answer("Не удалось распознать время.", show_alert=True)
+        return
+    if not duration_minutes:
+        await callback_query.answer("Введите время начала поездки (ЧЧ:ММ).", show_alert=True)
+        return
+
+    end_datetime = start_datetime + timedelta(minutes=duration_minutes)
+    with get_db() as db:
+        vehicle_id = _find_free_vehicle_id(db, start_datetime, end_datetime)
+    if vehicle_id is None:
+        await callback_query.answer(
+            "Это время только что заняли. Выберите другое окно или введите время вручную.", show_alert=True
+        )
+        return
+
+    await callback_query.answer()
+    await state.update_data(car_time=start_datetime.strftime("%H:%M"))
+    # Edit the prompt in place so the slot buttons go away.
+    await _ask_car_location(
+        callback_query.bot,
+        callback_query.message.chat.id,
+        state,
+        start_datetime,
+        end_datetime,
+        duration_text,
+        edit_existing=True,
+    )
+
+
+async def _ask_car_location(
+    bot: Bot,
+    chat_id: int,
+    state: FSMContext,
+    start_datetime: datetime,
+    end_datetime: datetime,
+    duration_text: str,
+    *,
+    edit_existing: bool = False,
+) -> None:
+    user_data = await state.get_data()
     await state.update_data(
         car_duration_text=duration_text,
-        car_duration_minutes=duration_minutes,
+        car_duration_minutes=int((end_datetime - start_datetime).total_seconds() // 60),
         car_start_at=start_datetime.isoformat(),
         car_end_at=end_datetime.isoformat(),
     )
 
     prompt_message_id = await update_request_prompt(
-        bot=message.bot,
-        chat_id=message.chat.id,
-        message_id=prompt_message_id,
+        bot=bot,
+        chat_id=chat_id,
+        message_id=user_data.get("prompt_message_id"),
         text="Укажите место поездки.",
-        edit_existing=False,
+        edit_existing=edit_existing,
         state=state,
     )
     await state.update_data(prompt_message_id=prompt_message_id)
     await state.set_state(NewRequestStates.waiting_for_car_location)
 
 
-    @router.message(NewRequestStates.waiting_for_car_location)
-    async def process_car_location(message: Message, state: FSMContext) -> None:
-        await _track_temporary_message(state, message.message_id)
-        location_text = (message.text or "").strip()
-        user_data = await state.get_data()
-        prompt_message_id = user_data.get("prompt_message_id")
-        car_date = user_data.get("car_date")
-        car_time = user_data.get("car_time")
-        duration_text = user_data.get("car_duration_text")
-        car_start_at = user_data.get("car_start_at")
-        base_description = user_data.get("description", "Пользование авто")
-
-        if not location_text:
-            prompt_message_id = await update_request_prompt(
-                bot=message.bot,
-                chat_id=message.chat.id,
-                message_id=prompt_message_id,
-                text="Пожалуйста, укажите место поездки.",
-                edit_existing=False,
-                state=state,
-            )
-            await state.update_data(prompt_message_id=prompt_message_id)
-            return
+@router.message(NewRequestStates.waiting_for_car_location)
+async def process_car_location(message: Message, state: FSMContext) -> None:
+    await _track_temporary_message(state, message.message_id)
+    location_text = (message.text or "").strip()
+    user_data = await state.get_data()
+    prompt_message_id = user_data.get("prompt_message_id")
+    car_date = user_data.get("car_date")
+    car_time = user_data.get("car_time")
+    duration_text = user_data.get("car_duration_text")
+    car_start_at = user_data.get("car_start_at")
+    # Kept apart so that going back to the time step does not repeat the trip details.
+    base_description = user_data.get("car_base_description") or user_data.get("description", "Пользование авто")
 
-        details = []
-        if car_date:
-            details.append(f"Дата: {car_date}")
-        if car_time:
-            details.append(f"время: {car_time}")
-        if duration_text:
-            details.append(f"продолжительность: {duration_text}")
-        details.append(f"место: {location_text}")
-
-        description = f"{base_description}. {'; '.join(details)}."
-        car_start_formatted = None
-        if car_start_at:
-            try:
-                car_start_formatted = datetime.fromisoformat(car_start_at).strftime("%Y-%m-%d %H:%M")
-            except ValueError:
-                car_start_formatted = car_start_at
-        await state.update_data(
-            description=description,
-            car_location=location_text,
-            urgency="DATE",
-            due_date=car_start_formatted,
+    if not location_text:
+        prompt_message_id = await update_request_prompt(
+            bot=message.bot,
+            chat_id=message.chat.id,
+            message_id=prompt_message_id,
+            text="Пожалуйста, укажите место поездки.",
+            edit_existing=False,
+            state=state,
         )
-        await _prompt_for_confirmation(message.bot, message.chat.id, state)
+        await state.update_data(prompt_message_id=prompt_message_id)
+        return
 
+    details = []
+    if car_date:
+        details.append(f"Дата: {car_date}")
+    if car_time:
+        details.append(f"время: {car_time}")
+    if duration_text:
+        details.append(f"продолжительность: {duration_text}")
+    details.append(f"место: {location_text}")
+
+    description = f"{base_description}. {'; '.join(details)}."
+    car_start_formatted = None
+    if car_start_at:
+        try:
+            car_start_formatted = datetime.fromisoformat(car_start_at).strftime("%Y-%m-%d %H:%M")
+        except ValueError:
+            car_start_formatted = car_start_at
+    await state.update_data(
+        car_base_description=base_description,
+        description=description,
+        car_location=location_text,
+        urgency="DATE",
+        due_date=car_start_formatted,
+    )
+    await _prompt_for_confirmation(message.bot, message.chat.id, state)
 
-async def _store_attachment_and_ask_urgency(
-    message: Message, state: FSMContext, file_id: str, attachment_type: str
+
+async def _store_attachments_and_ask_urgency(
+    message: Message, state: FSMContext, attachments: list[list[str]]
 ) -> None:
     user_data = await state.get_data()
     prompt_message_id = user_data.get("prompt_message_id")
+    attached_text = "Файл прикреплён." if len(attachments) == 1 else f"Прикреплено файлов: {len(attachments)}."
     prompt_message_id = await update_request_prompt(
         bot=message.bot,
         chat_id=message.chat.id,
         message_id=prompt_message_id,
-        text="Файл прикреплён. Как срочно необходимо выполнить заявку?",
+        text=f"{attached_text} Как срочно необходимо выполнить заявку?",
         reply_markup=get_urgency_keyboard(),
         edit_existing=False,
         state=state,
     )
+    first_file_id, first_attachment_type = attachments[0]
     await state.update_data(
-        attachment_file_id=file_id,
-        attachment_type=attachment_type,
+        attachment_file_id=first_file_id,
+        attachment_type=first_attachment_type,
+        attachments=attachments,
         prompt_message_id=prompt_message_id,
         attachment_required=False,
     )
     await state.set_state(NewRequestStates.waiting_for_urgency)
 
+
+async def _collect_attachment(message: Message, state: FSMContext, file_id: str, attachment_type: str) -> None:
+    if not message.media_group_id:
+        await _track_temporary_message(state, message.message_id)
+        await _store_attachments_and_ask_urgency(message, state, [[file_id, attachment_type]])
+        return
+
+    # An album arrives as separate updates; the first one waits for the rest and handles them all,
+    # the others only add their file and leave the FSM state alone.
+    group_key = (message.chat.id, message.media_group_id)
+    album = _media_group_buffers.get(group_key)
+    if album is not None:
+        album.append((message.message_id, file_id, attachment_type))
+        return
+
+    album = _media_group_buffers[group_key] = [(message.message_id, file_id, attachment_type)]
+    await asyncio.sleep(MEDIA_GROUP_WINDOW_SECONDS)
+    del _media_group_buffers[group_key]
+
+    album.sort()
+    for message_id, _, _ in album:
+        await _track_temporary_message(state, message_id)
+    await _store_attachments_and_ask_urgency(
+        message, state, [[album_file_id, album_type] for _, album_file_id, album_type in album]
+    )
+
+
 @router.message(NewRequestStates.waiting_for_photo, F.photo)
 async def process_photo(message: Message, state: FSMContext) -> None:
-    await _track_temporary_message(state, message.message_id)
-    photo_file_id = message.photo[-1].file_id
-    await _store_attachment_and_ask_urgency(message, state, photo_file_id, "photo")
+    await _collect_attachment(message, state, message.photo[-1].file_id, "photo")
 
 
 @router.message(NewRequestStates.waiting_for_photo, F.document)
 async def process_document(message: Message, state: FSMContext) -> None:
-    await _track_temporary_message(state, message.message_id)
-    document_file_id = message.document.file_id
-    await _store_attachment_and_ask_urgency(message, state, document_file_id, "document")
+    await _collect_attachment(message, state, message.document.file_id, "document")
 
 @router.callback_query(NewRequestStates.waiting_for_photo, F.data == "skip_photo")
 async def skip_photo(callback_query: CallbackQuery, state: FSMContext) -> None:
@@ -1084,6 +1211,7 @@ async def skip_photo(callback_query: CallbackQuery, state: FSMContext) -> None:
     await state.update_data(
         attachment_file_id=None,
         attachment_type=None,
+        attachments=None,
         prompt_message_id=prompt_message_id,
     )
     await state.set_state(NewRequestStates.waiting_for_urgency)
@@ -1277,9 +1405,90 @@ async def skip_comment(callback_query: CallbackQuery, state: FSMContext) -> None
 
 
 @router.callback_query(NewRequestStates.waiting_for_confirmation, F.data == "confirm_request")
-async def confirm_request(callback_query: CallbackQuery, state: FSMContext) -> None:
+async def confirm_request(callback_query: CallbackQuery, state: FSMContext, db: Session) -> None:
+    draft = NewRequestDraft(await state.get_data())
+    if not draft.duplicates_checked and not draft.car_start_at:
+        user = db.get(User, callback_query.from_user.id)
+        duplicates = duplicate_index.find(
+            draft.request_type,
+            draft.subcategory_id,
+            user.organization if user else None,
+            draft.description,
+        )
+        if duplicates:
+            await callback_query.answer()
+            lines = ["Похоже, о такой проблеме уже сообщили:"]
+            lines.extend(f"• ID:{duplicate.request_id} — {duplicate.description[:80]}" for duplicate in duplicates)
+            lines.append("Можно присоединиться к существующей заявке — мы сообщим, когда она будет выполнена.")
+            prompt_message_id = await update_request_prompt(
+                bot=callback_query.bot,
+                chat_id=callback_query.message.chat.id,
+                message_id=draft.prompt_message_id,
+                text="\n".join(lines),
+                reply_markup=get_duplicate_keyboard([duplicate.request_id for duplicate in duplicates]),
+                state=state,
+            )
+            await state.update_data(prompt_message_id=prompt_message_id, duplicates_checked=True)
+            return
+
+    await callback_query.answer("Заявка отправляется")
+    await save_request(callback_query.message, state, callback_query.from_user.id, bot=callback_query.bot, db=db)
+
+
+@router.callback_query(NewRequestStates.waiting_for_confirmation, F.data == "dup_create")
+async def create_despite_duplicates(callback_query: CallbackQuery, state: FSMContext, db: Session) -> None:
     await callback_query.answer("Заявка отправляется")
-    await save_request(callback_query.message, state, callback_query.from_user.id, bot=callback_query.bot)
+    await save_request(callback_query.message, state, callback_query.from_user.id, bot=callback_query.bot, db=db)
+
+
+@router.callback_query(NewRequestStates.waiting_for_confirmation, F.data.startswith("dup_join_"))
+async def join_duplicate_request(callback_query: CallbackQuery, state: FSMContext, db: Session) -> None:
+    request_id = int(callback_query.data.split("_")[2])
+    user_id = callback_query.from_user.id
+    draft = NewRequestDraft(await state.get_data())
+
+    request = db.query(Request).filter(Request.id == request_id).first()
+    if not request or request.status == "Выполнено":
+        duplicate_index.remove(request_id)
+        await callback_query.answer("Эта заявка уже закрыта. Нажмите «Всё равно создать».", show_alert=True)
+        return
+    await callback_query.answer()
+
+    if request.user_id == user_id:
+        text = f"Заявка ID:{request.id} — ваша, она уже в работе. Следите за статусом в «Мои заявки»."
+    else:
+        already_following = (
+            db.query(RequestFollower.id)
+            .filter(RequestFollower.request_id == request.id, RequestFollower.user_id == user_id)
+            .first()
+        )
+        if not already_following:
+            db.add(RequestFollower(request_id=request.id, user_id=user_id))
+            db.commit()
+            logger.info("Пользователь %s присоединился к заявке ID:%s вместо создания дубля.", user_id, request.id)
+            if request.assigned_admin_id:
+                user = db.get(User, user_id)
+                try:
+                    await callback_query.bot.send_message(
+                        chat_id=request.assigned_admin_id,
+                        text=(
+                            f"👥 {user.full_name if user else user_id} ({user.organization if user else '—'}) "
+                            f"сообщает о той же проблеме по заявке ID:{request.id}."
+                            + (f"\n💬 Комментарий: {draft.comment}" if draft.comment else "")
+                        ),
+                    )
+                except Exception as exc:  # noqa: BLE001
+                    logger.error(
+                        "Не удалось уведомить администратора %s о присоединении к заявке %s: %s",
+                        request.assigned_admin_id,
+                        request.id,
+                        exc,
+                    )
+        text = f"Вы присоединились к заявке ID:{request.id}. Мы сообщим, когда она будет выполнена."
+
+    await callback_query.bot.send_message(chat_id=callback_query.message.chat.id, text=text)
+    await _cleanup_request_messages(callback_query.bot, callback_query.message.chat.id, state)
+    await state.clear()
 
 
 @router.callback_query(NewRequestStates.waiting_for_confirmation, F.data == "cancel_request")
@@ -1293,26 +1502,24 @@ async def cancel_request(callback_query: CallbackQuery, state: FSMContext) -> No
     await state.clear()
 
 
-async def save_request(message: Message, state: FSMContext, user_id: int, bot: Bot) -> None:
-    user_data = await state.get_data()
-    request_type = user_data.get("request_type")
-    description = user_data.get("description")
-    category_id = user_data.get("category_id")
-    subcategory_id = user_data.get("subcategory_id")
-    attachment_file_id = user_data.get("attachment_file_id")
-    attachment_type = user_data.get("attachment_type")
-    photo_file_id = attachment_file_id or user_data.get("photo_file_id")
+async def save_request(message: Message, state: FSMContext, user_id: int, bot: Bot, db: Session) -> None:
+    draft = NewRequestDraft(await state.get_data())
+    request_type = draft.request_type
+    description = draft.description
+    category_id = draft.category_id
+    subcategory_id = draft.subcategory_id
+    attachment_type = draft.attachment_type
+    photo_file_id = draft.attachment_file_id or draft.photo_file_id
     if photo_file_id and not attachment_type:
         attachment_type = "photo"
-    urgency = user_data.get("urgency")
-    due_date = user_data.get("due_date") if urgency == "DATE" else None
-    prompt_message_id = user_data.get("prompt_message_id")
-    comment = user_data.get("comment")
-    attachment_type = attachment_type
-    car_start_at_raw = user_data.get("car_start_at")
-    car_end_at_raw = user_data.get("car_end_at")
-    car_location = user_data.get("car_location")
-    planned_date_raw = user_data.get("planned_date")
+    attachments = draft.attachments or ([[photo_file_id, attachment_type]] if photo_file_id else [])
+    urgency = draft.urgency
+    due_date = draft.due_date if urgency == "DATE" else None
+    comment = draft.comment
+    car_start_at_raw = draft.car_start_at
+    car_end_at_raw = draft.car_end_at
+    car_location = draft.car_location
+    planned_date_raw = draft.planned_date
 
     car_start_at = None
     car_end_at = None
@@ -1333,118 +1540,151 @@ async def save_request(message: Message, state: FSMContext, user_id: int, bot: B
         except ValueError:
             planned_date = None
 
-    with get_db() as db:
-        user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(User).filter(User.id == user_id).first()
 
-        if not user:
-            await bot.send_message(
+    if not user:
+        await bot.send_message(
+            chat_id=message.chat.id,
+            text="Произошла ошибка: пользователь не найден. Пожалуйста, попробуйте начать заново (/start).",
+        )
+        await _cleanup_request_messages(bot, message.chat.id, state)
+        await state.clear()
+        return
+
+    vehicle_id = None
+    if car_start_at and car_end_at:
+        schedules = load_car_schedules(db, car_start_at, car_end_at)
+        if not schedules:
+            await _reject_car_booking_without_vehicles(bot, message.chat.id, state)
+            return
+        vehicle_id = find_free_vehicle(schedules, car_start_at, car_end_at)
+        if vehicle_id is None:
+            prompt_message_id = await update_request_prompt(
+                bot=bot,
                 chat_id=message.chat.id,
-                text="Произошла ошибка: пользователь не найден. Пожалуйста, попробуйте начать заново (/start).",
+                message_id=draft.prompt_message_id,
+                text=(
+                    "Пока вы оформляли заявку, все автомобили на это время заняли.\n"
+                    "Введите другое время начала поездки (ЧЧ:ММ)."
+                ),
+                edit_existing=False,
+                state=state,
             )
-            await _cleanup_request_messages(bot, message.chat.id, state)
-            await state.clear()
+            await state.update_data(prompt_message_id=prompt_message_id)
+            await state.set_state(NewRequestStates.waiting_for_car_time)
             return
+        vehicle = db.get(Vehicle, vehicle_id)
+        description = f"{description} Автомобиль: {vehicle.name}."
 
-        new_request = Request(
-            user_id=user_id,
-            request_type=request_type,
-            description=description,
-            category_id=category_id,
-            subcategory_id=subcategory_id,
-            photo_file_id=photo_file_id,
-            attachment_type=attachment_type,
-            urgency=urgency,
-            due_date=due_date,
-            status="Принято",
-            comment=comment,
-            car_start_at=car_start_at,
-            car_end_at=car_end_at,
-            car_location=car_location,
-            planned_date=planned_date,
-        )
-        db.add(new_request)
+    new_request = Request(
+        user_id=user_id,
+        request_type=request_type,
+        description=description,
+        category_id=category_id,
+        subcategory_id=subcategory_id,
+        photo_file_id=photo_file_id,
+        attachment_type=attachment_type,
+        urgency=urgency,
+        due_date=due_date,
+        status="Принято",
+        comment=comment,
+        car_start_at=car_start_at,
+        car_end_at=car_end_at,
+        car_location=car_location,
+        planned_date=planned_date,
+        vehicle_id=vehicle_id,
+        attachments=[
+            RequestAttachment(file_id=file_id, attachment_type=file_type, position=position)
+            for position, (file_id, file_type) in enumerate(attachments)
+        ],
+    )
+    db.add(new_request)
 
-        if category_id:
-            category = db.query(Category).filter(Category.id == category_id).first()
-            if category:
-                category.request_count = (category.request_count or 0) + 1
-        if subcategory_id:
-            subcategory = db.query(Subcategory).filter(Subcategory.id == subcategory_id).first()
-            if subcategory:
-                subcategory.request_count = (subcategory.request_count or 0) + 1
+    if category_id:
+        category = db.query(Category).filter(Category.id == category_id).first()
+        if category:
+            category.request_count = (category.request_count or 0) + 1
+    if subcategory_id:
+        subcategory = db.query(Subcategory).filter(Subcategory.id == subcategory_id).first()
+        if subcategory:
+            subcategory.request_count = (subcategory.request_count or 0) + 1
 
-        db.commit()
-        db.refresh(new_request)
+    db.commit()
+    if car_start_at and car_end_at:
+        invalidate_car_occupancy(car_start_at, car_end_at)
+    deadline_scheduler.track(new_request)
+    escalation_scheduler.track(new_request)
+    duplicate_index.add(new_request, user.organization)
 
-        await bot.send_message(
-            chat_id=message.chat.id,
-            text="Заявка успешно создана, вы можете отслеживать её статус в «Мои заявки».",
-        )
-        await _cleanup_request_messages(bot, message.chat.id, state)
-        await state.clear()
-        await notify_admins(db, new_request, user, bot)
-        logger.info("Заявка ID:%s от пользователя %s создана и отправлена администраторам.", new_request.id, user.id)
+    await bot.send_message(
+        chat_id=message.chat.id,
+        text="Заявка успешно создана, вы можете отслеживать её статус в «Мои заявки».",
+    )
+    await _cleanup_request_messages(bot, message.chat.id, state)
+    await state.clear()
+    await notify_admins(db, new_request, user, bot)
+    logger.info("Заявка ID:%s от пользователя %s создана и отправлена администраторам.", new_request.id, user.id)
 
 
-async def notify_admins(db_session, request: Request, user: User, bot: Bot) -> None:
+async def notify_admins(db_session, request: Request, user: User, bot: Bot, *, broadcast: bool = False) -> None:
     admin_type_filter = "IT_ADMIN" if request.request_type == "IT" else "AHO_ADMIN"
-    admin_ids_to_notify = [admin.id for admin in db_session.query(Admin).filter(Admin.admin_type == admin_type_filter).all()]
-
-    user_details = f"📞 Телефон: {user.phone_number}\n🏢 Организация: {user.organization}"
-    if user.office_number:
-        user_details += f"\n🚪 Кабинет: {user.office_number}"
-
-    comment_block = f"\n💬 Комментарий: {request.comment}" if request.comment else ""
-    category_block = ""
-    if request.category or request.subcategory:
-        category_lines = []
-        if request.category:
-            category_lines.append(f"Категория: {request.category.name}")
-        if request.subcategory:
-            category_lines.append(f"Подкатегория: {request.subcategory.name}")
-        category_block = "\n" + "\n".join(category_lines)
-    planned_date_text = None
-    if request.due_date:
-        planned_date_text = request.due_date
-    elif request.planned_date:
-        planned_date_text = request.planned_date.strftime("%Y-%m-%d")
-    planned_date_block = f"\n📅 Дата исполнения: {planned_date_text}" if planned_date_text else ""
-
-    request_info = (
-        f"🚨 Новая заявка от {user.full_name} 🚨\n"
-        f"{user_details}\n"
-        f"📝 Описание: {request.description}{category_block}\n"
-        f"⏰ Срочность: {'Как можно скорее' if request.urgency == 'ASAP' else f'К {request.due_date}'}{planned_date_block}{comment_block}\n"
-        f"🆔 Заявка ID: {request.id}"
-    )
-
-    keyboard = get_admin_new_request_keyboard(request.id)
+    admins = db_session.query(Admin).filter(Admin.admin_type == admin_type_filter).all()
+    admin_ids_to_notify = [admin.id for admin in admins]
     admin_message_map = load_admin_message_map(request)
+    admin_media_map = load_admin_media_map(request)
+    offer_block = ""
+    digest_admin_ids: list[int] = []
+    if broadcast:
+        admin_ids_to_notify = [admin_id for admin_id in admin_ids_to_notify if admin_id not in admin_message_map]
+        request.offered_admin_id = None
+        request.offer_expires_at = None
+    elif AUTO_ASSIGN and (offered_admin_id := admin_load.offer(request.id, admin_ids_to_notify)) is not None:
+        admin_ids_to_notify = [offered_admin_id]
+        # Persisted so that the fallback to the pool survives a restart.
+        request.offered_admin_id = offered_admin_id
+        request.offer_expires_at = datetime.now() + timedelta(minutes=AUTO_ASSIGN_TIMEOUT_MINUTES)
+        escalation_scheduler.track_offer(request.id, request.offer_expires_at)
+        offer_block = (
+            "\n👤 Заявка предложена вам как наименее загруженному исполнителю. "
+            f"Если не принять её за {AUTO_ASSIGN_TIMEOUT_MINUTES} мин., она уйдёт всем администраторам."
+        )
+    elif request.urgency != "ASAP":
+        digest_admin_ids = [admin.id for admin in admins if admin.digest_mode]
+        admin_ids_to_notify = [admin_id for admin_id in admin_ids_to_notify if admin_id not in digest_admin_ids]
+
+    request_info = render_admin_card(request, user, offer_block)
+    attachments = list(request.attachments)
+    # Release the connection before the Bot API calls below.
+    db_session.commit()
+
+    for admin_id in digest_admin_ids:
+        if digest_buffer.add(admin_id, request):
+            await digest_buffer.flush(bot, admin_id)
 
     for admin_id in admin_ids_to_notify:
         try:
-            if request.photo_file_id:
-                attachment_type = (request.attachment_type or "photo").lower()
-                if attachment_type == "document":
-                    sent_message = await bot.send_document(
-                        chat_id=admin_id,
-                        document=request.photo_file_id,
-                        caption=request_info,
-                        reply_markup=keyboard,
-                    )
-                else:
-                    sent_message = await bot.send_photo(
-                        chat_id=admin_id,
-                        photo=request.photo_file_id,
-                        caption=request_info,
-                        reply_markup=keyboard,
-                    )
-            else:
-                sent_message = await bot.send_message(chat_id=admin_id, text=request_info, reply_markup=keyboard)
+            sent_message, media_message_ids = await send_admin_card(bot, admin_id, request, request_info, attachments)
             admin_message_map[admin_id] = sent_message.message_id
+            if media_message_ids:
+                admin_media_map[admin_id] = media_message_ids
             request.admin_message_id = sent_message.message_id
-            save_admin_message_map(request, admin_message_map)
-            db_session.commit()
             logger.info("Уведомление о заявке %s отправлено администратору %s.", request.id, admin_id)
         except Exception as exc:  # noqa: BLE001
-            logger.error("Не удалось отправить уведомление администратору %s о заявке %s: %s", admin_id, request.id, exc)
\ No newline at end of file
+            logger.error("Не удалось отправить уведомление администратору %s о заявке %s: %s", admin_id, request.id, exc)
+
+    save_admin_message_map(request, admin_message_map)
+    save_admin_media_map(request, admin_media_map)
+    db_session.commit()
+
+
+async def _broadcast_offered_request(bot: Bot, request: Request) -> None:
+    with get_db() as db:
+        request = db.get(Request, request.id)
+        user = db.get(User, request.user_id)
+        if not user:
+            return
+        await notify_admins(db, request, user, bot, broadcast=True)
+    logger.info("Заявка ID:%s не принята по предложению, разослана всем администраторам.", request.id)
+
+
+escalation_scheduler.set_broadcast_handler(_broadcast_offered_request)
@@ -2,6 +2,7 @@ import logging
 from datetime import datetime, timedelta
 
 from aiogram import Bot, F, Router
+from aiogram.exceptions import TelegramBadRequest
 from aiogram.filters import StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.storage.base import StorageKey
@@ -11,8 +12,21 @@ from sqlalchemy import or_
 from app.db import get_db
 from app.db.models import Request, User
 from app.keyboards.admin import get_admin_clarify_active_keyboard
-from app.keyboards.main import get_main_menu_keyboard
+from app.keyboards.main import get_main_menu_keyboard, get_transcript_keyboard
 from app.keyboards.user import get_user_clarify_active_keyboard, get_user_request_actions_keyboard
+from app.middlewares.throttling import MENU_THROTTLING
+from app.services.admin_load import admin_load
+from app.services.clarification import (
+    ClarificationThread,
+    admin_relay_header,
+    clarification_threads,
+    user_relay_header,
+)
+from app.services.deadlines import deadline_scheduler
+from app.services.duplicates import duplicate_index, notify_request_followers
+from app.services.escalation import escalation_scheduler
+from app.services.transcripts import load_transcript_page, render_transcript_page, transcript_writer
+from app.services.user_context import UserContext, get_user_context
 from app.states.clarification import ClarificationState
 
 logger = logging.getLogger(__name__)
@@ -54,16 +68,11 @@ async def finish_user_clarification(
         await state.clear()
         return
 
-    user_role = "user"
-    admin_user = None
+    user_context = get_user_context(user_chat_id)
+    user_role = user_context.role if user_context else "user"
+    admin_context = get_user_context(target_admin_id) if target_admin_id else None
     with get_db() as db:
         request = db.query(Request).filter(Request.id == request_id).first()
-        user = db.query(User).filter(User.id == user_chat_id).first()
-
-        if user and user.role:
-            user_role = user.role
-        if target_admin_id:
-            admin_user = db.query(User).filter(User.id == target_admin_id).first()
 
         if not request:
             await bot.send_message(
@@ -75,10 +84,11 @@ async def finish_user_clarification(
             return
 
     await state.clear()
+    clarification_threads.close(request_id)
     await bot.send_message(
         chat_id=user_chat_id,
         text="Диалог уточнения завершен.",
-        reply_markup=get_main_menu_keyboard(admin_user.role if admin_user else "user"),
+        reply_markup=get_main_menu_keyboard(admin_context.role if admin_context else "user"),
     )
 
     if target_admin_id:
@@ -117,17 +127,15 @@ async def finish_user_clarification(
             )
 
 
-@router.message(F.text == "Мои заявки")
-async def show_user_requests(message: Message, state: FSMContext) -> None:
+@router.message(F.text == "Мои заявки", flags={"throttling": MENU_THROTTLING})
+async def show_user_requests(message: Message, state: FSMContext, user_context: UserContext | None) -> None:
     await _cleanup_menu_messages(state, message.bot, message.chat.id, "user_requests_messages")
     user_id = message.from_user.id
-    with get_db() as db:
-        user = db.query(User).filter(User.id == user_id).first()
-
-        if not user or not user.registered:
-            await message.answer("Вы не зарегистрированы или регистрация не завершена. Пожалуйста, начните с команды /start.")
-            return
+    if not user_context or not user_context.registered:
+        await message.answer("Вы не зарегистрированы или регистрация не завершена. Пожалуйста, начните с команды /start.")
+        return
 
+    with get_db() as db:
         start_of_today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
 
         requests = (
@@ -149,9 +157,9 @@ async def show_user_requests(message: Message, state: FSMContext) -> None:
         for req in requests:
             admin_info = ""
             if req.assigned_admin_id:
-                admin_user = db.query(User).filter(User.id == req.assigned_admin_id).first()
-                if admin_user:
-                    admin_info = f"Исполнитель: {admin_user.full_name}\n"
+                admin_context = get_user_context(req.assigned_admin_id)
+                if admin_context:
+                    admin_info = f"Исполнитель: {admin_context.full_name}\n"
 
             response_text = (
                 f"--- Заявка ID: {req.id} ({req.request_type}) ---\n"
@@ -196,6 +204,11 @@ async def user_mark_done_request(callback_query: CallbackQuery, bot: Bot) -> Non
         request.status = "Выполнено"
         request.completed_at = datetime.now()
         db.commit()
+        deadline_scheduler.cancel(request.id)
+        admin_load.release(request.id)
+        escalation_scheduler.cancel(request.id)
+        clarification_threads.close(request.id)
+        duplicate_index.remove(request.id)
         logger.info("Заявка ID:%s отмечена пользователем %s как 'Выполнено'.", request.id, user_id)
 
         try:
@@ -206,6 +219,10 @@ async def user_mark_done_request(callback_query: CallbackQuery, bot: Bot) -> Non
         except Exception as exc:  # noqa: BLE001
             logger.error("Не удалось обновить сообщение пользователя для заявки %s: %s", request.id, exc)
 
+        await notify_request_followers(
+            bot, db, request.id, f"✅ Заявка ID:{request.id}, к которой вы присоединились, выполнена."
+        )
+
         if request.assigned_admin_id:
             try:
                 admin_user = db.query(User).filter(User.id == request.assigned_admin_id).first()
@@ -223,6 +240,35 @@ async def user_mark_done_request(callback_query: CallbackQuery, bot: Bot) -> Non
                 )
 
 
+@router.callback_query(F.data.startswith("transcript_"))
+async def show_clarification_transcript(callback_query: CallbackQuery, user_context: UserContext | None) -> None:
+    parts = callback_query.data.split("_")
+    paging = parts[1] == "page"
+    request_id = int(parts[2] if paging else parts[1])
+    page = int(parts[3]) if paging else 0
+
+    with get_db() as db:
+        request = db.query(Request).filter(Request.id == request_id).first()
+    is_admin = bool(user_context and user_context.is_admin)
+    if not request or (request.user_id != callback_query.from_user.id and not is_admin):
+        await callback_query.answer("Заявка не найдена или недоступна.", show_alert=True)
+        return
+    await callback_query.answer()
+
+    # Messages relayed a moment ago may still sit in the write buffer.
+    await transcript_writer.flush()
+    transcript = load_transcript_page(request_id, page)
+    text = render_transcript_page(transcript)
+    keyboard = get_transcript_keyboard(request_id, transcript.page, transcript.page_count)
+    if not paging:
+        await callback_query.message.answer(text, reply_markup=keyboard)
+        return
+    try:
+        await callback_query.message.edit_text(text, reply_markup=keyboard)
+    except TelegramBadRequest as exc:
+        logger.warning("Не удалось обновить страницу истории уточнений заявки %s: %s", request_id, exc)
+
+
 @router.callback_query(F.data.startswith("user_clarify_start_"))
 async def user_clarify_start(callback_query: CallbackQuery, state: FSMContext, bot: Bot) -> None:
     await callback_query.answer()
@@ -240,32 +286,53 @@ async def user_clarify_start(callback_query: CallbackQuery, state: FSMContext, b
             await callback_query.message.answer("Эта заявка еще не принята администратором. Уточнение невозможно.")
             return
 
+        # Both sides keep their relay header in state so that relaying needs no DB access.
         await state.update_data(
             target_admin_id=request.assigned_admin_id,
             request_id=request_id,
             original_user_message_id=callback_query.message.message_id,
+            relay_header=user_relay_header(request.creator.full_name, request.id, request.description),
         )
         await state.set_state(ClarificationState.user_active_dialogue)
 
+        admin_id = request.assigned_admin_id
+        relay_header = admin_relay_header(request.id, request.description)
+        clarification_threads.open(
+            ClarificationThread(request_id=request.id, admin_id=admin_id, user_id=user_id, relay_header=relay_header)
+        )
+
         admin_state = FSMContext(
             storage=state.storage,
-            key=StorageKey(bot_id=bot.id, chat_id=request.assigned_admin_id, user_id=request.assigned_admin_id),
+            key=StorageKey(bot_id=bot.id, chat_id=admin_id, user_id=admin_id),
         )
-        await admin_state.update_data(target_user_id=user_id, request_id=request_id)
-        await admin_state.set_state(ClarificationState.admin_active_dialogue)
+        admin_data = await admin_state.get_data()
+        busy_with_other = (
+            await admin_state.get_state() == ClarificationState.admin_active_dialogue.state
+            and admin_data.get("request_id") != request_id
+        )
+        # An admin already in another dialogue keeps it; this one is reached by replying to its messages.
+        if not busy_with_other:
+            await admin_state.update_data(target_user_id=user_id, request_id=request_id, relay_header=relay_header)
+            await admin_state.set_state(ClarificationState.admin_active_dialogue)
 
         try:
-            await bot.send_message(
-                chat_id=request.assigned_admin_id,
+            notification = await bot.send_message(
+                chat_id=admin_id,
                 text=(
                     f"Пользователь {request.creator.full_name} начал диалог по заявке ID:{request.id}"
                     f" ({request.description[:50] if request else '...'}).\n"
-                    "Вы можете отправлять сообщения в ответ."
+                    + (
+                        "Отвечайте (reply) на сообщения этой заявки, ваш текущий диалог не прерван."
+                        if busy_with_other
+                        else "Вы можете отправлять сообщения в ответ."
+                    )
                 ),
                 reply_markup=get_admin_clarify_active_keyboard(request.id),
             )
         except Exception as exc:  # noqa: BLE001
-            logger.error("Не удалось уведомить администратора %s о начале диалога уточнения: %s", request.assigned_admin_id, exc)
+            logger.error("Не удалось уведомить администратора %s о начале диалога уточнения: %s", admin_id, exc)
+        else:
+            clarification_threads.record(admin_id, notification.message_id, request.id)
 
     await callback_query.message.answer(
         "Вы начали диалог уточнения с администратором. Отправляйте сообщения. Для завершения диалога нажмите кнопку:",
@@ -295,19 +362,22 @@ async def process_user_clarification_message(message: Message, state: FSMContext
         await state.clear()
         return
 
-    with get_db() as db:
-        request = db.query(Request).filter(Request.id == request_id).first()
-        user = db.query(User).filter(User.id == message.from_user.id).first()
+    relay_header = state_data.get("relay_header")
+    if not relay_header:
+        # Dialogue started before headers were kept in state.
+        with get_db() as db:
+            request = db.query(Request).filter(Request.id == request_id).first()
+            user = db.query(User).filter(User.id == message.from_user.id).first()
+        relay_header = user_relay_header(
+            user.full_name if user else str(message.from_user.id), request_id, request.description if request else None
+        )
+        await state.update_data(relay_header=relay_header)
 
     try:
-        await bot.send_message(
+        relayed = await bot.send_message(
             chat_id=target_admin_id,
-            text=(
-                f"💬 От пользователя {user.full_name if user else message.from_user.id}"
-                f" по заявке ID:{request.id} ({request.description[:50] if request else '...'})\n\n"
-                f"{message.text}"
-            ),
-            reply_markup=get_admin_clarify_active_keyboard(request.id),
+            text=f"{relay_header}\n\n{message.text}",
+            reply_markup=get_admin_clarify_active_keyboard(request_id),
         )
     except Exception as exc:  # noqa: BLE001
         await message.answer("Не удалось отправить сообщение администратору. Возможно, он заблокировал бота.")
@@ -317,6 +387,9 @@ async def process_user_clarification_message(message: Message, state: FSMContext
             request_id,
             exc,
         )
+    else:
+        clarification_threads.record(target_admin_id, relayed.message_id, request_id)
+        transcript_writer.append(request_id, message.from_user.id, "user", message.text)
 
 
 @router.callback_query(F.data.startswith("user_clarify_end_"))
@@ -1,3 +1,3 @@
-from .startup import on_startup
+from .startup import on_shutdown, on_startup
 
-__all__ = ["on_startup"]
\ No newline at end of file
+__all__ = ["on_startup", "on_shutdown"]
@@ -0,0 +1,73 @@
+import logging
+from collections import Counter
+from collections.abc import Iterable
+
+from app.db import get_db
+from app.db.models import Request
+
+logger = logging.getLogger(__name__)
+
+
+class AdminLoadTracker:
+    """In-memory count of open requests per executor, plus requests offered but not yet accepted."""
+
+    def __init__(self) -> None:
+        self._assignments: dict[int, int] = {}
+        self._offers: dict[int, int] = {}
+        self._load: Counter[int] = Counter()
+
+    def load(self) -> None:
+        with get_db() as db:
+            rows = (
+                db.query(Request.id, Request.assigned_admin_id)
+                .filter(Request.status != "Выполнено", Request.assigned_admin_id.isnot(None))
+                .all()
+            )
+            offers = (
+                db.query(Request.id, Request.offered_admin_id)
+                .filter(
+                    Request.status == "Принято",
+                    Request.assigned_admin_id.is_(None),
+                    Request.offered_admin_id.isnot(None),
+                )
+                .all()
+            )
+        self._assignments = {request_id: admin_id for request_id, admin_id in rows}
+        self._load = Counter(self._assignments.values())
+        self._offers = {request_id: admin_id for request_id, admin_id in offers}
+        logger.info(
+            "Загружена нагрузка исполнителей: %s открытых заявок, %s предложений.",
+            len(self._assignments),
+            len(self._offers),
+        )
+
+    def load_of(self, admin_id: int) -> int:
+        return self._load[admin_id]
+
+    def assign(self, request_id: int, admin_id: int | None) -> None:
+        self._offers.pop(request_id, None)
+        previous_admin_id = self._assignments.pop(request_id, None)
+        if previous_admin_id is not None:
+            self._load[previous_admin_id] -= 1
+        if admin_id is not None:
+            self._assignments[request_id] = admin_id
+            self._load[admin_id] += 1
+
+    def release(self, request_id: int) -> None:
+        self.assign(request_id, None)
+
+    def offer(self, request_id: int, admin_ids: Iterable[int]) -> int | None:
+        """Picks the least loaded admin for a new request, counting pending offers as load."""
+        pending = Counter(self._offers.values())
+        candidates = list(admin_ids)
+        if not candidates:
+            return None
+        admin_id = min(candidates, key=lambda candidate: self._load[candidate] + pending[candidate])
+        self._offers[request_id] = admin_id
+        return admin_id
+
+    def withdraw_offer(self, request_id: int) -> None:
+        self._offers.pop(request_id, None)
+
+
+admin_load = AdminLoadTracker()
@@ -1,10 +1,16 @@
 import json
 import logging
 
-from app.db.models import Request
+from aiogram import Bot
+from aiogram.types import InputMediaDocument, InputMediaPhoto, Message, ReplyParameters
+
+from app.db.models import Request, RequestAttachment, User
+from app.keyboards.admin import get_admin_new_request_keyboard
 
 logger = logging.getLogger(__name__)
 
+MEDIA_GROUP_LIMIT = 10
+
 
 def load_admin_message_map(request: Request) -> dict[int, int]:
     if not request.admin_message_map:
@@ -21,4 +27,120 @@ def save_admin_message_map(request: Request, mapping: dict[int, int]) -> None:
     try:
         request.admin_message_map = json.dumps(mapping)
     except Exception as exc:  # noqa: BLE001
-        logger.warning("Не удалось сохранить admin_message_map для заявки %s: %s", request.id, exc)
\ No newline at end of file
+        logger.warning("Не удалось сохранить admin_message_map для заявки %s: %s", request.id, exc)
+
+
+def load_admin_media_map(request: Request) -> dict[int, list[int]]:
+    """Album messages sent to each admin ahead of the card."""
+    if not request.admin_media_map:
+        return {}
+    try:
+        data = json.loads(request.admin_media_map)
+        return {int(key): [int(message_id) for message_id in value] for key, value in data.items()}
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Не удалось прочитать admin_media_map для заявки %s: %s", request.id, exc)
+        return {}
+
+
+def save_admin_media_map(request: Request, mapping: dict[int, list[int]]) -> None:
+    try:
+        request.admin_media_map = json.dumps(mapping) if mapping else None
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Не удалось сохранить admin_media_map для заявки %s: %s", request.id, exc)
+
+
+def render_admin_card(request: Request, user: User, extra: str = "") -> str:
+    user_details = f"📞 Телефон: {user.phone_number}\n🏢 Организация: {user.organization}"
+    if user.office_number:
+        user_details += f"\n🚪 Кабинет: {user.office_number}"
+
+    comment_block = f"\n💬 Комментарий: {request.comment}" if request.comment else ""
+    category_block = ""
+    if request.category or request.subcategory:
+        category_lines = []
+        if request.category:
+            category_lines.append(f"Категория: {request.category.name}")
+        if request.subcategory:
+            category_lines.append(f"Подкатегория: {request.subcategory.name}")
+        category_block = "\n" + "\n".join(category_lines)
+    planned_date_text = None
+    if request.due_date:
+        planned_date_text = request.due_date
+    elif request.planned_date:
+        planned_date_text = request.planned_date.strftime("%Y-%m-%d")
+    planned_date_block = f"\n📅 Дата исполнения: {planned_date_text}" if planned_date_text else ""
+
+    return (
+        f"🚨 Новая заявка от {user.full_name} 🚨\n"
+        f"{user_details}\n"
+        f"📝 Описание: {request.description}{category_block}\n"
+        f"⏰ Срочность: {'Как можно скорее' if request.urgency == 'ASAP' else f'К {request.due_date}'}{planned_date_block}{comment_block}\n"
+        f"🆔 Заявка ID: {request.id}{extra}"
+    )
+
+
+async def send_admin_card(
+    bot: Bot,
+    admin_id: int,
+    request: Request,
+    text: str,
+    attachments: list[RequestAttachment] | None = None,
+) -> tuple[Message, list[int]]:
+    """Sends the request card; several attachments go first as media groups, then the card itself.
+
+    Returns the card and the ids of the album messages sent ahead of it.
+    """
+    keyboard = get_admin_new_request_keyboard(request.id)
+    if attachments and len(attachments) > 1:
+        media_messages = []
+        # Telegram does not mix documents with photos in one album.
+        for group in _group_media(attachments):
+            if len(group) > 1:
+                media_messages.extend(await bot.send_media_group(chat_id=admin_id, media=group))
+            elif isinstance(group[0], InputMediaDocument):
+                media_messages.append(await bot.send_document(chat_id=admin_id, document=group[0].media))
+            else:
+                media_messages.append(await bot.send_photo(chat_id=admin_id, photo=group[0].media))
+        card = await bot.send_message(
+            chat_id=admin_id,
+            text=text,
+            reply_markup=keyboard,
+            reply_parameters=ReplyParameters(message_id=media_messages[0].message_id, allow_sending_without_reply=True),
+        )
+        return card, [media_message.message_id for media_message in media_messages]
+
+    if request.photo_file_id:
+        attachment_type = (request.attachment_type or "photo").lower()
+        if attachment_type == "document":
+            card = await bot.send_document(
+                chat_id=admin_id,
+                document=request.photo_file_id,
+                caption=text,
+                reply_markup=keyboard,
+            )
+        else:
+            card = await bot.send_photo(
+                chat_id=admin_id,
+                photo=request.photo_file_id,
+                caption=text,
+                reply_markup=keyboard,
+            )
+        return card, []
+    return await bot.send_message(chat_id=admin_id, text=text, reply_markup=keyboard), []
+
+
+def _group_media(attachments: list[RequestAttachment]) -> list[list[InputMediaPhoto | InputMediaDocument]]:
+    photos = [
+        InputMediaPhoto(media=attachment.file_id)
+        for attachment in attachments
+        if (attachment.attachment_type or "photo") != "document"
+    ]
+    documents = [
+        InputMediaDocument(media=attachment.file_id)
+        for attachment in attachments
+        if attachment.attachment_type == "document"
+    ]
+    groups = []
+    for media in (photos, documents):
+        groups.extend(media[start:start + MEDIA_GROUP_LIMIT] for start in range(0, len(media), MEDIA_GROUP_LIMIT))
+    return groups
@@ -0,0 +1,230 @@
+import calendar
+import logging
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from app.db import get_db
+from app.db.models import Request, Vehicle
+from app.services.runtime_config import get_runtime_config
+
+logger = logging.getLogger(__name__)
+
+BOOKING_DAY_START = time(hour=7)
+BOOKING_DAY_END = time(hour=21)
+SLOT_STEP = timedelta(minutes=15)
+MAX_SUGGESTED_SLOTS = 4
+
+Booking = tuple[datetime, datetime]
+
+
+def reconcile_vehicles(db: Session, names: list[str]) -> None:
+    existing_vehicles = {vehicle.name: vehicle for vehicle in db.query(Vehicle)}
+    for name in names:
+        vehicle = existing_vehicles.get(name)
+        if vehicle is None:
+            db.add(Vehicle(name=name, is_active=True))
+        elif not vehicle.is_active:
+            vehicle.is_active = True
+    # Vehicles removed from the config keep their rows so old bookings still point somewhere.
+    for name, vehicle in existing_vehicles.items():
+        if name not in names and vehicle.is_active:
+            vehicle.is_active = False
+    db.flush()
+
+    first_vehicle = db.query(Vehicle).filter(Vehicle.is_active.is_(True)).order_by(Vehicle.id).first()
+    backfilled = 0
+    if first_vehicle is not None:
+        # Bookings made before the registry existed belonged to the single car.
+        backfilled = (
+            db.query(Request)
+            .filter(Request.car_start_at.isnot(None), Request.vehicle_id.is_(None))
+            .update({Request.vehicle_id: first_vehicle.id}, synchronize_session=False)
+        )
+    db.commit()
+    logger.info("Автомобили сверены: активных %s, старых броней привязано %s.", len(names), backfilled)
+
+
+def _seed_vehicles_if_missing(db: Session) -> bool:
+    """Fills an empty registry from the config, so booking works even before the startup sync."""
+    if db.query(Vehicle.id).first() is not None:
+        return False
+    names = list(get_runtime_config().vehicles)
+    if not names:
+        return False
+    reconcile_vehicles(db, names)
+    invalidate_car_occupancy()
+    return True
+
+
+def load_car_schedules(db: Session, start_at: datetime, end_at: datetime) -> dict[int, list[Booking]]:
+    """Bookings overlapping ``[start_at, end_at)`` per active vehicle, in one query.
+
+    Every active vehicle gets a key (ordered by id), its bookings are sorted by start.
+    An empty result means no vehicle is configured.
+    """
+    schedules = _query_car_schedules(db, start_at, end_at)
+    if not schedules and _seed_vehicles_if_missing(db):
+        schedules = _query_car_schedules(db, start_at, end_at)
+    return schedules
+
+
+def _query_car_schedules(db: Session, start_at: datetime, end_at: datetime) -> dict[int, list[Booking]]:
+    rows = (
+        db.query(Vehicle.id, Request.car_start_at, Request.car_end_at)
+        .outerjoin(
+            Request,
+            and_(
+                Request.vehicle_id == Vehicle.id,
+                Request.request_type == "AHO",
+                Request.car_start_at.isnot(None),
+                Request.car_end_at.isnot(None),
+                Request.car_start_at < end_at,
+                Request.car_end_at > start_at,
+            ),
+        )
+        .filter(Vehicle.is_active.is_(True))
+        .order_by(Vehicle.id, Request.car_start_at)
+        .all()
+    )
+    schedules: dict[int, list[Booking]] = {}
+    for vehicle_id, car_start_at, car_end_at in rows:
+        bookings = schedules.setdefault(vehicle_id, [])
+        if car_start_at is not None:
+            bookings.append((car_start_at, car_end_at))
+    return schedules
+
+
+def find_free_vehicle(schedules: dict[int, list[Booking]], start_at: datetime, end_at: datetime) -> int | None:
+    for vehicle_id, bookings in schedules.items():
+        if find_overlap(bookings, start_at, end_at) is None:
+            return vehicle_id
+    return None
+
+
+def find_overlap(bookings: list[Booking], start_at: datetime, end_at: datetime) -> Booking | None:
+    for booking_start, booking_end in bookings:
+        if booking_start >= end_at:
+            break
+        if booking_end > start_at:
+            return booking_start, booking_end
+    return None
+
+
+def booking_window(day: datetime, not_before: datetime | None = None) -> tuple[datetime, datetime]:
+    window_start = datetime.combine(day.date(), BOOKING_DAY_START)
+    window_end = datetime.combine(day.date(), BOOKING_DAY_END)
+    if not_before and not_before > window_start:
+        window_start = _round_up(not_before)
+    return window_start, window_end
+
+
+def find_free_slots(
+    bookings: list[Booking],
+    requested_start: datetime,
+    duration: timedelta,
+    window_start: datetime,
+    window_end: datetime,
+    limit: int = MAX_SUGGESTED_SLOTS,
+) -> list[datetime]:
+    """Start times of free windows of ``duration`` closest to ``requested_start``.
+
+    ``bookings`` must be sorted by start; one sweep collects the gaps between them.
+    """
+    candidates: set[datetime] = set()
+    cursor = window_start
+    for booking_start, booking_end in [*bookings, (window_end, window_end)]:
+        gap_end = min(booking_start, window_end)
+        latest_start = gap_end - duration
+        if latest_start >= cursor:
+            earliest_start = _round_up(cursor)
+            if earliest_start <= latest_start:
+                candidates.add(earliest_start)
+                candidates.add(min(max(requested_start, earliest_start), latest_start))
+        cursor = max(cursor, booking_end)
+        if cursor >= window_end:
+            break
+
+    return _nearest(candidates, requested_start, limit)
+
+
+def find_free_slots_any_vehicle(
+    schedules: dict[int, list[Booking]],
+    requested_start: datetime,
+    duration: timedelta,
+    window_start: datetime,
+    window_end: datetime,
+    limit: int = MAX_SUGGESTED_SLOTS,
+) -> list[datetime]:
+    candidates: set[datetime] = set()
+    for bookings in schedules.values():
+        candidates.update(find_free_slots(bookings, requested_start, duration, window_start, window_end, limit))
+    return _nearest(candidates, requested_start, limit)
+
+
+def _nearest(candidates: set[datetime], requested_start: datetime, limit: int) -> list[datetime]:
+    nearest = sorted(candidates, key=lambda slot: (abs(slot - requested_start), slot))[:limit]
+    return sorted(nearest)
+
+
+def _round_up(moment: datetime) -> datetime:
+    day_start = datetime.combine(moment.date(), time.min)
+    steps = -(-(moment - day_start) // SLOT_STEP)
+    return day_start + steps * SLOT_STEP
+
+
+# (year, month) -> (partly booked days, fully booked days); bit ``day - 1`` is set for a day.
+_occupancy_cache: dict[tuple[int, int], tuple[int, int]] = {}
+
+
+def get_month_occupancy(year: int, month: int) -> tuple[int, int]:
+    key = (year, month)
+    occupancy = _occupancy_cache.get(key)
+    if occupancy is None:
+        with get_db() as db:
+            occupancy = _compute_month_occupancy(db, year, month)
+        _occupancy_cache[key] = occupancy
+    return occupancy
+
+
+def invalidate_car_occupancy(start_at: datetime | None = None, end_at: datetime | None = None) -> None:
+    """Drops cached months touched by a booking, or every month when called without a range."""
+    if start_at is None or end_at is None:
+        _occupancy_cache.clear()
+        return
+
+    year, month = start_at.year, start_at.month
+    while (year, month) <= (end_at.year, end_at.month):
+        _occupancy_cache.pop((year, month), None)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _compute_month_occupancy(db: Session, year: int, month: int) -> tuple[int, int]:
+    days_in_month = calendar.monthrange(year, month)[1]
+    month_start = datetime(year, month, 1)
+    month_end = month_start + timedelta(days=days_in_month)
+
+    schedules = load_car_schedules(db, month_start, month_end)
+    # Bookings come sorted by start, so every per-day list stays sorted too.
+    bookings_by_day: dict[date, dict[int, list[Booking]]] = {}
+    for vehicle_id, bookings in schedules.items():
+        for booking_start, booking_end in bookings:
+            day = max(booking_start, month_start).date()
+            last_day = (min(booking_end, month_end) - timedelta(microseconds=1)).date()
+            while day <= last_day:
+                window_start, window_end = booking_window(datetime.combine(day, time.min))
+                if booking_start < window_end and booking_end > window_start:
+                    day_schedules = bookings_by_day.setdefault(day, {})
+                    day_schedules.setdefault(vehicle_id, []).append((booking_start, booking_end))
+                day += timedelta(days=1)
+
+    partly_booked = fully_booked = 0
+    for day, day_schedules in bookings_by_day.items():
+        partly_booked |= 1 << (day.day - 1)
+        if len(day_schedules) < len(schedules):
+            continue
+        window_start, window_end = booking_window(datetime.combine(day, time.min))
+        if not find_free_slots_any_vehicle(day_schedules, window_start, SLOT_STEP, window_start, window_end, limit=1):
+            fully_booked |= 1 << (day.day - 1)
+    return partly_booked, fully_booked
@@ -1,10 +1,11 @@
-from collections.abc import Mapping
+import hashlib
+import json
 from typing import Iterable, Mapping
 
 from sqlalchemy.orm import Session
 
 from app.db import get_db
-from app.db.models import Category, Subcategory
+from app.db.models import Category, SeedChecksum, Subcategory
 
 
 CATEGORIES_STRUCTURE: Mapping[str, Iterable[str]] = {
@@ -74,29 +75,49 @@ AHO_CATEGORIES_STRUCTURE: Mapping[str, Iterable[str]] = {
 }
 
 
+def _structure_checksum(structure: Mapping[str, Iterable[str]], request_type: str) -> str:
+    payload = [request_type, [[name, list(subcategories)] for name, subcategories in structure.items()]]
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
 def _seed_categories(structure: Mapping[str, Iterable[str]], request_type: str, session: Session) -> None:
-    for category_name, subcategories in structure.items():
-        category = (
-            session.query(Category)
-            .filter(Category.name == category_name, Category.request_type == request_type)
-            .first()
-        )
-        if not category:
-            category = Category(name=category_name, request_type=request_type)
-            session.add(category)
-            session.flush()
-        elif category.request_type != request_type:
-            category.request_type = request_type
-
-        for subcategory_name in subcategories:
-            subcategory_exists = (
-                session.query(Subcategory)
-                .filter(Subcategory.name == subcategory_name, Subcategory.category_id == category.id)
-                .first()
-            )
-            if not subcategory_exists:
-                session.add(Subcategory(name=subcategory_name, category_id=category.id))
+    seed_name = f"categories:{request_type}"
+    checksum = _structure_checksum(structure, request_type)
+    seed_state = session.get(SeedChecksum, seed_name)
+    if seed_state and seed_state.checksum == checksum:
+        return
 
+    categories = {
+        category.name: category
+        for category in session.query(Category).filter(
+            Category.name.in_(list(structure)), Category.request_type == request_type
+        )
+    }
+    new_categories = []
+    for category_name in structure:
+        category = categories.get(category_name)
+        if category is None:
+            category = categories[category_name] = Category(name=category_name, request_type=request_type)
+            new_categories.append(category)
+    if new_categories:
+        session.add_all(new_categories)
+        session.flush()
+
+    category_ids = [category.id for category in categories.values()]
+    existing_pairs = set(
+        session.query(Subcategory.category_id, Subcategory.name).filter(Subcategory.category_id.in_(category_ids))
+    )
+    session.add_all(
+        Subcategory(name=subcategory_name, category_id=categories[category_name].id)
+        for category_name, subcategories in structure.items()
+        for subcategory_name in subcategories
+        if (categories[category_name].id, subcategory_name) not in existing_pairs
+    )
+
+    if seed_state:
+        seed_state.checksum = checksum
+    else:
+        session.add(SeedChecksum(name=seed_name, checksum=checksum))
     session.commit()
 
 
@@ -0,0 +1,55 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+def user_relay_header(user_name: str, request_id: int, description: str | None) -> str:
+    """Header of user messages relayed to the admin."""
+    return f"💬 От пользователя {user_name} по заявке ID:{request_id} ({(description or '...')[:50]})"
+
+
+def admin_relay_header(request_id: int, description: str | None) -> str:
+    """Header of admin messages relayed to the user."""
+    return f"💬 От администратора по заявке ID:{request_id} ({(description or '...')[:50]})"
+
+
+@dataclass(frozen=True, slots=True)
+class ClarificationThread:
+    request_id: int
+    admin_id: int
+    user_id: int
+    relay_header: str
+
+
+class ClarificationThreads:
+    """Routes admin replies to the dialogue of the replied message, so several dialogues run at once."""
+
+    def __init__(self, max_messages: int = 10_000) -> None:
+        self.max_messages = max_messages
+        self._threads: dict[int, ClarificationThread] = {}
+        # (admin chat, message id) -> request id; the oldest entries are dropped past ``max_messages``.
+        self._messages: OrderedDict[tuple[int, int], int] = OrderedDict()
+
+    def open(self, thread: ClarificationThread) -> None:
+        self._threads[thread.request_id] = thread
+
+    def close(self, request_id: int) -> None:
+        self._threads.pop(request_id, None)
+
+    def get(self, request_id: int) -> ClarificationThread | None:
+        return self._threads.get(request_id)
+
+    def record(self, admin_id: int, message_id: int, request_id: int) -> None:
+        self._messages[(admin_id, message_id)] = request_id
+        if len(self._messages) > self.max_messages:
+            self._messages.popitem(last=False)
+
+    def resolve(self, admin_id: int, message_id: int) -> tuple[int, ClarificationThread | None] | None:
+        """Request id of a relayed message and its thread, ``None`` for the thread once the dialogue ended."""
+        request_id = self._messages.get((admin_id, message_id))
+        if request_id is None:
+            return None
+        thread = self._threads.get(request_id)
+        return request_id, thread if thread is not None and thread.admin_id == admin_id else None
+
+
+clarification_threads = ClarificationThreads()
@@ -0,0 +1,117 @@
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import func
+
+from app.db import get_db
+from app.db.models import Category, Request
+
+DASHBOARD_CACHE_SECONDS = 5.0
+
+REQUEST_TYPE_NAMES = {"IT": "ИТ", "AHO": "АХО"}
+
+
+@dataclass(frozen=True)
+class QueueSnapshot:
+    generated_at: datetime
+    by_status: Counter = field(default_factory=Counter)
+    by_category: Counter = field(default_factory=Counter)
+    by_type: Counter = field(default_factory=Counter)
+    oldest_waiting_at: datetime | None = None
+
+    @property
+    def total(self) -> int:
+        return sum(self.by_status.values())
+
+
+_cached: tuple[float, QueueSnapshot] | None = None
+
+
+def _load_snapshot() -> QueueSnapshot:
+    by_status: Counter = Counter()
+    by_category: Counter = Counter()
+    by_type: Counter = Counter()
+    oldest_waiting_at = None
+
+    with get_db() as db:
+        rows = (
+            db.query(
+                Request.request_type,
+                Request.status,
+                Category.name,
+                func.count(Request.id),
+                func.min(Request.created_at),
+            )
+            .outerjoin(Category, Category.id == Request.category_id)
+            .filter(Request.status != "Выполнено")
+            .group_by(Request.request_type, Request.status, Category.name)
+            .all()
+        )
+
+    for request_type, status, category_name, count, oldest_created_at in rows:
+        by_status[status] += count
+        by_category[category_name or "Без категории"] += count
+        by_type[request_type] += count
+        if status == "Принято" and oldest_created_at and (
+            oldest_waiting_at is None or oldest_created_at < oldest_waiting_at
+        ):
+            oldest_waiting_at = oldest_created_at
+
+    return QueueSnapshot(
+        generated_at=datetime.now(),
+        by_status=by_status,
+        by_category=by_category,
+        by_type=by_type,
+        oldest_waiting_at=oldest_waiting_at,
+    )
+
+
+def get_queue_snapshot(*, force: bool = False) -> QueueSnapshot:
+    global _cached
+    now = time.monotonic()
+    if not force and _cached and now - _cached[0] < DASHBOARD_CACHE_SECONDS:
+        return _cached[1]
+    snapshot = _load_snapshot()
+    _cached = (now, snapshot)
+    return snapshot
+
+
+def _format_age(since: datetime, now: datetime) -> str:
+    minutes = int((now - since).total_seconds() // 60)
+    hours, minutes = divmod(max(minutes, 0), 60)
+    days, hours = divmod(hours, 24)
+    if days:
+        return f"{days} д {hours} ч"
+    if hours:
+        return f"{hours} ч {minutes} мин"
+    return f"{minutes} мин"
+
+
+def render_queue_snapshot(snapshot: QueueSnapshot) -> str:
+    lines = [f"📊 Очередь заявок (открытых: {snapshot.total})", ""]
+    if not snapshot.total:
+        lines.append("Открытых заявок нет.")
+    else:
+        lines.append("По статусам:")
+        lines.extend(f"• {status}: {count}" for status, count in snapshot.by_status.most_common())
+        lines.append("")
+        lines.append("По типам:")
+        lines.extend(
+            f"• {REQUEST_TYPE_NAMES.get(request_type, request_type)}: {count}"
+            for request_type, count in snapshot.by_type.most_common()
+        )
+        lines.append("")
+        lines.append("По категориям:")
+        lines.extend(f"• {category}: {count}" for category, count in snapshot.by_category.most_common())
+        if snapshot.oldest_waiting_at:
+            lines.append("")
+            lines.append(
+                "⏳ Дольше всех ждёт заявка от "
+                f"{snapshot.oldest_waiting_at.strftime('%Y-%m-%d %H:%M')} "
+                f"({_format_age(snapshot.oldest_waiting_at, snapshot.generated_at)})"
+            )
+    lines.append("")
+    lines.append(f"Обновлено: {snapshot.generated_at.strftime('%H:%M:%S')}")
+    return "\n".join(lines)
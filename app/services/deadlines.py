@@ -0,0 +1,168 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+
+from aiogram import Bot
+from sqlalchemy import or_
+
+from app.config import REMINDER_LEAD_MINUTES
+from app.db import get_db
+from app.db.models import Request
+from app.services.rate_limit import send_rate_limited
+from app.services.runtime_config import get_runtime_config
+
+logger = logging.getLogger(__name__)
+
+REMINDER_LEAD = timedelta(minutes=REMINDER_LEAD_MINUTES)
+PLANNED_DAY_START = time(hour=9)
+
+_KIND_UPCOMING = "upcoming"
+_KIND_DUE = "due"
+
+
+def request_deadline(request: Request) -> datetime | None:
+    if request.car_start_at:
+        return request.car_start_at
+    if request.urgency == "DATE" and request.due_date:
+        try:
+            return datetime.strptime(request.due_date, "%Y-%m-%d %H:%M")
+        except ValueError:
+            return None
+    if request.planned_date:
+        if request.planned_date.time() == time.min:
+            return datetime.combine(request.planned_date.date(), PLANNED_DAY_START)
+        return request.planned_date
+    return None
+
+
+@dataclass(slots=True)
+class _TrackedDeadline:
+    request_id: int
+    request_type: str
+    description: str
+    deadline: datetime
+    admin_id: int | None
+    version: int
+
+
+class DeadlineScheduler:
+    """Min-heap of reminder times; sleeps until the earliest one instead of polling the DB."""
+
+    def __init__(self, lead: timedelta = REMINDER_LEAD) -> None:
+        self.lead = lead
+        self._heap: list[tuple[datetime, int, int, int, str]] = []
+        self._tracked: dict[int, _TrackedDeadline] = {}
+        self._sequence = itertools.count()
+        self._versions = itertools.count(1)
+        self._wakeup = asyncio.Event()
+        self._bot: Bot | None = None
+
+    def load(self) -> int:
+        with get_db() as db:
+            requests = (
+                db.query(Request)
+                .filter(
+                    Request.status != "Выполнено",
+                    or_(
+                        Request.due_date.isnot(None),
+                        Request.planned_date.isnot(None),
+                        Request.car_start_at.isnot(None),
+                    ),
+                )
+                .all()
+            )
+            for request in requests:
+                self.track(request)
+        logger.info("Загружено %s заявок со сроками для напоминаний.", len(self._tracked))
+        return len(self._tracked)
+
+    def track(self, request: Request) -> None:
+        deadline = request_deadline(request)
+        if deadline is None or request.status == "Выполнено":
+            self.cancel(request.id)
+            return
+
+        entry = _TrackedDeadline(
+            request_id=request.id,
+            request_type=request.request_type,
+            description=(request.description or "")[:50],
+            deadline=deadline,
+            admin_id=request.assigned_admin_id,
+            version=next(self._versions),
+        )
+        self._tracked[request.id] = entry
+        now = datetime.now()
+        for fire_at, kind in ((deadline - self.lead, _KIND_UPCOMING), (deadline, _KIND_DUE)):
+            if fire_at > now:
+                self._push(fire_at, entry, kind)
+
+    def assign(self, request_id: int, admin_id: int | None) -> None:
+        entry = self._tracked.get(request_id)
+        if entry:
+            entry.admin_id = admin_id
+
+    def cancel(self, request_id: int) -> None:
+        # Heap items of a removed entry are skipped lazily when they surface.
+        self._tracked.pop(request_id, None)
+
+    def _push(self, fire_at: datetime, entry: _TrackedDeadline, kind: str) -> None:
+        is_earliest = not self._heap or fire_at < self._heap[0][0]
+        heapq.heappush(self._heap, (fire_at, next(self._sequence), entry.request_id, entry.version, kind))
+        if is_earliest:
+            self._wakeup.set()
+
+    async def run(self, bot: Bot) -> None:
+        self._bot = bot
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = (self._heap[0][0] - datetime.now()).total_seconds()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, request_id, version, kind = heapq.heappop(self._heap)
+            entry = self._tracked.get(request_id)
+            if entry is None or entry.version != version:
+                continue
+            if kind == _KIND_DUE:
+                self._tracked.pop(request_id, None)
+            await self._send_reminder(entry, kind)
+
+    async def _send_reminder(self, entry: _TrackedDeadline, kind: str) -> None:
+        if entry.admin_id:
+            recipients = [entry.admin_id]
+        else:
+            config = get_runtime_config()
+            recipients = list(config.it_admin_ids if entry.request_type == "IT" else config.aho_admin_ids)
+
+        deadline_text = entry.deadline.strftime("%Y-%m-%d %H:%M")
+        if kind == _KIND_UPCOMING:
+            text = f"⏰ Напоминание: срок по заявке ID:{entry.request_id} ({entry.description}) — {deadline_text}."
+        else:
+            text = f"⚠️ Наступил срок по заявке ID:{entry.request_id} ({entry.description}) — {deadline_text}."
+        if not entry.admin_id:
+            text += "\nЗаявка ещё не принята к исполнению."
+
+        for admin_id in recipients:
+            try:
+                await send_rate_limited(self._bot, admin_id, text)
+            except Exception as exc:  # noqa: BLE001
+                logger.error(
+                    "Не удалось отправить напоминание по заявке %s администратору %s: %s",
+                    entry.request_id,
+                    admin_id,
+                    exc,
+                )
+
+
+deadline_scheduler = DeadlineScheduler()
@@ -0,0 +1,80 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from aiogram import Bot
+
+from app.config import DIGEST_INTERVAL_MINUTES, DIGEST_MAX_REQUESTS
+from app.db import get_db
+from app.db.models import Request
+from app.keyboards.admin import get_admin_digest_keyboard
+from app.services.rate_limit import send_rate_limited
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _DigestEntry:
+    request_id: int
+    summary: str
+
+
+class DigestBuffer:
+    """Collects new-request notifications for admins in digest mode and sends them as one message."""
+
+    def __init__(self, max_requests: int = DIGEST_MAX_REQUESTS, interval_minutes: int = DIGEST_INTERVAL_MINUTES) -> None:
+        self.max_requests = max_requests
+        self.interval_minutes = interval_minutes
+        self._digests: dict[int, list[_DigestEntry]] = {}
+
+    def add(self, admin_id: int, request: Request) -> bool:
+        """Buffers the request; returns True when the admin's digest is full and should be flushed."""
+        entries = self._digests.setdefault(admin_id, [])
+        request_type = "ИТ" if request.request_type == "IT" else "АХО"
+        entries.append(_DigestEntry(request.id, f"{request_type}: {(request.description or '')[:50]}"))
+        return len(entries) >= self.max_requests
+
+    async def flush(self, bot: Bot, admin_id: int) -> None:
+        entries = self._digests.pop(admin_id, None)
+        if not entries:
+            return
+
+        request_ids = [entry.request_id for entry in entries]
+        # Requests accepted by someone while buffered are not worth a ping.
+        with get_db() as db:
+            waiting_ids = {
+                request_id
+                for (request_id,) in db.query(Request.id).filter(
+                    Request.id.in_(request_ids),
+                    Request.status == "Принято",
+                    Request.assigned_admin_id.is_(None),
+                )
+            }
+        entries = [entry for entry in entries if entry.request_id in waiting_ids]
+        if not entries:
+            return
+
+        lines = [f"📬 Новые заявки ({len(entries)}):"]
+        lines.extend(f"• ID:{entry.request_id} — {entry.summary}" for entry in entries)
+        try:
+            await send_rate_limited(
+                bot,
+                admin_id,
+                "\n".join(lines),
+                reply_markup=get_admin_digest_keyboard([entry.request_id for entry in entries]),
+            )
+            logger.info("Сводка из %s заявок отправлена администратору %s.", len(entries), admin_id)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Не удалось отправить сводку заявок администратору %s: %s", admin_id, exc)
+
+    async def flush_all(self, bot: Bot) -> None:
+        for admin_id in list(self._digests):
+            await self.flush(bot, admin_id)
+
+    async def run(self, bot: Bot) -> None:
+        while True:
+            await asyncio.sleep(self.interval_minutes * 60)
+            await self.flush_all(bot)
+
+
+digest_buffer = DigestBuffer()
@@ -0,0 +1,143 @@
+import logging
+import re
+from dataclasses import dataclass
+
+from aiogram import Bot
+from sqlalchemy.orm import Session
+
+from app.db import get_db
+from app.db.models import Request, RequestFollower, User
+from app.services.rate_limit import send_rate_limited
+
+logger = logging.getLogger(__name__)
+
+# Share of the shorter description's trigrams found in the other one. Containment rather than
+# Jaccard, so a short report still matches a longer wording of the same problem.
+DUPLICATE_THRESHOLD = 0.8
+MAX_DUPLICATES = 3
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+BucketKey = tuple[str | None, int | None, str | None]
+
+
+def _trigrams(text: str) -> frozenset[str]:
+    normalized = f" {_NON_WORD.sub(' ', text.lower()).strip()} "
+    return frozenset(normalized[index:index + 3] for index in range(len(normalized) - 2))
+
+
+def _containment(first: frozenset[str], second: frozenset[str]) -> float:
+    shorter = min(len(first), len(second))
+    return len(first & second) / shorter if shorter else 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class DuplicateCandidate:
+    request_id: int
+    user_id: int
+    description: str
+    score: float
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    request_id: int
+    user_id: int
+    description: str
+    trigrams: frozenset[str]
+
+
+class DuplicateIndex:
+    """Trigram signatures of open requests, bucketed by type, subcategory and organization.
+
+    Comparing against one bucket touches only the handful of requests that can be duplicates,
+    so a lookup needs no database access.
+    """
+
+    def __init__(self) -> None:
+        self._buckets: dict[BucketKey, dict[int, _Entry]] = {}
+        self._bucket_of: dict[int, BucketKey] = {}
+        self._loaded = False
+
+    def load(self) -> None:
+        with get_db() as db:
+            rows = (
+                db.query(Request, User.organization)
+                .join(User, User.id == Request.user_id)
+                .filter(Request.status != "Выполнено", Request.car_start_at.is_(None))
+                .all()
+            )
+        self._buckets.clear()
+        self._bucket_of.clear()
+        for request, organization in rows:
+            self.add(request, organization)
+        self._loaded = True
+        logger.info("Индекс похожих заявок загружен: %s открытых заявок.", len(self._bucket_of))
+
+    def add(self, request: Request, organization: str | None) -> None:
+        if request.car_start_at is not None:
+            # Car bookings are never duplicates of each other.
+            return
+        key = (request.request_type, request.subcategory_id, organization)
+        self._buckets.setdefault(key, {})[request.id] = _Entry(
+            request_id=request.id,
+            user_id=request.user_id,
+            description=request.description or "",
+            trigrams=_trigrams(request.description or ""),
+        )
+        self._bucket_of[request.id] = key
+
+    def remove(self, request_id: int) -> None:
+        key = self._bucket_of.pop(request_id, None)
+        if key is None:
+            return
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            bucket.pop(request_id, None)
+            if not bucket:
+                del self._buckets[key]
+
+    def find(
+        self,
+        request_type: str | None,
+        subcategory_id: int | None,
+        organization: str | None,
+        description: str | None,
+        limit: int = MAX_DUPLICATES,
+    ) -> list[DuplicateCandidate]:
+        if not self._loaded:
+            self.load()
+        bucket = self._buckets.get((request_type, subcategory_id, organization))
+        if not bucket:
+            return []
+        trigrams = _trigrams(description or "")
+        candidates = []
+        for entry in bucket.values():
+            score = _containment(trigrams, entry.trigrams)
+            if score >= DUPLICATE_THRESHOLD:
+                candidates.append(
+                    DuplicateCandidate(
+                        request_id=entry.request_id,
+                        user_id=entry.user_id,
+                        description=entry.description,
+                        score=score,
+                    )
+                )
+        candidates.sort(key=lambda candidate: (-candidate.score, -candidate.request_id))
+        return candidates[:limit]
+
+
+async def notify_request_followers(bot: Bot, db: Session, request_id: int, text: str) -> None:
+    """Tells users who joined the request as a duplicate that it changed."""
+    follower_ids = [
+        user_id
+        for (user_id,) in db.query(RequestFollower.user_id).filter(RequestFollower.request_id == request_id)
+    ]
+    for user_id in follower_ids:
+        try:
+            await send_rate_limited(bot, user_id, text)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Не удалось уведомить пользователя %s о заявке %s: %s", user_id, request_id, exc)
+
+
+duplicate_index = DuplicateIndex()
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import math
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+
+from aiogram import Bot
+from aiogram.types import ReplyParameters
+
+from app.config import ESCALATION_SUPERVISOR_CHAT_ID, ESCALATION_WINDOWS_MINUTES
+from app.db import get_db
+from app.db.models import Request
+from app.services.admin_load import admin_load
+from app.services.admin_notifications import load_admin_message_map
+from app.services.rate_limit import send_rate_limited
+from app.services.runtime_config import get_runtime_config
+from app.services.timing_wheel import TimingWheel
+
+logger = logging.getLogger(__name__)
+
+TICK_SECONDS = 1.0
+DEFAULT_WINDOW_MINUTES = 60
+
+_STAGE_BROADCAST = 0
+_STAGE_ADMINS = 1
+_STAGE_SUPERVISOR = 2
+
+
+def escalation_window(request: Request) -> timedelta:
+    minutes = ESCALATION_WINDOWS_MINUTES.get(
+        (request.request_type, request.urgency or "ASAP"), DEFAULT_WINDOW_MINUTES
+    )
+    return timedelta(minutes=minutes)
+
+
+def _is_waiting(request: Request) -> bool:
+    return request.status == "Принято" and not request.assigned_admin_id
+
+
+class EscalationScheduler:
+    """Re-pings admins about requests nobody accepted, then the supervisor chat."""
+
+    def __init__(self) -> None:
+        self._wheel = TimingWheel()
+        self._started_at = time.monotonic()
+        self._broadcast_handler: Callable[[Bot, Request], Awaitable[None]] | None = None
+
+    def set_broadcast_handler(self, handler: Callable[[Bot, Request], Awaitable[None]]) -> None:
+        """Sends the request card to the whole pool when a personal offer times out."""
+        self._broadcast_handler = handler
+
+    def load(self) -> int:
+        with get_db() as db:
+            requests = (
+                db.query(Request)
+                .filter(Request.status == "Принято", Request.assigned_admin_id.is_(None))
+                .all()
+            )
+            for request in requests:
+                if request.offered_admin_id and request.offer_expires_at:
+                    # A personal offer made before the restart still falls back to the pool on time.
+                    self.track_offer(request.id, request.offer_expires_at)
+                else:
+                    self.track(request)
+        logger.info("Восстановлено %s таймеров эскалации непринятых заявок.", len(self._wheel))
+        return len(self._wheel)
+
+    def track(self, request: Request, since: datetime | None = None) -> None:
+        """Arms the timers for a request waiting in the pool; ``since`` restarts the window."""
+        if not _is_waiting(request):
+            self.cancel(request.id)
+            return
+
+        started_at = since or request.created_at or datetime.now()
+        # An overdue request (e.g. after a restart) is re-pinged on the next tick; the supervisor stage
+        # follows one window after that.
+        self._schedule(request.id, started_at + escalation_window(request), _STAGE_ADMINS)
+
+    def track_offer(self, request_id: int, expires_at: datetime) -> None:
+        """Replaces the request's timers with a broadcast fallback; escalation resumes after it."""
+        self._schedule(request_id, expires_at, _STAGE_BROADCAST)
+
+    def cancel(self, request_id: int) -> None:
+        self._wheel.cancel(request_id)
+
+    def _schedule(self, request_id: int, fire_at: datetime, stage: int) -> None:
+        delay = (fire_at - datetime.now()).total_seconds()
+        self._wheel.schedule(request_id, self._wheel.now + math.ceil(delay / TICK_SECONDS), stage)
+
+    async def run(self, bot: Bot) -> None:
+        self._started_at = time.monotonic() - self._wheel.now * TICK_SECONDS
+        while True:
+            next_tick_at = self._started_at + (self._wheel.now + 1) * TICK_SECONDS
+            await asyncio.sleep(max(0.0, next_tick_at - time.monotonic()))
+            # Catch up on ticks missed while the loop was busy.
+            while self._started_at + (self._wheel.now + 1) * TICK_SECONDS <= time.monotonic():
+                for request_id, stage in self._wheel.advance():
+                    try:
+                        await self._escalate(bot, request_id, stage)
+                    except Exception as exc:  # noqa: BLE001
+                        logger.error("Ошибка эскалации заявки %s: %s", request_id, exc)
+
+    async def _escalate(self, bot: Bot, request_id: int, stage: int) -> None:
+        with get_db() as db:
+            request = db.query(Request).filter(Request.id == request_id).first()
+        if not request or not _is_waiting(request):
+            return
+
+        if stage == _STAGE_BROADCAST:
+            admin_load.withdraw_offer(request.id)
+            if self._broadcast_handler:
+                await self._broadcast_handler(bot, request)
+            # The pool has only just seen the request, so its window starts now.
+            self.track(request, since=datetime.now())
+            return
+
+        window = escalation_window(request)
+        waited_minutes = int((datetime.now() - request.created_at).total_seconds() // 60)
+        description = (request.description or "")[:50]
+
+        if stage == _STAGE_ADMINS:
+            config = get_runtime_config()
+            admin_ids = config.it_admin_ids if request.request_type == "IT" else config.aho_admin_ids
+            admin_message_map = load_admin_message_map(request)
+            text = (
+                f"🔔 Заявка ID:{request.id} ({description}) ждёт принятия уже {waited_minutes} мин. "
+                "Пожалуйста, возьмите её в работу."
+            )
+            for admin_id in admin_ids:
+                card_message_id = admin_message_map.get(admin_id)
+                reply_parameters = (
+                    ReplyParameters(message_id=card_message_id, allow_sending_without_reply=True)
+                    if card_message_id
+                    else None
+                )
+                try:
+                    await send_rate_limited(bot, admin_id, text, reply_parameters=reply_parameters)
+                except Exception as exc:  # noqa: BLE001
+                    logger.error(
+                        "Не удалось повторно уведомить администратора %s о заявке %s: %s",
+                        admin_id,
+                        request.id,
+                        exc,
+                    )
+            logger.info("Заявка ID:%s не принята за %s мин., администраторы уведомлены повторно.", request.id, waited_minutes)
+
+            if ESCALATION_SUPERVISOR_CHAT_ID:
+                self._schedule(request.id, datetime.now() + window, _STAGE_SUPERVISOR)
+            return
+
+        await send_rate_limited(
+            bot,
+            ESCALATION_SUPERVISOR_CHAT_ID,
+            f"⚠️ Заявка ID:{request.id} ({request.request_type}, {description}) "
+            f"не принята исполнителем уже {waited_minutes} мин.",
+        )
+        logger.info("Заявка ID:%s эскалирована руководителю.", request.id)
+
+
+escalation_scheduler = EscalationScheduler()
@@ -0,0 +1,135 @@
+import csv
+import os
+import tempfile
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from app.db import engine
+from app.db.models import Category, Request, Subcategory, User
+
+EXPORT_BATCH_SIZE = 500
+
+EXPORT_HEADER = (
+    "ID",
+    "Тип",
+    "Статус",
+    "Создана",
+    "Принята",
+    "Выполнена",
+    "Категория",
+    "Подкатегория",
+    "Описание",
+    "Комментарий",
+    "Срочность",
+    "Срок",
+    "Заявитель",
+    "Телефон",
+    "Организация",
+    "Кабинет",
+    "Исполнитель",
+)
+
+URGENCY_TITLES = {"ASAP": "Как можно скорее", "DATE": "К дате"}
+
+
+def _format_datetime(value: datetime | None) -> str:
+    return value.strftime("%Y-%m-%d %H:%M") if value else ""
+
+
+# Spreadsheets run a cell starting with one of these as a formula.
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _safe_text(value: str | None) -> str:
+    """User-entered text, prefixed with ``'`` so that Excel shows it instead of evaluating it."""
+    if not value:
+        return ""
+    return f"'{value}" if value.startswith(_FORMULA_PREFIXES) else value
+
+
+def _format_row(row) -> tuple:
+    (
+        request_id, request_type, status, created_at, accepted_at, completed_at,
+        category_name, subcategory_name, description, comment, urgency, due_date,
+        full_name, phone_number, organization, office_number, executor_name,
+    ) = row
+    return (
+        request_id,
+        request_type,
+        status,
+        _format_datetime(created_at),
+        _format_datetime(accepted_at),
+        _format_datetime(completed_at),
+        category_name or "",
+        subcategory_name or "",
+        _safe_text(description),
+        _safe_text(comment),
+        URGENCY_TITLES.get(urgency, ""),
+        due_date or "",
+        _safe_text(full_name),
+        _safe_text(phone_number),
+        _safe_text(organization),
+        _safe_text(office_number),
+        _safe_text(executor_name),
+    )
+
+
+def export_requests_csv(date_from: date, date_to: date) -> tuple[str, int]:
+    """Stream requests created in [date_from, date_to] into a temporary CSV file.
+
+    Rows are fetched in batches through a server-side cursor and written as they
+    arrive, so memory use does not depend on the size of the period. The caller
+    owns the returned file and must delete it.
+    """
+    creator = aliased(User)
+    executor = aliased(User)
+    statement = (
+        select(
+            Request.id,
+            Request.request_type,
+            Request.status,
+            Request.created_at,
+            Request.accepted_at,
+            Request.completed_at,
+            Category.name,
+            Subcategory.name,
+            Request.description,
+            Request.comment,
+            Request.urgency,
+            Request.due_date,
+            creator.full_name,
+            creator.phone_number,
+            creator.organization,
+            creator.office_number,
+            executor.full_name,
+        )
+        .outerjoin(creator, creator.id == Request.user_id)
+        .outerjoin(executor, executor.id == Request.assigned_admin_id)
+        .outerjoin(Category, Category.id == Request.category_id)
+        .outerjoin(Subcategory, Subcategory.id == Request.subcategory_id)
+        .where(
+            Request.created_at >= datetime.combine(date_from, time.min),
+            Request.created_at < datetime.combine(date_to + timedelta(days=1), time.min),
+        )
+        .order_by(Request.id)
+    )
+
+    file_descriptor, path = tempfile.mkstemp(prefix="requests_", suffix=".csv")
+    row_count = 0
+    try:
+        with os.fdopen(file_descriptor, "w", encoding="utf-8-sig", newline="") as export_file:
+            writer = csv.writer(export_file, delimiter=";")
+            writer.writerow(EXPORT_HEADER)
+            with engine.connect() as connection:
+                result = connection.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE).execute(
+                    statement
+                )
+                for partition in result.partitions():
+                    writer.writerows(_format_row(row) for row in partition)
+                    row_count += len(partition)
+    except Exception:
+        os.remove(path)
+        raise
+    return path, row_count
@@ -0,0 +1,45 @@
+import asyncio
+import logging
+import time
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramRetryAfter
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRateLimiter:
+    """Token bucket shared by coroutines: at most ``rate`` acquisitions per second."""
+
+    def __init__(self, rate: float, burst: int | None = None) -> None:
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# Telegram allows about 30 messages per second per bot; background sends stay well below it
+# so that interactive handlers keep their share.
+background_send_limiter = AsyncRateLimiter(rate=10)
+
+
+async def send_rate_limited(bot: Bot, chat_id: int, text: str, **kwargs):
+    await background_send_limiter.acquire()
+    try:
+        return await bot.send_message(chat_id=chat_id, text=text, **kwargs)
+    except TelegramRetryAfter as exc:
+        logger.warning("Превышен лимит Telegram, повтор отправки в чат %s через %s с.", chat_id, exc.retry_after)
+        await asyncio.sleep(exc.retry_after)
+        return await bot.send_message(chat_id=chat_id, text=text, **kwargs)
@@ -0,0 +1,137 @@
+import asyncio
+import json
+import logging
+import os
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from app.config import (
+    AHO_ADMIN_IDS,
+    CONFIG_FILE,
+    IT_ADMIN_IDS,
+    ORGANIZATIONS_NEEDING_OFFICE_NUMBER,
+    PREDEFINED_ORGANIZATIONS,
+    VEHICLES,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class RuntimeConfig:
+    it_admin_ids: tuple[int, ...]
+    aho_admin_ids: tuple[int, ...]
+    predefined_organizations: tuple[str, ...]
+    organizations_needing_office_number: frozenset[str]
+    vehicles: tuple[str, ...]
+
+
+def _parse_ids(raw: str | None) -> tuple[int, ...] | None:
+    if not raw:
+        return None
+    return tuple(int(part) for part in raw.replace(";", ",").split(",") if part.strip())
+
+
+def _parse_names(raw: str | None) -> tuple[str, ...] | None:
+    if not raw:
+        return None
+    return tuple(part.strip() for part in raw.split(";") if part.strip())
+
+
+def _first(*candidates: Iterable | None) -> tuple:
+    for candidate in candidates:
+        if candidate is not None:
+            return tuple(candidate)
+    return ()
+
+
+def load_runtime_config() -> RuntimeConfig:
+    """Build the config: environment overrides the JSON file, which overrides app/config.py."""
+    load_dotenv(override=True)
+    file_data: dict = {}
+    config_path = Path(os.getenv("BOT_CONFIG_FILE", CONFIG_FILE))
+    if config_path.is_file():
+        file_data = json.loads(config_path.read_text(encoding="utf-8"))
+
+    predefined_organizations = _first(
+        _parse_names(os.getenv("PREDEFINED_ORGANIZATIONS")),
+        file_data.get("predefined_organizations"),
+        PREDEFINED_ORGANIZATIONS,
+    )
+    return RuntimeConfig(
+        it_admin_ids=tuple(
+            int(admin_id)
+            for admin_id in _first(_parse_ids(os.getenv("IT_ADMIN_IDS")), file_data.get("it_admin_ids"), IT_ADMIN_IDS)
+        ),
+        aho_admin_ids=tuple(
+            int(admin_id)
+            for admin_id in _first(
+                _parse_ids(os.getenv("AHO_ADMIN_IDS")), file_data.get("aho_admin_ids"), AHO_ADMIN_IDS
+            )
+        ),
+        predefined_organizations=predefined_organizations,
+        organizations_needing_office_number=frozenset(
+            _first(
+                _parse_names(os.getenv("ORGANIZATIONS_NEEDING_OFFICE_NUMBER")),
+                file_data.get("organizations_needing_office_number"),
+                ORGANIZATIONS_NEEDING_OFFICE_NUMBER,
+            )
+        ),
+        vehicles=_first(_parse_names(os.getenv("VEHICLES")), file_data.get("vehicles"), VEHICLES),
+    )
+
+
+_current: RuntimeConfig = load_runtime_config()
+# (listener, blocking): blocking listeners do DB work in a worker thread, the rest run on the event loop.
+_reload_listeners: list[tuple[Callable[[RuntimeConfig], None], bool]] = []
+
+
+def get_runtime_config() -> RuntimeConfig:
+    return _current
+
+
+def add_reload_listener(listener: Callable[[RuntimeConfig], None], *, blocking: bool = False) -> None:
+    """Listeners run in registration order; in-memory caches must not be touched from a ``blocking`` one."""
+    _reload_listeners.append((listener, blocking))
+
+
+def _check_admin_lists(old: RuntimeConfig, new: RuntimeConfig) -> None:
+    """Refuses a reload that would drop every admin of a type, which is most likely a typo."""
+    for title, old_ids, new_ids in (
+        ("ИТ", old.it_admin_ids, new.it_admin_ids),
+        ("АХО", old.aho_admin_ids, new.aho_admin_ids),
+    ):
+        if old_ids and not new_ids:
+            raise ValueError(f"список {title}-администраторов пуст")
+
+
+async def reload_runtime_config() -> bool:
+    """Re-reads the config and applies it; DB work of the listeners runs off the event loop."""
+    global _current
+    try:
+        new_config = await asyncio.to_thread(load_runtime_config)
+        _check_admin_lists(_current, new_config)
+    except (OSError, ValueError) as exc:
+        logger.error("Не удалось перечитать конфигурацию, остаётся прежняя: %s", exc)
+        return False
+
+    _current = new_config
+    for listener, blocking in _reload_listeners:
+        try:
+            if blocking:
+                await asyncio.to_thread(listener, new_config)
+            else:
+                listener(new_config)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Ошибка при применении новой конфигурации в %s: %s", listener, exc)
+    logger.info(
+        "Конфигурация перечитана: ИТ-администраторов %s, АХО-администраторов %s, организаций %s, автомобилей %s.",
+        len(new_config.it_admin_ids),
+        len(new_config.aho_admin_ids),
+        len(new_config.predefined_organizations),
+        len(new_config.vehicles),
+    )
+    return True
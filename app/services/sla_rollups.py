@@ -0,0 +1,226 @@
+import asyncio
+import bisect
+import json
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.db import get_db
+from app.db.models import Category, Request, RequestDailyRollup, RollupWatermark, User
+from app.services.user_context import get_user_context
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of histogram buckets in seconds; the last bucket is open-ended.
+BUCKET_BOUNDS: tuple[int, ...] = (
+    60, 5 * 60, 15 * 60, 30 * 60, 3600, 2 * 3600, 4 * 3600, 8 * 3600,
+    24 * 3600, 2 * 24 * 3600, 3 * 24 * 3600, 7 * 24 * 3600,
+)
+
+METRICS = {
+    "accept": Request.accepted_at,
+    "complete": Request.completed_at,
+}
+DIMENSIONS = ("admin", "category", "organization")
+WATERMARK_NAME = "request_sla"
+ROLLUP_HOUR = 0
+ROLLUP_MINUTE = 5
+
+
+@dataclass
+class DurationStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    histogram: list[int] = field(default_factory=lambda: [0] * (len(BUCKET_BOUNDS) + 1))
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.histogram[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+
+    def merge(self, count: int, total_seconds: float, histogram: list[int]) -> None:
+        self.count += count
+        self.total_seconds += total_seconds
+        for index, value in enumerate(histogram):
+            self.histogram[index] += value
+
+    def percentile(self, quantile: float) -> int | None:
+        """Upper bound of the bucket holding the quantile; ``None`` for the open-ended bucket."""
+        threshold = quantile * self.count
+        cumulative = 0
+        for index, value in enumerate(self.histogram):
+            cumulative += value
+            if cumulative >= threshold and value:
+                return BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else None
+        return None
+
+
+def _rollup_day(db: Session, day: date) -> int:
+    day_start = datetime.combine(day, time.min)
+    day_end = day_start + timedelta(days=1)
+    aggregates: dict[tuple[str, str, str], DurationStats] = defaultdict(DurationStats)
+
+    for metric, finished_column in METRICS.items():
+        rows = (
+            db.query(
+                Request.created_at,
+                finished_column,
+                Request.assigned_admin_id,
+                Category.name,
+                User.organization,
+            )
+            .outerjoin(Category, Category.id == Request.category_id)
+            .outerjoin(User, User.id == Request.user_id)
+            .filter(finished_column >= day_start, finished_column < day_end, Request.created_at.isnot(None))
+            .all()
+        )
+        for created_at, finished_at, admin_id, category_name, organization in rows:
+            seconds = max((finished_at - created_at).total_seconds(), 0.0)
+            values = {
+                "admin": str(admin_id) if admin_id else "—",
+                "category": category_name or "Без категории",
+                "organization": organization or "Не указана",
+            }
+            for dimension in DIMENSIONS:
+                aggregates[(metric, dimension, values[dimension])].add(seconds)
+
+    db.query(RequestDailyRollup).filter(RequestDailyRollup.day == day).delete(synchronize_session=False)
+    db.add_all(
+        RequestDailyRollup(
+            day=day,
+            metric=metric,
+            dimension=dimension,
+            dimension_value=value,
+            count=stats.count,
+            total_seconds=stats.total_seconds,
+            histogram=json.dumps(stats.histogram),
+        )
+        for (metric, dimension, value), stats in aggregates.items()
+    )
+    return len(aggregates)
+
+
+def run_incremental_rollup(until: date | None = None) -> int:
+    """Roll up every finished day after the watermark; returns the number of processed days."""
+    until = until or date.today() - timedelta(days=1)
+    processed = 0
+    with get_db() as db:
+        watermark = db.get(RollupWatermark, WATERMARK_NAME)
+        if watermark:
+            day = watermark.last_day + timedelta(days=1)
+        else:
+            first_created_at = db.query(Request.created_at).order_by(Request.created_at.asc()).limit(1).scalar()
+            if first_created_at is None:
+                return 0
+            day = first_created_at.date()
+            watermark = RollupWatermark(name=WATERMARK_NAME, last_day=day - timedelta(days=1))
+            db.add(watermark)
+
+        while day <= until:
+            _rollup_day(db, day)
+            watermark.last_day = day
+            db.commit()
+            processed += 1
+            day += timedelta(days=1)
+
+    if processed:
+        logger.info("Суточные агрегаты SLA пересчитаны за %s дн. (по %s).", processed, until)
+    return processed
+
+
+def load_sla_report(days: int) -> dict[tuple[str, str], dict[str, DurationStats]]:
+    """Merge rollups of the last ``days`` days: {(metric, dimension): {value: stats}}."""
+    since = date.today() - timedelta(days=days)
+    report: dict[tuple[str, str], dict[str, DurationStats]] = defaultdict(lambda: defaultdict(DurationStats))
+    with get_db() as db:
+        rows = (
+            db.query(
+                RequestDailyRollup.metric,
+                RequestDailyRollup.dimension,
+                RequestDailyRollup.dimension_value,
+                RequestDailyRollup.count,
+                RequestDailyRollup.total_seconds,
+                RequestDailyRollup.histogram,
+            )
+            .filter(RequestDailyRollup.day >= since)
+            .all()
+        )
+    for metric, dimension, value, count, total_seconds, histogram in rows:
+        report[(metric, dimension)][value].merge(count, total_seconds, json.loads(histogram))
+    return report
+
+
+def _seconds_until_next_run(now: datetime) -> float:
+    next_run = now.replace(hour=ROLLUP_HOUR, minute=ROLLUP_MINUTE, second=0, microsecond=0)
+    if next_run <= now:
+        next_run += timedelta(days=1)
+    return (next_run - now).total_seconds()
+
+
+async def run_nightly_rollups() -> None:
+    while True:
+        try:
+            # The first run backfills the whole history, so it must not block the event loop.
+            await asyncio.to_thread(run_incremental_rollup)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Не удалось пересчитать суточные агрегаты SLA: %s", exc)
+        await asyncio.sleep(_seconds_until_next_run(datetime.now()))
+
+
+def _format_duration(seconds: int | None) -> str:
+    if seconds is None:
+        return f"> {BUCKET_BOUNDS[-1] // 86400} д"
+    if seconds < 3600:
+        return f"≤ {seconds // 60} мин"
+    if seconds < 86400:
+        return f"≤ {seconds // 3600} ч"
+    return f"≤ {seconds // 86400} д"
+
+
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+METRIC_TITLES = {"accept": "Время до принятия", "complete": "Время до выполнения"}
+DIMENSION_TITLES = {"admin": "по исполнителям", "category": "по категориям", "organization": "по организациям"}
+
+
+def render_sla_report(report: dict[tuple[str, str], dict[str, DurationStats]], days: int) -> list[str]:
+    """Report text split into messages that fit Telegram's length limit."""
+    lines = [f"📈 SLA за последние {days} дн. (p50 / p90 / p99, без учёта сегодняшнего дня)"]
+    for metric, metric_title in METRIC_TITLES.items():
+        for dimension, dimension_title in DIMENSION_TITLES.items():
+            values = report.get((metric, dimension))
+            if not values:
+                continue
+            lines.append("")
+            lines.append(f"{metric_title} {dimension_title}:")
+            for value, stats in sorted(values.items(), key=lambda item: -item[1].count):
+                label = value
+                if dimension == "admin" and value.isdigit():
+                    admin_context = get_user_context(int(value))
+                    label = admin_context.full_name if admin_context and admin_context.full_name else value
+                lines.append(
+                    f"• {label} ({stats.count}): "
+                    + " / ".join(_format_duration(stats.percentile(q)) for q in (0.5, 0.9, 0.99))
+                )
+    if len(lines) == 1:
+        lines.append("")
+        lines.append("Данных пока нет.")
+    return _split_lines(lines, TELEGRAM_MESSAGE_LIMIT)
+
+
+def _split_lines(lines: list[str], limit: int) -> list[str]:
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for line in lines:
+        line = line[:limit]
+        if current and size + 1 + len(line) > limit:
+            chunks.append("\n".join(current).strip("\n"))
+            current, size = [], 0
+        size += len(line) + (1 if current else 0)
+        current.append(line)
+    chunks.append("\n".join(current).strip("\n"))
+    return chunks
@@ -1,65 +1,163 @@
+import asyncio
 import logging
 from aiogram import Bot, Dispatcher
 from sqlalchemy import inspect, text
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
 
-from app.config import AHO_ADMIN_IDS, IT_ADMIN_IDS
+from app.config import METRICS_HOST, METRICS_PORT
 from app.db import engine, get_db
 from app.db.models import Admin, User
-from app.services.categories import ensure_categories_exist
+from app.services.admin_load import admin_load
+from app.services.car_bookings import invalidate_car_occupancy, reconcile_vehicles
+from app.services.categories import ensure_aho_categories_exist, ensure_categories_exist
+from app.services.deadlines import deadline_scheduler
+from app.services.digest import digest_buffer
+from app.services.duplicates import duplicate_index
+from app.services.escalation import escalation_scheduler
+from app.services.metrics import MetricsServer
+from app.services.runtime_config import RuntimeConfig, add_reload_listener, get_runtime_config
+from app.services.sla_rollups import run_nightly_rollups
+from app.services.transcripts import transcript_writer
+from app.services.user_context import invalidate_user_context
 
 logger = logging.getLogger(__name__)
 
+metrics_server = MetricsServer(METRICS_HOST, METRICS_PORT)
+_background_tasks: set[asyncio.Task] = set()
+
+_ADMIN_TYPE_ROLES = {"IT_ADMIN": "it_admin", "AHO_ADMIN": "aho_admin"}
+
 
 async def on_startup(dispatcher: Dispatcher, bot: Bot) -> None:
     _ensure_request_columns_exist()
     ensure_categories_exist()
+    ensure_aho_categories_exist()
+
+    sync_admins(get_runtime_config())
+    logger.info("Администраторы успешно инициализированы в БД.")
+    sync_vehicles(get_runtime_config())
+
+    if METRICS_PORT:
+        await metrics_server.start()
+
+    _start_background_task(run_nightly_rollups())
+
+    admin_load.load()
+    deadline_scheduler.load()
+    _start_background_task(deadline_scheduler.run(bot))
+    escalation_scheduler.load()
+    _start_background_task(escalation_scheduler.run(bot))
+    _start_background_task(digest_buffer.run(bot))
+    duplicate_index.load()
+    _start_background_task(transcript_writer.run())
+
+
+async def on_shutdown(bot: Bot) -> None:
+    await metrics_server.stop()
+    # Buffered digests would be lost with the process.
+    await digest_buffer.flush_all(bot)
+    await transcript_writer.flush()
+    for task in list(_background_tasks):
+        task.cancel()
 
+
+def _start_background_task(coroutine) -> None:
+    task = asyncio.create_task(coroutine)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def sync_admins(config: RuntimeConfig) -> None:
+    _store_admins(config)
+    invalidate_user_context()
+
+
+def _store_admins(config: RuntimeConfig) -> None:
     with get_db() as db:
-        for admin_id in IT_ADMIN_IDS:
-            admin_exists = db.query(Admin).filter(Admin.id == admin_id, Admin.admin_type == "IT_ADMIN").first()
-            if not admin_exists:
-                db.add(Admin(id=admin_id, admin_type="IT_ADMIN"))
-            user_exists = db.query(User).filter(User.id == admin_id).first()
-            if not user_exists:
-                db.add(
-                    User(
-                        id=admin_id,
-                        registered=True,
-                        role="it_admin",
-                        full_name=f"IT Admin {admin_id}",
-                        phone_number="N/A",
-                        organization="N/A",
-                    )
-                )
-            elif user_exists.role != "it_admin":
-                user_exists.role = "it_admin"
-                user_exists.registered = True
-            logger.info("IT-администратор %s добавлен/обновлен.", admin_id)
-
-        for admin_id in AHO_ADMIN_IDS:
-            admin_exists = db.query(Admin).filter(Admin.id == admin_id, Admin.admin_type == "AHO_ADMIN").first()
-            if not admin_exists:
-                db.add(Admin(id=admin_id, admin_type="AHO_ADMIN"))
-            user_exists = db.query(User).filter(User.id == admin_id).first()
-            if not user_exists:
-                db.add(
-                    User(
-                        id=admin_id,
-                        registered=True,
-                        role="aho_admin",
-                        full_name=f"AHO Admin {admin_id}",
-                        phone_number="N/A",
-                        organization="N/A",
-                    )
+        _reconcile_admins(db, {"IT_ADMIN": list(config.it_admin_ids), "AHO_ADMIN": list(config.aho_admin_ids)})
+
+
+def sync_vehicles(config: RuntimeConfig) -> None:
+    _store_vehicles(config)
+    invalidate_car_occupancy()
+
+
+def _store_vehicles(config: RuntimeConfig) -> None:
+    with get_db() as db:
+        reconcile_vehicles(db, list(config.vehicles))
+
+
+def _forget_user_contexts(_config: RuntimeConfig) -> None:
+    invalidate_user_context()
+
+
+def _forget_car_occupancy(_config: RuntimeConfig) -> None:
+    invalidate_car_occupancy()
+
+
+# The caches are owned by the event loop, so they are reset there once the DB is reconciled.
+add_reload_listener(_store_admins, blocking=True)
+add_reload_listener(_forget_user_contexts)
+add_reload_listener(_store_vehicles, blocking=True)
+add_reload_listener(_forget_car_occupancy)
+
+
+def _reconcile_admins(db: Session, admin_ids_by_type: dict[str, list[int]]) -> None:
+    desired_types: dict[int, str] = {}
+    for admin_type, admin_ids in admin_ids_by_type.items():
+        for admin_id in admin_ids:
+            desired_types[admin_id] = admin_type
+
+    existing_admins = {admin.id: admin for admin in db.query(Admin)}
+    stale_admin_ids = set(existing_admins) - set(desired_types)
+    user_ids = list(set(desired_types) | stale_admin_ids)
+    existing_users = {user.id: user for user in db.query(User).filter(User.id.in_(user_ids))} if user_ids else {}
+
+    new_rows: list[Admin | User] = []
+    updated = 0
+    for admin_id in stale_admin_ids:
+        db.delete(existing_admins[admin_id])
+        user = existing_users.get(admin_id)
+        if user is not None and user.role in _ADMIN_TYPE_ROLES.values():
+            user.role = "user"
+
+    for admin_id, admin_type in desired_types.items():
+        role = _ADMIN_TYPE_ROLES[admin_type]
+
+        admin = existing_admins.get(admin_id)
+        if admin is None:
+            new_rows.append(Admin(id=admin_id, admin_type=admin_type))
+        elif admin.admin_type != admin_type:
+            admin.admin_type = admin_type
+            updated += 1
+
+        user = existing_users.get(admin_id)
+        if user is None:
+            new_rows.append(
+                User(
+                    id=admin_id,
+                    registered=True,
+                    role=role,
+                    full_name=f"{admin_type.split('_')[0]} Admin {admin_id}",
+                    phone_number="N/A",
+                    organization="N/A",
                 )
-            elif user_exists.role != "aho_admin":
-                user_exists.role = "aho_admin"
-                user_exists.registered = True
-            logger.info("АХО-администратор %s добавлен/обновлен.", admin_id)
+            )
+        elif user.role != role or not user.registered:
+            user.role = role
+            user.registered = True
+            updated += 1
 
-        db.commit()
-    logger.info("Администраторы успешно инициализированы в БД.")
+    db.add_all(new_rows)
+    db.commit()
+    logger.info(
+        "Администраторы сверены: %s в конфигурации, добавлено записей %s, обновлено %s, снято %s.",
+        len(desired_types),
+        len(new_rows),
+        updated,
+        len(stale_admin_ids),
+    )
 
 
 def _ensure_request_columns_exist() -> None:
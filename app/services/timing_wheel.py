@@ -0,0 +1,75 @@
+from collections.abc import Hashable, Sequence
+from typing import Any
+
+
+class TimingWheel:
+    """Hierarchical timing wheel with O(1) schedule and cancel.
+
+    Level ``n`` has ``slots[n]`` buckets, each covering the full span of the level below.
+    Timers further away than the top level wait in an overflow bucket until it wraps.
+    """
+
+    def __init__(self, slots: Sequence[int] = (60, 60, 24)) -> None:
+        self._sizes = tuple(slots)
+        self._spans = []
+        span = 1
+        for size in self._sizes:
+            self._spans.append(span)
+            span *= size
+        self._horizon = span
+        self._levels: list[list[dict[Hashable, tuple[int, Any]]]] = [
+            [{} for _ in range(size)] for size in self._sizes
+        ]
+        self._overflow: dict[Hashable, tuple[int, Any]] = {}
+        self._locations: dict[Hashable, dict[Hashable, tuple[int, Any]]] = {}
+        self.now = 0
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._locations
+
+    def schedule(self, key: Hashable, expires_at: int, payload: Any = None) -> None:
+        self.cancel(key)
+        self._place(key, max(expires_at, self.now + 1), payload)
+
+    def cancel(self, key: Hashable) -> bool:
+        bucket = self._locations.pop(key, None)
+        if bucket is None:
+            return False
+        del bucket[key]
+        return True
+
+    def advance(self) -> list[tuple[Hashable, Any]]:
+        """Move one tick forward and return ``(key, payload)`` of the expired timers."""
+        self.now += 1
+        if self.now % self._horizon == 0:
+            self._cascade(self._overflow)
+        for level in range(len(self._sizes) - 1, 0, -1):
+            span = self._spans[level]
+            if self.now % span == 0:
+                self._cascade(self._levels[level][(self.now // span) % self._sizes[level]])
+
+        bucket = self._levels[0][self.now % self._sizes[0]]
+        expired = [(key, payload) for key, (_, payload) in bucket.items()]
+        for key in bucket:
+            del self._locations[key]
+        bucket.clear()
+        return expired
+
+    def _place(self, key: Hashable, expires_at: int, payload: Any) -> None:
+        bucket = self._overflow
+        for level, span in enumerate(self._spans):
+            outer_span = span * self._sizes[level]
+            if expires_at // outer_span == self.now // outer_span:
+                bucket = self._levels[level][(expires_at // span) % self._sizes[level]]
+                break
+        bucket[key] = (expires_at, payload)
+        self._locations[key] = bucket
+
+    def _cascade(self, bucket: dict[Hashable, tuple[int, Any]]) -> None:
+        entries = list(bucket.items())
+        bucket.clear()
+        for key, (expires_at, payload) in entries:
+            self._place(key, expires_at, payload)
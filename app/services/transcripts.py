@@ -0,0 +1,128 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import func, insert
+
+from app.db import get_db
+from app.db.models import ClarificationMessage
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPT_PAGE_SIZE = 10
+MAX_FLUSH_ATTEMPTS = 3
+_SENDER_TITLES = {"user": "Пользователь", "admin": "Администратор"}
+
+
+class TranscriptWriter:
+    """Buffers relayed clarification messages and inserts them in batches off the event loop."""
+
+    def __init__(self, batch_size: int = 50, flush_interval: float = 2.0) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: list[dict] = []
+        self._batch_ready = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._failed_attempts = 0
+
+    def append(self, request_id: int, sender_id: int, sender_role: str, text: str) -> None:
+        self._pending.append(
+            {
+                "request_id": request_id,
+                "sender_id": sender_id,
+                "sender_role": sender_role,
+                "text": text,
+                "created_at": datetime.now(),
+            }
+        )
+        if len(self._pending) >= self.batch_size:
+            self._batch_ready.set()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            rows, self._pending = self._pending, []
+            if self._failed_attempts >= MAX_FLUSH_ATTEMPTS:
+                # Row by row, so that one bad row no longer blocks the rest of the transcript.
+                self._failed_attempts = 0
+                await asyncio.to_thread(_insert_rows_separately, rows)
+                return
+            try:
+                await asyncio.to_thread(_insert_rows, rows)
+            except Exception as exc:  # noqa: BLE001
+                # Keep the rows for the next attempt instead of losing the transcript.
+                self._pending[:0] = rows
+                self._failed_attempts += 1
+                logger.error("Не удалось сохранить %s сообщений уточнений: %s", len(rows), exc)
+            else:
+                self._failed_attempts = 0
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            await self.flush()
+
+
+def _insert_rows(rows: list[dict]) -> None:
+    with get_db() as db:
+        db.execute(insert(ClarificationMessage), rows)
+        db.commit()
+
+
+def _insert_rows_separately(rows: list[dict]) -> None:
+    for row in rows:
+        try:
+            _insert_rows([row])
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Сообщение уточнения по заявке %s отброшено: %s", row["request_id"], exc)
+
+
+@dataclass(frozen=True, slots=True)
+class TranscriptPage:
+    request_id: int
+    page: int
+    page_count: int
+    lines: list[str]
+
+
+def load_transcript_page(request_id: int, page: int) -> TranscriptPage:
+    with get_db() as db:
+        total = (
+            db.query(func.count(ClarificationMessage.id))
+            .filter(ClarificationMessage.request_id == request_id)
+            .scalar()
+        )
+        page_count = max(1, -(-total // TRANSCRIPT_PAGE_SIZE))
+        page = min(max(page, 0), page_count - 1)
+        messages = (
+            db.query(ClarificationMessage)
+            .filter(ClarificationMessage.request_id == request_id)
+            .order_by(ClarificationMessage.id)
+            .offset(page * TRANSCRIPT_PAGE_SIZE)
+            .limit(TRANSCRIPT_PAGE_SIZE)
+            .all()
+        )
+    lines = [
+        f"[{message.created_at:%d.%m %H:%M}] {_SENDER_TITLES.get(message.sender_role, message.sender_role)}: "
+        f"{message.text[:300]}"
+        for message in messages
+    ]
+    return TranscriptPage(request_id=request_id, page=page, page_count=page_count, lines=lines)
+
+
+def render_transcript_page(transcript: TranscriptPage) -> str:
+    header = f"🗂 История уточнений по заявке ID:{transcript.request_id}"
+    if not transcript.lines:
+        return f"{header}\n\nСообщений пока нет."
+    return (
+        f"{header} (стр. {transcript.page + 1} из {transcript.page_count})\n\n" + "\n".join(transcript.lines)
+    )
+
+
+transcript_writer = TranscriptWriter()
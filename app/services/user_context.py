@@ -0,0 +1,85 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from app.db import get_db
+from app.db.models import User
+
+ADMIN_ROLES = frozenset({"it_admin", "aho_admin"})
+
+
+@dataclass(frozen=True, slots=True)
+class UserContext:
+    id: int
+    role: str
+    registered: bool
+    full_name: str
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role in ADMIN_ROLES
+
+    @property
+    def request_type(self) -> str | None:
+        if self.role == "it_admin":
+            return "IT"
+        if self.role == "aho_admin":
+            return "AHO"
+        return None
+
+
+class UserContextCache:
+    """LRU cache of user contexts.
+
+    Unknown and not yet registered users expire after ``negative_ttl`` so that a fresh
+    registration is picked up quickly even on a path that forgets to invalidate.
+    """
+
+    def __init__(self, ttl: float = 300.0, negative_ttl: float = 5.0, max_size: int = 10_000) -> None:
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[int, tuple[float, UserContext | None]] = OrderedDict()
+
+    def get(self, user_id: int) -> UserContext | None:
+        entry = self._entries.get(user_id)
+        now = time.monotonic()
+        if entry and entry[0] > now:
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+        with get_db() as db:
+            user = db.query(User).filter(User.id == user_id).first()
+            context = (
+                UserContext(
+                    id=user.id,
+                    role=user.role or "user",
+                    registered=bool(user.registered),
+                    full_name=user.full_name or "",
+                )
+                if user
+                else None
+            )
+        ttl = self.ttl if context is not None and context.registered else self.negative_ttl
+        self._entries[user_id] = (now + ttl, context)
+        self._entries.move_to_end(user_id)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return context
+
+    def invalidate(self, user_id: int | None = None) -> None:
+        if user_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(user_id, None)
+
+
+user_contexts = UserContextCache()
+
+
+def get_user_context(user_id: int) -> UserContext | None:
+    return user_contexts.get(user_id)
+
+
+def invalidate_user_context(user_id: int | None = None) -> None:
+    user_contexts.invalidate(user_id)
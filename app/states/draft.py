@@ -0,0 +1,46 @@
+from collections.abc import MutableMapping
+from typing import Any, Generic, TypeVar, overload
+
+T = TypeVar("T")
+
+
+class DraftField(Generic[T]):
+    """Typed accessor for a single key of the FSM data dictionary."""
+
+    __slots__ = ("name", "default")
+
+    def __init__(self, default: T | None = None) -> None:
+        self.default = default
+        self.name = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    @overload
+    def __get__(self, instance: None, owner: type) -> "DraftField[T]": ...
+
+    @overload
+    def __get__(self, instance: "FSMDraft", owner: type) -> T: ...
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance._data.get(self.name, self.default)
+
+    def __set__(self, instance: "FSMDraft", value: T) -> None:
+        instance._data[self.name] = value
+
+
+class FSMDraft:
+    """Mutable view over FSM data; writes go straight into the underlying dict."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: MutableMapping[str, Any]) -> None:
+        self._data = data
+
+    def update(self, **values: Any) -> None:
+        self._data.update(values)
+
+    def as_dict(self) -> dict[str, Any]:
+        return dict(self._data)
@@ -1,5 +1,7 @@
 from aiogram.fsm.state import State, StatesGroup
 
+from app.states.draft import DraftField, FSMDraft
+
 
 class NewRequestStates(StatesGroup):
     choosing_category = State()
@@ -17,4 +19,47 @@ class NewRequestStates(StatesGroup):
     waiting_for_time = State()
     waiting_for_comment = State()
     waiting_for_planned_date = State()
-    waiting_for_confirmation = State()
\ No newline at end of file
+    waiting_for_confirmation = State()
+
+
+class NewRequestDraft(FSMDraft):
+    __slots__ = ()
+
+    request_type: DraftField[str] = DraftField()
+    prompt_message_id: DraftField[int] = DraftField()
+    messages_to_cleanup: DraftField[list[int]] = DraftField()
+    category_id: DraftField[int] = DraftField()
+    category_name: DraftField[str] = DraftField()
+    subcategory_id: DraftField[int] = DraftField()
+    subcategory_name: DraftField[str] = DraftField()
+    description: DraftField[str] = DraftField()
+    base_issue: DraftField[str] = DraftField()
+    attachment_required: DraftField[bool] = DraftField(False)
+    photo_prompt_text: DraftField[str] = DraftField()
+    attachment_file_id: DraftField[str] = DraftField()
+    attachment_type: DraftField[str] = DraftField()
+    # [file_id, attachment_type] pairs in the order the user sent them.
+    attachments: DraftField[list[list[str]]] = DraftField()
+    photo_file_id: DraftField[str] = DraftField()
+    urgency: DraftField[str] = DraftField()
+    selected_date: DraftField[str] = DraftField()
+    due_date: DraftField[str] = DraftField()
+    planned_date: DraftField[str] = DraftField()
+    comment: DraftField[str] = DraftField()
+    comment_required: DraftField[bool] = DraftField(True)
+    car_date: DraftField[str] = DraftField()
+    car_time: DraftField[str] = DraftField()
+    car_duration_text: DraftField[str] = DraftField()
+    car_duration_minutes: DraftField[int] = DraftField()
+    car_start_at: DraftField[str] = DraftField()
+    car_end_at: DraftField[str] = DraftField()
+    car_location: DraftField[str] = DraftField()
+    car_base_description: DraftField[str] = DraftField()
+    duplicates_checked: DraftField[bool] = DraftField(False)
+
+    def track_message(self, message_id: int | None) -> None:
+        if not message_id:
+            return
+        tracked = self._data.setdefault("messages_to_cleanup", [])
+        if message_id not in tracked:
+            tracked.append(message_id)
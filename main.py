@@ -1,31 +1,70 @@
 import asyncio
 import logging
+import signal
 
 from aiogram import Bot, Dispatcher
 
-from app.config import BOT_TOKEN
+from app.config import BOT_TOKEN, SQL_QUERY_BUDGET, THROTTLING_BURST, THROTTLING_RATE
+from app.middlewares import (
+    DbSessionMiddleware,
+    FSMUnitOfWorkMiddleware,
+    HandlerNameMiddleware,
+    MetricsMiddleware,
+    QueryBudgetMiddleware,
+    ThrottlingMiddleware,
+    ThrottlingRule,
+    UserContextMiddleware,
+)
 from app.routers import admins, misc, registration, requests, users
-from app.services import on_startup
+from app.services import on_shutdown, on_startup
+from app.services.runtime_config import reload_runtime_config
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(name)s - %(message)s")
 logger = logging.getLogger(__name__)
 
 
-def build_dispatcher(bot: Bot) -> Dispatcher:
+def build_dispatcher() -> Dispatcher:
     dp = Dispatcher()
+    dp.update.outer_middleware(MetricsMiddleware())
+    throttling = ThrottlingMiddleware(ThrottlingRule(rate=THROTTLING_RATE, burst=THROTTLING_BURST))
+    for observer in (dp.message, dp.callback_query):
+        observer.outer_middleware(UserContextMiddleware())
+        observer.middleware(HandlerNameMiddleware())
+        observer.middleware(throttling)
+        observer.middleware(QueryBudgetMiddleware(SQL_QUERY_BUDGET))
+        observer.middleware(DbSessionMiddleware())
+        observer.middleware(FSMUnitOfWorkMiddleware())
+
     dp.include_router(registration.router)
     dp.include_router(requests.router)
+    # Ahead of admins.router, whose catch-all handlers answer non-admins pressing admin menu buttons.
+    dp.include_router(admins.admin_router)
     dp.include_router(admins.router)
     dp.include_router(users.router)
     dp.include_router(misc.router)
 
-    dp.startup.register(lambda: on_startup(dp, bot))
+    # aiogram passes ``dispatcher`` and ``bot`` to both hooks.
+    dp.startup.register(on_startup)
+    dp.shutdown.register(on_shutdown)
     return dp
 
 
+_reload_tasks: set[asyncio.Task] = set()
+
+
+def _schedule_config_reload() -> None:
+    task = asyncio.create_task(reload_runtime_config())
+    _reload_tasks.add(task)
+    task.add_done_callback(_reload_tasks.discard)
+
+
 async def main() -> None:
     bot = Bot(token=BOT_TOKEN)
-    dp = build_dispatcher(bot)
+    dp = build_dispatcher()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, _schedule_config_reload)
+    except (AttributeError, NotImplementedError):
+        logger.info("SIGHUP недоступен, перечитать конфигурацию можно командой /reload_config.")
     logger.info("Бот запущен. Начинаю опрос...")
     await dp.start_polling(bot)
 
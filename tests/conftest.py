@@ -0,0 +1,116 @@
+import itertools
+import os
+import tempfile
+from datetime import datetime
+from typing import Any
+
+import pytest
+
+# The app reads its settings at import time, so they are set before anything from app is imported.
+_DB_DIR = tempfile.mkdtemp(prefix="bot-tests-")
+os.environ["BOT_TOKEN"] = "123456:TEST"
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/test.db"
+
+from aiogram import Bot  # noqa: E402
+from aiogram.client.session.base import BaseSession  # noqa: E402
+from aiogram.methods import TelegramMethod  # noqa: E402
+from aiogram.types import CallbackQuery, Chat, Message, Update, User as TelegramUser  # noqa: E402
+
+from app.db import Base, engine  # noqa: E402
+from app.services.user_context import invalidate_user_context  # noqa: E402
+
+
+class FakeSession(BaseSession):
+    """Answers every Bot API call locally and keeps the calls for assertions."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: list[TelegramMethod] = []
+        self.sent_messages: list[Message] = []
+        self._message_ids = itertools.count(1000)
+
+    async def make_request(self, bot: Bot, method: TelegramMethod, timeout: int | None = None) -> Any:
+        self.calls.append(method)
+        returning = method.__returning__
+        if returning is bool:
+            return True
+        if getattr(returning, "__origin__", None) is list:
+            return [self._message(bot, method) for _ in method.media]
+        return self._message(bot, method)
+
+    def _message(self, bot: Bot, method: TelegramMethod) -> Message:
+        chat_id = getattr(method, "chat_id", None) or 0
+        message = Message(
+            message_id=next(self._message_ids),
+            date=datetime.now(),
+            chat=Chat(id=chat_id, type="private"),
+            text=getattr(method, "text", None),
+        ).as_(bot)
+        self.sent_messages.append(message)
+        return message
+
+    async def stream_content(self, *args: Any, **kwargs: Any):
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+    def sent_to(self, chat_id: int) -> list[TelegramMethod]:
+        return [call for call in self.calls if getattr(call, "chat_id", None) == chat_id]
+
+    def texts_to(self, chat_id: int) -> list[str]:
+        return [call.text for call in self.sent_to(chat_id) if getattr(call, "text", None)]
+
+
+@pytest.fixture(autouse=True)
+def clean_db():
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+    invalidate_user_context()
+    yield
+
+
+@pytest.fixture(scope="session")
+def dispatcher():
+    # Routers are module-level and can be attached to only one dispatcher.
+    from main import build_dispatcher
+
+    return build_dispatcher()
+
+
+@pytest.fixture
+def bot() -> Bot:
+    return Bot(token=os.environ["BOT_TOKEN"], session=FakeSession())
+
+
+_update_ids = itertools.count(1)
+
+
+def make_message(bot: Bot, user_id: int, text: str | None, *, message_id: int = 1, reply_to: int | None = None) -> Message:
+    user = TelegramUser(id=user_id, is_bot=False, first_name=f"user{user_id}")
+    chat = Chat(id=user_id, type="private")
+    reply_to_message = (
+        Message(message_id=reply_to, date=datetime.now(), chat=chat, text="...") if reply_to is not None else None
+    )
+    return Message(
+        message_id=message_id,
+        date=datetime.now(),
+        chat=chat,
+        from_user=user,
+        text=text,
+        reply_to_message=reply_to_message,
+    ).as_(bot)
+
+
+def message_update(bot: Bot, user_id: int, text: str | None, **kwargs: Any) -> Update:
+    return Update(update_id=next(_update_ids), message=make_message(bot, user_id, text, **kwargs))
+
+
+def callback_update(bot: Bot, user_id: int, data: str, *, message_id: int = 1) -> Update:
+    user = TelegramUser(id=user_id, is_bot=False, first_name=f"user{user_id}")
+    message = Message(message_id=message_id, date=datetime.now(), chat=Chat(id=user_id, type="private"), text="...")
+    return Update(
+        update_id=next(_update_ids),
+        callback_query=CallbackQuery(id=str(next(_update_ids)), from_user=user, chat_instance="test", data=data, message=message),
+    )
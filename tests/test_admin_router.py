@@ -0,0 +1,33 @@
+import asyncio
+
+from app.db import get_db
+from app.db.models import User
+from conftest import message_update
+
+ADMIN_ID = 20
+USER_ID = 10
+
+
+def _add_users() -> None:
+    with get_db() as db:
+        db.add_all(
+            [
+                User(id=ADMIN_ID, full_name="Админ", registered=True, role="it_admin"),
+                User(id=USER_ID, full_name="Иван Петров", registered=True, role="user"),
+            ]
+        )
+        db.commit()
+
+
+def test_admin_menu_is_served_to_admins_only(bot, dispatcher):
+    _add_users()
+
+    async def scenario() -> None:
+        await dispatcher.feed_update(bot, message_update(bot, ADMIN_ID, "Сводка очереди"))
+        await dispatcher.feed_update(bot, message_update(bot, USER_ID, "Сводка очереди"))
+
+    asyncio.run(scenario())
+
+    assert "У вас нет доступа к этой функции." not in bot.session.texts_to(ADMIN_ID)
+    assert len(bot.session.texts_to(ADMIN_ID)) == 1
+    assert bot.session.texts_to(USER_ID) == ["У вас нет доступа к этой функции."]
@@ -0,0 +1,86 @@
+import asyncio
+import json
+from datetime import datetime
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.methods import DeleteMessages
+from aiogram.types import CallbackQuery, Chat, Message, PhotoSize, User as TelegramUser
+
+from app.db import get_db
+from app.db.models import Request, User
+from app.routers import admins, requests
+from app.states.requests import NewRequestStates
+
+USER_ID = 10
+ALBUM_SIZE = 5
+
+
+def _album_message(bot, message_id: int) -> Message:
+    return Message(
+        message_id=message_id,
+        date=datetime.now(),
+        chat=Chat(id=USER_ID, type="private"),
+        from_user=TelegramUser(id=USER_ID, is_bot=False, first_name="Иван"),
+        media_group_id="album-1",
+        photo=[PhotoSize(file_id=f"photo-{message_id}", file_unique_id=f"u{message_id}", width=1, height=1)],
+    ).as_(bot)
+
+
+def test_album_updates_end_up_in_one_draft(bot, monkeypatch):
+    monkeypatch.setattr(requests, "MEDIA_GROUP_WINDOW_SECONDS", 0.05)
+
+    async def scenario() -> dict:
+        storage = MemoryStorage()
+        key = StorageKey(bot_id=bot.id, chat_id=USER_ID, user_id=USER_ID)
+        await FSMContext(storage=storage, key=key).set_state(NewRequestStates.waiting_for_photo)
+        # Each update of the album is handled concurrently with its own context, as the dispatcher does.
+        await asyncio.gather(
+            *(
+                requests.process_photo(_album_message(bot, message_id), FSMContext(storage=storage, key=key))
+                for message_id in range(ALBUM_SIZE, 0, -1)
+            )
+        )
+        return await storage.get_data(key)
+
+    data = asyncio.run(scenario())
+
+    assert data["attachments"] == [[f"photo-{message_id}", "photo"] for message_id in range(1, ALBUM_SIZE + 1)]
+    prompts = [text for text in bot.session.texts_to(USER_ID) if "Как срочно" in text]
+    assert prompts == [f"Прикреплено файлов: {ALBUM_SIZE}. Как срочно необходимо выполнить заявку?"]
+
+
+def test_accepting_removes_album_of_other_admins(bot):
+    with get_db() as db:
+        db.add_all([User(id=USER_ID, full_name="Иван Петров", registered=True), User(id=20, full_name="Админ")])
+        db.add(
+            Request(
+                id=1,
+                user_id=USER_ID,
+                request_type="IT",
+                description="Не печатает принтер",
+                status="Принято",
+                admin_message_map=json.dumps({20: 103, 21: 203}),
+                admin_media_map=json.dumps({20: [101, 102], 21: [201, 202]}),
+            )
+        )
+        db.commit()
+    callback = CallbackQuery(
+        id="1",
+        from_user=TelegramUser(id=20, is_bot=False, first_name="Админ"),
+        chat_instance="test",
+        data="admin_accept_1",
+        message=Message(message_id=103, date=datetime.now(), chat=Chat(id=20, type="private"), text="...").as_(bot),
+    ).as_(bot)
+
+    async def scenario() -> None:
+        with get_db() as db:
+            await admins.admin_accept_request(callback, bot, db)
+
+    asyncio.run(scenario())
+
+    deleted = [call for call in bot.session.calls if isinstance(call, DeleteMessages)]
+    assert [(call.chat_id, call.message_ids) for call in deleted] == [(21, [201, 202, 203])]
+    with get_db() as db:
+        assert json.loads(db.get(Request, 1).admin_media_map) == {"20": [101, 102]}
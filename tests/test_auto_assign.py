@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+
+from app.db import get_db
+from app.db.models import Request
+from app.services.admin_load import AdminLoadTracker
+from app.services.escalation import _STAGE_ADMINS, _STAGE_BROADCAST, EscalationScheduler
+
+
+def _timer(scheduler: EscalationScheduler, request_id: int) -> tuple[int, int]:
+    return scheduler._wheel._locations[request_id][request_id]
+
+
+def _add_waiting_request(request_id: int, **fields) -> None:
+    with get_db() as db:
+        db.add(Request(id=request_id, user_id=1, request_type="IT", urgency="ASAP", status="Принято", **fields))
+        db.commit()
+
+
+def test_offer_timeout_survives_restart():
+    now = datetime.now()
+    _add_waiting_request(1, offered_admin_id=5, offer_expires_at=now + timedelta(minutes=5))
+    _add_waiting_request(2, offered_admin_id=5, offer_expires_at=now - timedelta(minutes=1))
+    _add_waiting_request(3)
+
+    scheduler = EscalationScheduler()
+    scheduler.load()
+
+    fires_at, stage = _timer(scheduler, 1)
+    assert stage == _STAGE_BROADCAST and 295 <= fires_at <= 301
+    assert _timer(scheduler, 2) == (1, _STAGE_BROADCAST)
+    assert _timer(scheduler, 3)[1] == _STAGE_ADMINS
+
+
+def test_pending_offers_count_as_load_after_restart():
+    _add_waiting_request(1, offered_admin_id=5, offer_expires_at=datetime.now() + timedelta(minutes=5))
+
+    tracker = AdminLoadTracker()
+    tracker.load()
+
+    assert tracker.offer(2, [5, 6]) == 6
@@ -0,0 +1,110 @@
+import asyncio
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from app.db import get_db
+from app.db.models import Request, Vehicle
+from app.routers import requests
+from app.services import car_bookings, runtime_config
+from app.states.requests import NewRequestStates
+from conftest import make_message
+
+SIMULATED_BOOKINGS = 10_000
+
+
+def _location_handlers() -> int:
+    return sum(1 for handler in requests.router.message.handlers if handler.callback is requests.process_car_location)
+
+
+def test_car_duration_step_does_not_register_handlers(bot):
+    with get_db() as db:
+        db.add(Vehicle(name="Служебный автомобиль", is_active=True))
+        db.commit()
+    car_date = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    handlers_before = len(requests.router.message.handlers)
+
+    async def scenario() -> None:
+        storage = MemoryStorage()
+        for user_id in range(1, SIMULATED_BOOKINGS + 1):
+            state = FSMContext(storage=storage, key=StorageKey(bot_id=bot.id, chat_id=user_id, user_id=user_id))
+            await state.set_data({"car_date": car_date, "car_time": "10:00", "description": "Пользование авто"})
+            await state.set_state(NewRequestStates.waiting_for_car_duration)
+            await requests.process_car_duration(make_message(bot, user_id, "1 час"), state)
+            assert await state.get_state() == NewRequestStates.waiting_for_car_location.state
+
+    asyncio.run(scenario())
+
+    assert len(requests.router.message.handlers) == handlers_before
+    assert _location_handlers() == 1
+
+
+def _run_duration_step(bot, car_date: str, car_time: str, duration_text: str = "1 час") -> FSMContext:
+    async def scenario() -> FSMContext:
+        state = FSMContext(storage=MemoryStorage(), key=StorageKey(bot_id=bot.id, chat_id=10, user_id=10))
+        await state.set_data({"car_date": car_date, "car_time": car_time, "description": "Пользование авто"})
+        await state.set_state(NewRequestStates.waiting_for_car_duration)
+        await requests.process_car_duration(make_message(bot, 10, duration_text), state)
+        return state
+
+    return asyncio.run(scenario())
+
+
+def test_booking_works_before_startup_sync_of_vehicles(bot):
+    car_date = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    state = _run_duration_step(bot, car_date, "10:00")
+
+    assert asyncio.run(state.get_state()) == NewRequestStates.waiting_for_car_location.state
+    with get_db() as db:
+        assert db.query(Vehicle).filter(Vehicle.is_active.is_(True)).count() >= 1
+
+
+def test_legacy_booking_without_vehicle_still_conflicts(bot):
+    day = (datetime.now() + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    with get_db() as db:
+        db.add(
+            Request(
+                user_id=99,
+                request_type="AHO",
+                description="Пользование авто",
+                car_start_at=day.replace(hour=10),
+                car_end_at=day.replace(hour=12),
+            )
+        )
+        db.commit()
+
+    state = _run_duration_step(bot, day.strftime("%Y-%m-%d"), "10:30")
+
+    assert asyncio.run(state.get_state()) == NewRequestStates.waiting_for_car_time.state
+    assert "забронирован" in bot.session.texts_to(10)[-1]
+
+
+def test_no_configured_vehicles_is_not_reported_as_fully_booked(bot, monkeypatch):
+    monkeypatch.setattr(
+        car_bookings, "get_runtime_config", lambda: replace(runtime_config.get_runtime_config(), vehicles=())
+    )
+    car_date = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    state = _run_duration_step(bot, car_date, "10:00")
+
+    assert asyncio.run(state.get_state()) is None
+    assert "не настроено ни одного служебного автомобиля" in bot.session.texts_to(10)[-1]
+
+
+def test_repeated_location_step_does_not_duplicate_trip_details(bot):
+    async def scenario() -> str:
+        state = FSMContext(storage=MemoryStorage(), key=StorageKey(bot_id=bot.id, chat_id=10, user_id=10))
+        await state.set_data(
+            {"car_date": "2030-01-10", "car_time": "10:00", "car_duration_text": "1 час", "description": "Пользование авто"}
+        )
+        await requests.process_car_location(make_message(bot, 10, "Вокзал"), state)
+        # save_request sent the user back to pick another time; the location is entered again.
+        await state.update_data(car_time="14:00")
+        await requests.process_car_location(make_message(bot, 10, "Вокзал"), state)
+        return (await state.get_data())["description"]
+
+    description = asyncio.run(scenario())
+
+    assert description == "Пользование авто. Дата: 2030-01-10; время: 14:00; продолжительность: 1 час; место: Вокзал."
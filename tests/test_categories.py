@@ -0,0 +1,44 @@
+import asyncio
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from app.db import get_db
+from app.db.models import Category
+from app.db.query_stats import assert_max_statements
+from app.routers.requests import start_new_request
+from app.services.categories import ensure_aho_categories_exist, ensure_categories_exist
+from app.services.user_context import UserContext
+from conftest import make_message
+
+USER_CONTEXT = UserContext(id=10, role="user", registered=True, full_name="Пользователь")
+
+
+def _start(bot, text: str) -> None:
+    async def scenario() -> None:
+        state = FSMContext(storage=MemoryStorage(), key=StorageKey(bot_id=bot.id, chat_id=10, user_id=10))
+        # Categories are seeded at startup; starting a request only reads them.
+        with assert_max_statements(1):
+            await start_new_request(make_message(bot, 10, text), state, USER_CONTEXT)
+
+    asyncio.run(scenario())
+
+
+def test_start_new_request_only_reads_seeded_categories(bot):
+    ensure_categories_exist()
+    ensure_aho_categories_exist()
+
+    _start(bot, "Создать ИТ-заявку")
+    _start(bot, "Создать АХО-заявку")
+
+    it_keyboard, aho_keyboard = (call.reply_markup for call in bot.session.sent_to(10))
+    assert len(it_keyboard.inline_keyboard) > 1
+    assert len(aho_keyboard.inline_keyboard) > 1
+
+
+def test_start_new_request_does_not_seed_categories(bot):
+    _start(bot, "Создать ИТ-заявку")
+
+    with get_db() as db:
+        assert db.query(Category).count() == 0
@@ -0,0 +1,81 @@
+import asyncio
+from datetime import datetime
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import CallbackQuery, Chat, Message, User as TelegramUser
+
+from app.db import get_db
+from app.db.models import Request, User
+from app.routers import admins, users
+from app.services.clarification import clarification_threads
+from app.states.clarification import ClarificationState
+from conftest import make_message
+
+USER_ID = 10
+ADMIN_ID = 20
+
+
+def _add_assigned_request(request_id: int) -> None:
+    with get_db() as db:
+        if db.get(User, USER_ID) is None:
+            db.add(User(id=USER_ID, full_name="Иван Петров", registered=True))
+        db.add(
+            Request(
+                id=request_id,
+                user_id=USER_ID,
+                request_type="IT",
+                description=f"Не печатает принтер {request_id}",
+                status="В работе",
+                assigned_admin_id=ADMIN_ID,
+            )
+        )
+        db.commit()
+
+
+def _start_callback(bot, request_id: int) -> CallbackQuery:
+    return CallbackQuery(
+        id="1",
+        from_user=TelegramUser(id=USER_ID, is_bot=False, first_name="Иван"),
+        chat_instance="test",
+        data=f"user_clarify_start_{request_id}",
+        message=Message(message_id=1, date=datetime.now(), chat=Chat(id=USER_ID, type="private"), text="...").as_(bot),
+    ).as_(bot)
+
+
+def _state(storage: MemoryStorage, bot, chat_id: int) -> FSMContext:
+    return FSMContext(storage=storage, key=StorageKey(bot_id=bot.id, chat_id=chat_id, user_id=chat_id))
+
+
+def test_admin_reply_reaches_user_in_user_started_dialogue(bot):
+    _add_assigned_request(1)
+    _add_assigned_request(2)
+
+    async def scenario() -> None:
+        storage = MemoryStorage()
+        admin_state = _state(storage, bot, ADMIN_ID)
+        await admin_state.set_state(ClarificationState.admin_active_dialogue)
+        await admin_state.set_data({"target_user_id": USER_ID, "request_id": 2, "relay_header": "..."})
+
+        user_state = _state(storage, bot, USER_ID)
+        await users.user_clarify_start(_start_callback(bot, 1), user_state, bot)
+        # The admin's own dialogue on request 2 stays in place.
+        assert (await admin_state.get_data())["request_id"] == 2
+
+        await users.process_user_clarification_message(make_message(bot, USER_ID, "Кабинет 203"), user_state, bot)
+        relayed = bot.session.sent_messages[-1]
+        assert relayed.chat.id == ADMIN_ID and relayed.text.endswith("Кабинет 203")
+
+        reply = make_message(bot, ADMIN_ID, "Сейчас подойду", message_id=50, reply_to=relayed.message_id)
+        routed = admins._replied_thread(reply)
+        assert routed["thread"] is not None
+        await admins.process_admin_thread_reply(reply, bot, **routed)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        clarification_threads.close(1)
+
+    assert bot.session.texts_to(USER_ID)[-1].endswith("Сейчас подойду")
+    assert not any("уже завершён" in text for text in bot.session.texts_to(ADMIN_ID))
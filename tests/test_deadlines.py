@@ -0,0 +1,108 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.db.models import Request
+from app.services import deadlines
+from app.services.deadlines import DeadlineScheduler
+
+LEAD = timedelta(seconds=0.1)
+
+
+def _request(request_id: int, seconds_ahead: float, admin_id: int | None = 20) -> Request:
+    return Request(
+        id=request_id,
+        request_type="IT",
+        description=f"Заявка {request_id}",
+        status="Принято к исполнению",
+        assigned_admin_id=admin_id,
+        car_start_at=datetime.now() + timedelta(seconds=seconds_ahead),
+    )
+
+
+def _run(monkeypatch, scheduler: DeadlineScheduler, seconds: float = 0.6) -> list[tuple[int, str]]:
+    sent = []
+
+    async def fake_send(bot, chat_id, text, **kwargs):
+        sent.append((chat_id, text))
+
+    monkeypatch.setattr(deadlines, "send_rate_limited", fake_send)
+
+    async def scenario() -> None:
+        task = asyncio.create_task(scheduler.run(bot=None))
+        await asyncio.sleep(seconds)
+        task.cancel()
+
+    asyncio.run(scenario())
+    return sent
+
+
+def _kinds(sent: list[tuple[int, str]]) -> list[tuple[str, str]]:
+    return [("due" if text.startswith("⚠️") else "upcoming", text.split("ID:")[1].split(" ")[0]) for _, text in sent]
+
+
+def test_reminders_fire_in_deadline_order(monkeypatch):
+    scheduler = DeadlineScheduler(lead=LEAD)
+    scheduler.track(_request(1, 0.45))
+    scheduler.track(_request(2, 0.25))
+
+    sent = _run(monkeypatch, scheduler)
+
+    assert _kinds(sent) == [("upcoming", "2"), ("due", "2"), ("upcoming", "1"), ("due", "1")]
+    assert {chat_id for chat_id, _ in sent} == {20}
+
+
+def test_assign_redirects_reminders_to_the_new_admin(monkeypatch):
+    scheduler = DeadlineScheduler(lead=LEAD)
+    scheduler.track(_request(1, 0.25, admin_id=None))
+    scheduler.assign(1, 30)
+
+    sent = _run(monkeypatch, scheduler)
+
+    assert [chat_id for chat_id, _ in sent] == [30, 30]
+    assert not any("ещё не принята" in text for _, text in sent)
+
+
+def test_unassigned_request_reminds_the_admin_pool(monkeypatch):
+    monkeypatch.setattr(
+        deadlines, "get_runtime_config", lambda: type("Config", (), {"it_admin_ids": (20, 21), "aho_admin_ids": ()})()
+    )
+    scheduler = DeadlineScheduler(lead=LEAD)
+    scheduler.track(_request(1, 0.15, admin_id=None))
+
+    sent = _run(monkeypatch, scheduler, seconds=0.4)
+
+    assert [chat_id for chat_id, _ in sent] == [20, 21, 20, 21]
+
+
+def test_retracking_replaces_the_old_deadline(monkeypatch):
+    scheduler = DeadlineScheduler(lead=LEAD)
+    scheduler.track(_request(1, 0.2))
+    scheduler.track(_request(1, 0.4))
+
+    sent = _run(monkeypatch, scheduler)
+
+    assert _kinds(sent) == [("upcoming", "1"), ("due", "1")]
+
+
+def test_cancelled_entries_are_skipped_lazily(monkeypatch):
+    scheduler = DeadlineScheduler(lead=LEAD)
+    scheduler.track(_request(1, 0.2))
+    scheduler.track(_request(2, 0.3))
+    scheduler.cancel(1)
+    # The heap keeps the stale items until they surface.
+    assert len(scheduler._heap) == 4
+
+    sent = _run(monkeypatch, scheduler)
+
+    assert _kinds(sent) == [("upcoming", "2"), ("due", "2")]
+    assert scheduler._heap == []
+
+
+def test_completed_request_is_not_tracked():
+    scheduler = DeadlineScheduler(lead=LEAD)
+    request = _request(1, 60)
+    scheduler.track(request)
+    request.status = "Выполнено"
+    scheduler.track(request)
+
+    assert scheduler._tracked == {}
@@ -0,0 +1,48 @@
+from app.db import get_db
+from app.db.models import Request, User
+from app.services.duplicates import DuplicateIndex
+
+
+def _index_with(*descriptions: str) -> DuplicateIndex:
+    with get_db() as db:
+        db.add(User(id=10, full_name="Иван Петров", organization="ООО Ромашка", registered=True))
+        for request_id, description in enumerate(descriptions, start=1):
+            db.add(
+                Request(
+                    id=request_id,
+                    user_id=10,
+                    request_type="IT",
+                    subcategory_id=1,
+                    description=description,
+                    comment="Срочно, жду с утра",
+                    status="Принято",
+                )
+            )
+        db.commit()
+    index = DuplicateIndex()
+    index.load()
+    return index
+
+
+def _matches(index: DuplicateIndex, description: str) -> list[int]:
+    return [candidate.request_id for candidate in index.find("IT", 1, "ООО Ромашка", description)]
+
+
+def test_short_and_long_wordings_match():
+    index = _index_with("Не печатает принтер", "Не работает интернет в кабинете 203")
+
+    assert _matches(index, "Не печатает") == [1]
+    assert _matches(index, "Не работает интернет") == [2]
+
+
+def test_different_problems_do_not_match():
+    index = _index_with("Не работает принтер", "Не работает мышь")
+
+    assert _matches(index, "Не работает интернет") == []
+    assert _matches(index, "Не работает клавиатура") == []
+
+
+def test_find_loads_open_requests_when_index_was_never_loaded():
+    _index_with("Не печатает принтер")
+
+    assert _matches(DuplicateIndex(), "Не печатает") == [1]
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+
+from app.db import get_db
+from app.db.models import Request
+from app.services.escalation import _STAGE_ADMINS, EscalationScheduler
+
+
+def _add_request(request_id: int, created_minutes_ago: int, **fields) -> Request:
+    request = Request(
+        id=request_id,
+        user_id=1,
+        request_type="IT",
+        urgency="ASAP",
+        created_at=datetime.now() - timedelta(minutes=created_minutes_ago),
+        **{"status": "Принято", **fields},
+    )
+    with get_db() as db:
+        db.add(request)
+        db.commit()
+        db.refresh(request)
+        db.expunge(request)
+    return request
+
+
+def _timer(scheduler: EscalationScheduler, request_id: int) -> tuple[int, int]:
+    return scheduler._wheel._locations[request_id][request_id]
+
+
+def test_track_arms_admin_stage_at_end_of_window(monkeypatch):
+    monkeypatch.setattr("app.services.escalation.ESCALATION_WINDOWS_MINUTES", {("IT", "ASAP"): 30})
+    scheduler = EscalationScheduler()
+
+    scheduler.track(_add_request(1, created_minutes_ago=10))
+
+    fires_at, stage = _timer(scheduler, 1)
+    assert stage == _STAGE_ADMINS and 1195 <= fires_at <= 1201
+
+
+def test_overdue_request_is_repinged_right_away(monkeypatch):
+    monkeypatch.setattr("app.services.escalation.ESCALATION_WINDOWS_MINUTES", {("IT", "ASAP"): 30})
+    monkeypatch.setattr("app.services.escalation.ESCALATION_SUPERVISOR_CHAT_ID", None)
+    scheduler = EscalationScheduler()
+
+    scheduler.track(_add_request(1, created_minutes_ago=45))
+    scheduler.track(_add_request(2, created_minutes_ago=600))
+
+    assert _timer(scheduler, 1) == (1, _STAGE_ADMINS)
+    assert _timer(scheduler, 2) == (1, _STAGE_ADMINS)
+
+
+def test_track_cancels_accepted_requests():
+    scheduler = EscalationScheduler()
+    request = _add_request(1, created_minutes_ago=10)
+    scheduler.track(request)
+
+    request.assigned_admin_id = 20
+    request.status = "Принято к исполнению"
+    scheduler.track(request)
+
+    assert 1 not in scheduler._wheel
+
+
+def test_load_restores_timers_of_waiting_requests_only():
+    _add_request(1, created_minutes_ago=10)
+    _add_request(2, created_minutes_ago=600)
+    _add_request(3, created_minutes_ago=10, status="Принято к исполнению", assigned_admin_id=20)
+
+    scheduler = EscalationScheduler()
+
+    assert scheduler.load() == 2
+    assert _timer(scheduler, 2) == (1, _STAGE_ADMINS)
+    assert 3 not in scheduler._wheel
@@ -0,0 +1,39 @@
+import csv
+import os
+from datetime import date, datetime
+
+from app.db import get_db
+from app.db.models import Request, User
+from app.services.export import export_requests_csv
+
+
+def test_formula_like_cells_are_escaped():
+    with get_db() as db:
+        db.add(User(id=10, full_name="=HYPERLINK(\"http://x\")", phone_number="+79001234567", organization="@Отдел"))
+        db.add(
+            Request(
+                id=1,
+                user_id=10,
+                request_type="IT",
+                description="-2+3",
+                comment="Обычный комментарий",
+                status="Принято",
+                created_at=datetime(2026, 10, 1, 10, 0),
+            )
+        )
+        db.commit()
+
+    path, row_count = export_requests_csv(date(2026, 10, 1), date(2026, 10, 1))
+    try:
+        with open(path, encoding="utf-8-sig", newline="") as export_file:
+            header, row = list(csv.reader(export_file, delimiter=";"))
+    finally:
+        os.remove(path)
+
+    cells = dict(zip(header, row))
+    assert row_count == 1
+    assert cells["Описание"] == "'-2+3"
+    assert cells["Комментарий"] == "Обычный комментарий"
+    assert cells["Заявитель"] == "'=HYPERLINK(\"http://x\")"
+    assert cells["Телефон"] == "'+79001234567"
+    assert cells["Организация"] == "'@Отдел"
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from app.middlewares.fsm import FSMUnitOfWork, FSMUnitOfWorkMiddleware
+
+KEY = StorageKey(bot_id=1, chat_id=10, user_id=10)
+
+
+def test_concurrent_updates_keep_each_others_keys():
+    async def scenario() -> dict:
+        storage = MemoryStorage()
+        await storage.set_data(key=KEY, data={"description": "Принтер", "comment": "старый"})
+        first = FSMUnitOfWork(FSMContext(storage=storage, key=KEY))
+        second = FSMUnitOfWork(FSMContext(storage=storage, key=KEY))
+        await first.load()
+        await second.load()
+
+        await first.update_data(photo_file_id="photo-1")
+        await second.update_data(comment="новый")
+        await first.flush()
+        await second.flush()
+        return await storage.get_data(key=KEY)
+
+    assert asyncio.run(scenario()) == {"description": "Принтер", "comment": "новый", "photo_file_id": "photo-1"}
+
+
+def test_removed_keys_are_dropped_on_flush():
+    async def scenario() -> dict:
+        storage = MemoryStorage()
+        await storage.set_data(key=KEY, data={"description": "Принтер", "comment": "старый"})
+        unit_of_work = FSMUnitOfWork(FSMContext(storage=storage, key=KEY))
+        await unit_of_work.set_data({"description": "Принтер"})
+        await unit_of_work.flush()
+        return await storage.get_data(key=KEY)
+
+    assert asyncio.run(scenario()) == {"description": "Принтер"}
+
+
+def test_failed_handler_does_not_flush():
+    async def handler(event, data):
+        await data["state"].update_data(comment="наполовину")
+        await data["state"].set_state("NewRequestStates:waiting_for_comment")
+        raise RuntimeError("boom")
+
+    async def scenario() -> tuple[dict, str | None]:
+        storage = MemoryStorage()
+        await storage.set_data(key=KEY, data={"comment": "старый"})
+        with pytest.raises(RuntimeError):
+            await FSMUnitOfWorkMiddleware()(handler, object(), {"state": FSMContext(storage=storage, key=KEY)})
+        return await storage.get_data(key=KEY), await storage.get_state(key=KEY)
+
+    assert asyncio.run(scenario()) == ({"comment": "старый"}, None)
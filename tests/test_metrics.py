@@ -0,0 +1,30 @@
+import asyncio
+
+from aiogram import Dispatcher, Router
+from aiogram.types import Message
+
+from app.middlewares import HandlerNameMiddleware, MetricsMiddleware
+from app.services.metrics import HANDLER_IN_FLIGHT, HANDLER_LATENCY
+from conftest import message_update
+
+LABELS = (("handler", "slow_handler"), ("update_type", "message"))
+
+
+def test_in_flight_gauge_is_labelled_by_handler_and_update_type(bot):
+    seen_in_flight = []
+    router = Router()
+
+    @router.message()
+    async def slow_handler(message: Message) -> None:
+        seen_in_flight.append(HANDLER_IN_FLIGHT._values[LABELS])
+
+    dp = Dispatcher()
+    dp.update.outer_middleware(MetricsMiddleware())
+    dp.message.middleware(HandlerNameMiddleware())
+    dp.include_router(router)
+
+    asyncio.run(dp.feed_update(bot, message_update(bot, 10, "Мои заявки")))
+
+    assert seen_in_flight == [1]
+    assert HANDLER_IN_FLIGHT._values[LABELS] == 0
+    assert LABELS in HANDLER_LATENCY._counts
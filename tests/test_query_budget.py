@@ -0,0 +1,47 @@
+import asyncio
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from app.db import get_db
+from app.db.models import Request, User
+from app.db.query_stats import assert_max_statements
+from app.routers.users import show_user_requests
+from app.services.user_context import get_user_context
+from conftest import make_message
+
+USER_ID = 10
+ADMIN_ID = 20
+
+
+def test_show_user_requests_stays_within_statement_budget(bot):
+    with get_db() as db:
+        db.add_all(
+            [
+                User(id=USER_ID, full_name="Пользователь", registered=True, role="user"),
+                User(id=ADMIN_ID, full_name="Администратор", registered=True, role="it_admin"),
+            ]
+        )
+        db.add_all(
+            Request(
+                user_id=USER_ID,
+                request_type="IT",
+                description=f"Заявка {number}",
+                urgency="ASAP",
+                status="Принято к исполнению" if number % 2 else "Принято",
+                assigned_admin_id=ADMIN_ID if number % 2 else None,
+            )
+            for number in range(20)
+        )
+        db.commit()
+    user_context = get_user_context(USER_ID)
+
+    async def scenario() -> None:
+        state = FSMContext(storage=MemoryStorage(), key=StorageKey(bot_id=bot.id, chat_id=USER_ID, user_id=USER_ID))
+        # One query for the requests and one to resolve the executor's cached context.
+        with assert_max_statements(2):
+            await show_user_requests(make_message(bot, USER_ID, "Мои заявки"), state, user_context)
+
+    asyncio.run(scenario())
+    assert len(bot.session.sent_to(USER_ID)) == 20
@@ -0,0 +1,58 @@
+import asyncio
+import threading
+
+from app.services import runtime_config
+from app.services.runtime_config import RuntimeConfig
+
+
+def _config(it_admin_ids: tuple[int, ...], aho_admin_ids: tuple[int, ...]) -> RuntimeConfig:
+    return RuntimeConfig(
+        it_admin_ids=it_admin_ids,
+        aho_admin_ids=aho_admin_ids,
+        predefined_organizations=(),
+        organizations_needing_office_number=frozenset(),
+        vehicles=("Служебный автомобиль",),
+    )
+
+
+def _use_sources(monkeypatch, tmp_path, it_admin_ids: str, aho_admin_ids: str) -> None:
+    monkeypatch.setenv("BOT_CONFIG_FILE", str(tmp_path / "missing.json"))
+    monkeypatch.setenv("IT_ADMIN_IDS", it_admin_ids)
+    monkeypatch.setenv("AHO_ADMIN_IDS", aho_admin_ids)
+    monkeypatch.setattr(runtime_config, "IT_ADMIN_IDS", [])
+    monkeypatch.setattr(runtime_config, "AHO_ADMIN_IDS", [])
+
+
+def test_reload_refuses_to_drop_all_admins_of_a_type(monkeypatch, tmp_path):
+    previous = _config((1, 2), (3,))
+    monkeypatch.setattr(runtime_config, "_current", previous)
+    monkeypatch.setattr(runtime_config, "_reload_listeners", [])
+    _use_sources(monkeypatch, tmp_path, "", "3")
+
+    assert asyncio.run(runtime_config.reload_runtime_config()) is False
+    assert runtime_config.get_runtime_config() is previous
+
+
+def test_reload_refuses_unparsable_admin_ids(monkeypatch, tmp_path):
+    previous = _config((1,), (3,))
+    monkeypatch.setattr(runtime_config, "_current", previous)
+    monkeypatch.setattr(runtime_config, "_reload_listeners", [])
+    _use_sources(monkeypatch, tmp_path, "1,x", "3")
+
+    assert asyncio.run(runtime_config.reload_runtime_config()) is False
+    assert runtime_config.get_runtime_config() is previous
+
+
+def test_only_blocking_listeners_run_off_the_event_loop(monkeypatch, tmp_path):
+    listener_threads = []
+    monkeypatch.setattr(runtime_config, "_current", _config((1,), (3,)))
+    monkeypatch.setattr(runtime_config, "_reload_listeners", [])
+    runtime_config.add_reload_listener(lambda config: listener_threads.append(("db", threading.get_ident())), blocking=True)
+    runtime_config.add_reload_listener(lambda config: listener_threads.append(("cache", threading.get_ident())))
+    _use_sources(monkeypatch, tmp_path, "1,2", "3")
+
+    assert asyncio.run(runtime_config.reload_runtime_config()) is True
+    assert runtime_config.get_runtime_config().it_admin_ids == (1, 2)
+    (db_step, db_thread), (cache_step, cache_thread) = listener_threads
+    assert (db_step, cache_step) == ("db", "cache")
+    assert db_thread != threading.get_ident() and cache_thread == threading.get_ident()
@@ -0,0 +1,24 @@
+from app.services.sla_rollups import TELEGRAM_MESSAGE_LIMIT, DurationStats, render_sla_report
+
+
+def _stats(count: int) -> DurationStats:
+    stats = DurationStats()
+    for seconds in range(count):
+        stats.add(600 + seconds)
+    return stats
+
+
+def test_large_report_is_split_under_the_message_limit():
+    categories = {f"Категория с длинным названием номер {number}": _stats(3) for number in range(60)}
+    report = {(metric, "category"): categories for metric in ("accept", "complete")}
+
+    chunks = render_sla_report(report, 30)
+
+    assert len(chunks) > 1
+    assert all(0 < len(chunk) <= TELEGRAM_MESSAGE_LIMIT for chunk in chunks)
+    text = "\n".join(chunks)
+    assert all(text.count(f"• {category} (") == 2 for category in categories)
+
+
+def test_empty_report_is_one_message():
+    assert render_sla_report({}, 7) == ["📈 SLA за последние 7 дн. (p50 / p90 / p99, без учёта сегодняшнего дня)\n\nДанных пока нет."]
@@ -0,0 +1,38 @@
+import asyncio
+
+from app.db import get_db
+from app.db.models import Category, Request, Vehicle
+from app.services import startup
+from app.services.digest import digest_buffer
+
+
+def test_startup_hook_seeds_data_and_starts_background_tasks(bot, dispatcher):
+    async def scenario() -> list[asyncio.Task]:
+        await dispatcher.emit_startup(bot=bot, dispatcher=dispatcher, bots=[bot])
+        try:
+            await asyncio.sleep(0)
+            return [task for task in startup._background_tasks if not task.done()]
+        finally:
+            await dispatcher.emit_shutdown(bot=bot, dispatcher=dispatcher, bots=[bot])
+
+    running_tasks = asyncio.run(scenario())
+
+    # Rollups, deadlines, escalation, digest and transcript writer loops.
+    assert len(running_tasks) >= 5
+    with get_db() as db:
+        request_types = {request_type for (request_type,) in db.query(Category.request_type).distinct()}
+        vehicles = db.query(Vehicle).filter(Vehicle.is_active.is_(True)).count()
+    assert request_types == {"IT", "AHO"}
+    assert vehicles >= 1
+
+
+def test_shutdown_sends_buffered_digests(bot):
+    with get_db() as db:
+        request = Request(id=1, user_id=10, request_type="IT", description="Не печатает", status="Принято")
+        db.add(request)
+        db.commit()
+    digest_buffer.add(20, request)
+
+    asyncio.run(startup.on_shutdown(bot))
+
+    assert any("Не печатает" in text for text in bot.session.texts_to(20))
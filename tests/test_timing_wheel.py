@@ -0,0 +1,40 @@
+from app.services.timing_wheel import TimingWheel
+
+
+def _fire_ticks(wheel: TimingWheel, ticks: int) -> dict:
+    fired = {}
+    for _ in range(ticks):
+        for key, payload in wheel.advance():
+            fired[key] = (wheel.now, payload)
+    return fired
+
+
+def test_timers_cascade_down_and_fire_on_their_tick():
+    wheel = TimingWheel(slots=(4, 4, 2))
+    expirations = {"level0": 3, "level1": 6, "level1-edge": 16, "level2": 21, "overflow": 45}
+    for key, expires_at in expirations.items():
+        wheel.schedule(key, expires_at, payload=key.upper())
+
+    fired = _fire_ticks(wheel, 50)
+
+    assert fired == {key: (expires_at, key.upper()) for key, expires_at in expirations.items()}
+    assert len(wheel) == 0
+
+
+def test_cancel_and_reschedule():
+    wheel = TimingWheel(slots=(4, 4, 2))
+    wheel.schedule("cancelled", 10)
+    wheel.schedule("moved", 10)
+    wheel.schedule("moved", 20, payload="late")
+
+    assert wheel.cancel("cancelled") is True
+    assert wheel.cancel("cancelled") is False
+    assert _fire_ticks(wheel, 25) == {"moved": (20, "late")}
+
+
+def test_past_expiry_fires_on_next_tick():
+    wheel = TimingWheel()
+    _fire_ticks(wheel, 5)
+    wheel.schedule("late", 2)
+
+    assert wheel.advance() == [("late", None)]
@@ -0,0 +1,62 @@
+import asyncio
+
+from app.db import get_db
+from app.db.models import ClarificationMessage
+from app.services import transcripts
+from app.services.transcripts import MAX_FLUSH_ATTEMPTS, TranscriptWriter
+
+
+def _stored_texts() -> list[str]:
+    with get_db() as db:
+        return [message.text for message in db.query(ClarificationMessage).order_by(ClarificationMessage.id)]
+
+
+def test_running_writer_saves_appended_rows_in_one_batch(monkeypatch):
+    batches = []
+    insert_rows = transcripts._insert_rows
+    monkeypatch.setattr(transcripts, "_insert_rows", lambda rows: (batches.append(len(rows)), insert_rows(rows)))
+    writer = TranscriptWriter(flush_interval=0.05)
+
+    async def scenario():
+        task = asyncio.create_task(writer.run())
+        writer.append(1, 10, "user", "Добрый день")
+        writer.append(1, 20, "admin", "Уточните кабинет")
+        await asyncio.sleep(0.2)
+        task.cancel()
+
+    asyncio.run(scenario())
+
+    assert _stored_texts() == ["Добрый день", "Уточните кабинет"]
+    assert batches == [2]
+
+
+def test_full_batch_is_written_before_the_interval():
+    writer = TranscriptWriter(batch_size=2, flush_interval=60)
+
+    async def scenario():
+        task = asyncio.create_task(writer.run())
+        await asyncio.sleep(0)
+        writer.append(1, 10, "user", "Не печатает")
+        writer.append(1, 20, "admin", "Сейчас подойду")
+        await asyncio.sleep(0.2)
+        task.cancel()
+
+    asyncio.run(scenario())
+
+    assert _stored_texts() == ["Не печатает", "Сейчас подойду"]
+
+
+def test_bad_row_is_dropped_after_repeated_failures():
+    writer = TranscriptWriter()
+    writer.append(1, 10, "user", "Не печатает")
+    writer.append(1, 10, "user", None)  # violates NOT NULL on text
+    writer.append(1, 20, "admin", "Сейчас подойду")
+
+    async def scenario():
+        for _ in range(MAX_FLUSH_ATTEMPTS + 1):
+            await writer.flush()
+
+    asyncio.run(scenario())
+
+    assert _stored_texts() == ["Не печатает", "Сейчас подойду"]
+    assert writer._pending == []
@@ -0,0 +1,28 @@
+from app.db import get_db
+from app.db.models import User
+from app.services.user_context import UserContextCache
+
+
+def test_cache_is_bounded_lru():
+    with get_db() as db:
+        db.add_all(User(id=user_id, full_name=f"user{user_id}", registered=True) for user_id in (1, 2, 3))
+        db.commit()
+    cache = UserContextCache(max_size=2)
+    cache.get(1)
+    cache.get(2)
+    cache.get(1)
+    cache.get(3)
+
+    assert list(cache._entries) == [1, 3]
+
+
+def test_unknown_user_is_not_cached_for_long():
+    cache = UserContextCache(negative_ttl=0.0)
+    assert cache.get(5) is None
+
+    with get_db() as db:
+        db.add(User(id=5, full_name="Новый", registered=True))
+        db.commit()
+
+    context = cache.get(5)
+    assert context is not None and context.registered